@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Quote Aggregator
+Fetches a symbol's quote from several sources with hedged requests: the
+best-ranked source is asked first and, if it hasn't answered within
+hedge_delay (or fails), the next one is asked too, until one returns a
+valid price or the latency budget runs out. With consensus, every source
+is asked at once and the median price is returned.
+
+Each source keeps a latency and reliability average, and sources are
+ranked healthy-first (reliable, breaker closed) then fastest, so
+requests go to whichever source is answering best right now.
+"""
+
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from extractors import extract_quote, to_number
+from logs import get_logger
+from metrics import timed
+from throttle import CircuitOpenError, RateLimitedError
+
+logger = get_logger(__name__)
+
+# Weight of the newest sample in the latency/reliability averages
+EWMA_ALPHA = 0.2
+
+# Below this reliability a source ranks behind every healthy one
+HEALTHY_RELIABILITY = 0.5
+
+
+# ============================================================================
+# PAGE PARSERS: content -> {'price', 'change', 'sentiment_text'} or None
+# ============================================================================
+
+_CNBC_PRICE = re.compile(r'class="QuoteStrip-lastPrice"[^>]*>\s*([^<]+)<')
+_CNBC_CHANGE = re.compile(r'class="QuoteStrip-change(?:Up|Down|Unch)"[^>]*>\s*(?:<span[^>]*>)?\s*([+\-]?[\d.,]+)')
+_META = re.compile(r'<meta\s+name="(price|priceChange)"\s+content="([^"]+)"', re.I)
+_TE_DESCRIPTION = re.compile(
+    r'<meta[^>]+name="description"[^>]+content="[^"]*?\b(?:to|at)\s+([\d,]+\.?\d*)', re.I
+)
+
+
+def _number(text):
+    return to_number(text.replace('$', '').replace('%', ''))
+
+
+def parse_cnbc(content):
+    page = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+    price = _CNBC_PRICE.search(page)
+    if not price:
+        return None
+    change = _CNBC_CHANGE.search(page)
+    try:
+        return {'price': _number(price.group(1)), 'change': _number(change.group(1)) if change else None,
+                'sentiment_text': None}
+    except ValueError:
+        return None
+
+
+def parse_marketwatch(content):
+    page = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+    meta = {name.lower(): value for name, value in _META.findall(page)}
+    if 'price' not in meta:
+        return None
+    try:
+        change = meta.get('pricechange')
+        return {'price': _number(meta['price']), 'change': _number(change) if change else None,
+                'sentiment_text': None}
+    except ValueError:
+        return None
+
+
+def parse_tradingeconomics(content):
+    # "Gold rose to 2651.10 USD/t.oz ..." in the page description; no change figure
+    page = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+    match = _TE_DESCRIPTION.search(page)
+    if not match:
+        return None
+    try:
+        return {'price': _number(match.group(1)), 'change': None, 'sentiment_text': None}
+    except ValueError:
+        return None
+
+
+PARSERS = {
+    'investing': extract_quote,
+    'cnbc': parse_cnbc,
+    'marketwatch': parse_marketwatch,
+    'tradingeconomics': parse_tradingeconomics
+}
+
+DOMAINS = {
+    'investing': 'investing.com',
+    'cnbc': 'cnbc.com',
+    'marketwatch': 'marketwatch.com',
+    'tradingeconomics': 'tradingeconomics.com'
+}
+
+# Pages per symbol for the secondary sources (Investing.com URLs live on the analyzers)
+SOURCE_URLS = {
+    'cnbc': {
+        'XAUUSD': 'https://www.cnbc.com/quotes/GC.1',
+        'XAGUSD': 'https://www.cnbc.com/quotes/SI.1',
+        'EURUSD': 'https://www.cnbc.com/quotes/EUR=',
+        'GBPUSD': 'https://www.cnbc.com/quotes/GBP=',
+        'USDJPY': 'https://www.cnbc.com/quotes/JPY=',
+        'USDCHF': 'https://www.cnbc.com/quotes/CHF=',
+        'AUDUSD': 'https://www.cnbc.com/quotes/AUD=',
+        'USDCAD': 'https://www.cnbc.com/quotes/CAD=',
+        'NZDUSD': 'https://www.cnbc.com/quotes/NZD=',
+        'EURGBP': 'https://www.cnbc.com/quotes/EURGBP=',
+        'EURJPY': 'https://www.cnbc.com/quotes/EURJPY=',
+        'GBPJPY': 'https://www.cnbc.com/quotes/GBPJPY=',
+        'DXY': 'https://www.cnbc.com/quotes/.DXY'
+    },
+    'marketwatch': {
+        'XAUUSD': 'https://www.marketwatch.com/investing/future/gc00',
+        'XAGUSD': 'https://www.marketwatch.com/investing/future/si00',
+        'EURUSD': 'https://www.marketwatch.com/investing/currency/eurusd',
+        'GBPUSD': 'https://www.marketwatch.com/investing/currency/gbpusd',
+        'USDJPY': 'https://www.marketwatch.com/investing/currency/usdjpy',
+        'USDCHF': 'https://www.marketwatch.com/investing/currency/usdchf',
+        'AUDUSD': 'https://www.marketwatch.com/investing/currency/audusd',
+        'USDCAD': 'https://www.marketwatch.com/investing/currency/usdcad',
+        'NZDUSD': 'https://www.marketwatch.com/investing/currency/nzdusd',
+        'EURGBP': 'https://www.marketwatch.com/investing/currency/eurgbp',
+        'EURJPY': 'https://www.marketwatch.com/investing/currency/eurjpy',
+        'GBPJPY': 'https://www.marketwatch.com/investing/currency/gbpjpy',
+        'DXY': 'https://www.marketwatch.com/investing/index/dxy'
+    },
+    'tradingeconomics': {
+        'XAUUSD': 'https://tradingeconomics.com/commodity/gold',
+        'XAGUSD': 'https://tradingeconomics.com/commodity/silver',
+        'EURUSD': 'https://tradingeconomics.com/euro-area/currency',
+        'GBPUSD': 'https://tradingeconomics.com/united-kingdom/currency',
+        'USDJPY': 'https://tradingeconomics.com/japan/currency',
+        'USDCHF': 'https://tradingeconomics.com/switzerland/currency',
+        'AUDUSD': 'https://tradingeconomics.com/australia/currency',
+        'USDCAD': 'https://tradingeconomics.com/canada/currency',
+        'NZDUSD': 'https://tradingeconomics.com/new-zealand/currency',
+        'DXY': 'https://tradingeconomics.com/united-states/currency'
+    }
+}
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+class QuoteSource:
+    def __init__(self, name, url_for, parse, domain=None):
+        self.name = name
+        self.url_for = url_for  # symbol -> page URL, or None if not covered
+        self.parse = parse
+        self.domain = domain or DOMAINS.get(name, name)
+
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.latency_ms = None  # EWMA of completed requests
+        self.reliability = 1.0  # EWMA of success (1) / failure (0)
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    def record(self, success, latency_ms=None, error=None):
+        with self._lock:
+            self.requests += 1
+            if success:
+                self.successes += 1
+            else:
+                self.failures += 1
+                self.last_error = error
+            self.reliability += EWMA_ALPHA * ((1.0 if success else 0.0) - self.reliability)
+            if latency_ms is not None:
+                self.latency_ms = latency_ms if self.latency_ms is None else \
+                    self.latency_ms + EWMA_ALPHA * (latency_ms - self.latency_ms)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'successes': self.successes,
+                'failures': self.failures,
+                'latency_ms': round(self.latency_ms, 1) if self.latency_ms is not None else None,
+                'reliability': round(self.reliability, 3),
+                'last_error': self.last_error
+            }
+
+
+def build_sources(names, investing_url, urls=SOURCE_URLS):
+    """QuoteSources for names (e.g. QUOTE_SOURCES); investing_url(symbol) gives Investing.com pages"""
+    sources = []
+    for name in names:
+        name = name.strip()
+        if name == 'investing':
+            sources.append(QuoteSource(name, investing_url, PARSERS[name]))
+        elif name in PARSERS and name in urls:
+            sources.append(QuoteSource(name, urls[name].get, PARSERS[name]))
+        elif name:
+            logger.warning(f"⚠️ Unknown quote source {name}")
+    return sources
+
+
+# ============================================================================
+# AGGREGATOR
+# ============================================================================
+
+class QuoteAggregator:
+    def __init__(self, sources, http, headers=None, budget=2.0, hedge_delay=0.3, consensus=False, max_workers=8):
+        self.sources = list(sources)
+        self.http = http
+        self.headers = headers or {}
+        self.budget = budget
+        self.hedge_delay = hedge_delay
+        self.consensus = consensus
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='quote-source')
+
+        self.hedged = 0
+        self.failovers = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def healthy(self, source, symbol):
+        return source.reliability >= HEALTHY_RELIABILITY and not self.http.circuit_open(source.url_for(symbol))
+
+    def unavailable(self, symbol):
+        """True while every source covering symbol has its breaker open"""
+        urls = [source.url_for(symbol) for source in self.sources]
+        return all(self.http.circuit_open(url) for url in urls if url)
+
+    def ranked(self, symbol):
+        """Sources covering symbol: healthy first, then fastest; unmeasured keep their configured order"""
+        covered = [(index, source) for index, source in enumerate(self.sources) if source.url_for(symbol)]
+        covered.sort(key=lambda item: (
+            not self.healthy(item[1], symbol),
+            item[1].latency_ms if item[1].latency_ms is not None else float('inf'),
+            item[0]
+        ))
+        return [source for _, source in covered]
+
+    def _fetch(self, source, symbol):
+        """One source's quote, or None; records the source's latency and reliability"""
+        started = time.perf_counter()
+        try:
+            with timed('fetch', symbol):
+                response = self.http.get(source.url_for(symbol), headers=self.headers)
+            return self.accept(source, symbol, response.status_code, response.content,
+                               (time.perf_counter() - started) * 1000)
+        except (CircuitOpenError, RateLimitedError) as e:
+            # Never sent, so no latency sample
+            source.record(False, error=str(e))
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ {source.name} quote for {symbol} failed: {e}")
+            source.record(False, (time.perf_counter() - started) * 1000, str(e))
+            return None
+
+    def accept(self, source, symbol, status, content, latency_ms):
+        """Parse one source's response into a quote (or None) and record it against the source"""
+        if status >= 400:
+            source.record(False, latency_ms, f'HTTP {status}')
+            return None
+
+        with timed('parse', symbol) as stage:
+            quote = source.parse(content)
+            if not quote:
+                stage.fail()
+        source.record(bool(quote), latency_ms, None if quote else 'no quote on page')
+        return quote
+
+    def quote(self, symbol, consensus=None, budget=None):
+        """
+        {'price', 'change', 'sentiment_text', 'source'} for symbol, or None
+        if no source answered within the budget. Consensus quotes also carry
+        'sources' ({name: price}) and 'spread' (max-min over median).
+        """
+        sources = self.ranked(symbol)
+        if not sources:
+            return None
+        budget = self.budget if budget is None else budget
+        consensus = self.consensus if consensus is None else consensus
+
+        if consensus and len(sources) > 1:
+            return self._consensus(symbol, sources, budget)
+        return self._hedged(symbol, sources, budget)
+
+    def _hedged(self, symbol, sources, budget):
+        deadline = time.monotonic() + budget
+        waiting = list(sources)
+        pending = {}
+
+        def launch():
+            source = waiting.pop(0)
+            pending[self._executor.submit(self._fetch, source, symbol)] = source
+
+        launch()
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=min(self.hedge_delay, remaining), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                source = pending.pop(future)
+                quote = future.result()
+                if quote:
+                    return {**quote, 'source': source.domain}
+
+            # Nothing back within hedge_delay (a hedge), or a source failed (a failover): ask the next one too
+            if waiting:
+                self._count('failovers' if done else 'hedged')
+                launch()
+
+        # Requests still pending finish in the background and update their source's stats
+        self._count('exhausted')
+        return None
+
+    def _consensus(self, symbol, sources, budget):
+        futures = {self._executor.submit(self._fetch, source, symbol): source for source in sources}
+        done, _ = wait(futures, timeout=budget)
+        quotes = {futures[future].name: future.result() for future in done if future.result()}
+        if not quotes:
+            self._count('exhausted')
+            return None
+
+        prices = {name: quote['price'] for name, quote in quotes.items()}
+        median = statistics.median(prices.values())
+        changes = [quote['change'] for quote in quotes.values() if quote.get('change') is not None]
+
+        # Sentiment only comes from Investing.com
+        sentiment_text = next((quote['sentiment_text'] for quote in quotes.values() if quote.get('sentiment_text')), None)
+        return {
+            'price': median,
+            'change': statistics.median(changes) if changes else None,
+            'sentiment_text': sentiment_text,
+            'source': 'consensus',
+            'sources': prices,
+            'spread': round((max(prices.values()) - min(prices.values())) / median, 6) if median else 0
+        }
+
+    def stats(self):
+        return {
+            'hedged': self.hedged,
+            'failovers': self.failovers,
+            'exhausted': self.exhausted,
+            'sources': {source.name: source.stats() for source in self.sources}
+        }
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Async Multi-Currency Analyzer
+asyncio/aiohttp backend with the same public methods as MultiCurrencyAnalyzer.
+All page fetches run on one event loop in a background thread, so hundreds
+of requests can be in flight without tying up gunicorn threads.
+
+Quotes come from the same QuoteAggregator as the sync backend. A symbol
+with one configured source is fetched with aiohttp on the loop; with
+several, the aggregator's hedged (or consensus) quote runs on the
+analyzer pool, so both backends rank, hedge and agree the same way.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+from logs import get_logger, sampled
+from metrics import timed
+from scraper import AnalysisContext, MultiCurrencyAnalyzer
+from throttle import CircuitOpenError, RateLimitedError, failed_status
+
+logger = get_logger(__name__)
+
+
+class AsyncMultiCurrencyAnalyzer(MultiCurrencyAnalyzer):
+    def __init__(self, cache=None, http=None, use_firebase=True, max_inflight=None):
+        super().__init__(cache=cache, http=http, use_firebase=use_firebase)
+
+        self.max_inflight = max_inflight or int(os.getenv('ASYNC_MAX_INFLIGHT', 200))
+        self.timeout = float(os.getenv('HTTP_TIMEOUT', 10))
+
+        # Single-flight: cache key -> asyncio.Future of the in-progress fetch
+        self._inflight = {}
+        self._session = None
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever,
+                                        name='async-analyzer', daemon=True)
+        self._thread.start()
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the analyzer loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return future.result(timeout)
+
+    def close(self):
+        """Close the HTTP session and stop the event loop"""
+        if self._session:
+            self.run(self._session.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    # ========================================================================
+    # FETCHING
+    # ========================================================================
+
+    async def session(self):
+        # Created lazily so it binds to the analyzer loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_inflight, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def fetch_page_async(self, url):
+        """(status, body) of a page, through the same per-host rate limit and breaker as sync fetches"""
+        guard = self.http.guard_for(urlparse(url).hostname or '')
+        wait = guard.admit()
+        if wait:
+            await asyncio.sleep(wait)
+
+        failed = True
+        try:
+            session = await self.session()
+            async with session.get(url) as response:
+                body = await response.read()
+                failed = failed_status(response.status)
+                return response.status, body
+        finally:
+            guard.record(not failed)
+
+    async def fetch_source_async(self, source, symbol):
+        """One source's quote on the loop, recorded in the aggregator's source stats"""
+        started = time.perf_counter()
+        try:
+            with timed('fetch', symbol):
+                status, content = await self.fetch_page_async(source.url_for(symbol))
+            return self.aggregator.accept(source, symbol, status, content,
+                                          (time.perf_counter() - started) * 1000)
+        except (CircuitOpenError, RateLimitedError) as e:
+            logger.debug(f"⏸️ Skipped {symbol}: {e}")
+            source.record(False, error=str(e))
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ {source.name} quote for {symbol} failed: {e}")
+            source.record(False, (time.perf_counter() - started) * 1000, str(e))
+            return None
+
+    async def quote_async(self, symbol):
+        """Aggregated quote for symbol: one source on the loop, several hedged on the analyzer pool"""
+        sources = self.aggregator.ranked(symbol)
+        if len(sources) > 1:
+            return await self.loop.run_in_executor(self.executor, self.aggregator.quote, symbol)
+        if not sources:
+            return None
+
+        quote = await self.fetch_source_async(sources[0], symbol)
+        return {**quote, 'source': sources[0].domain} if quote else None
+
+    async def fetch_symbol_data_async(self, symbol):
+        """Get a quote for specific symbol from the fastest healthy source"""
+        try:
+            quote = await self.quote_async(symbol)
+            if quote is None:
+                logger.warning(f"⚠️ No source answered for {symbol}")
+            return self.symbol_quote(symbol, quote)
+        except Exception as e:
+            logger.error(f"❌ Error scraping {symbol}: {e}")
+            return None
+
+    async def fetch_dxy_data_async(self):
+        """Get US Dollar Index (DXY) from the fastest healthy source"""
+        try:
+            quote = await self.quote_async('DXY')
+            if quote is None:
+                logger.warning("⚠️ No source answered for DXY")
+            return self.dxy_quote(quote)
+        except Exception as e:
+            logger.error(f"❌ Error scraping DXY: {e}")
+            return None
+
+    async def load_page_async(self, key, context=None):
+        """Serve key from the context or shared quote cache, fetching once on a miss"""
+        if context is not None and key in context.pages:
+            return context.pages[key]
+
+        value = self.quote_cache.lookup(key, allow_stale=self.prefer_snapshot)
+        if value is None:
+            future = self._inflight.get(key)
+            if future is None:
+                if key == 'DXY':
+                    future = asyncio.ensure_future(self.fetch_dxy_data_async())
+                elif key in self.symbols:
+                    future = asyncio.ensure_future(self.fetch_symbol_data_async(key))
+                else:
+                    # US10Y and NEWS are fetched rarely; the sync fetcher on the pool is enough
+                    future = self.loop.run_in_executor(self.executor, self.node_fetcher(key))
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+            value = await asyncio.shield(future)
+            self.quote_cache.put(key, value)
+
+        # Upstream failing or its circuit open: the last good snapshot, marked stale
+        if value is None or (self.prefer_snapshot and self.circuit_open(key)):
+            value = self.stale_snapshot(key)
+
+        if context is not None:
+            context.pages[key] = value
+        return value
+
+    async def scrape_symbol_data_async(self, symbol, context=None):
+        if symbol not in self.symbols:
+            logger.warning(f"⚠️ Symbol {symbol} not configured")
+            return None
+        return await self.load_page_async(symbol, context)
+
+    async def scrape_dxy_data_async(self, context=None):
+        return await self.load_page_async('DXY', context)
+
+    async def prefetch_async(self, keys, context=None):
+        """Fetch distinct pages concurrently into the quote cache"""
+        keys = list(keys)
+        results = await asyncio.gather(*[self.load_page_async(key, context) for key in keys])
+        return dict(zip(keys, results))
+
+    # ========================================================================
+    # ANALYSIS
+    # ========================================================================
+
+    async def get_currency_strength_async(self, currency, context=None):
+        if currency not in self.currency_factors:
+            return None
+
+        if context is not None and currency in context.strengths:
+            return context.strengths[currency]
+
+        try:
+            pages = await self.prefetch_async(self.strength_pages(), context)
+            strengths = self.update_currency_strengths(pages)
+        except Exception as e:
+            logger.error(f"❌ Error getting {currency} strength: {e}")
+            strengths = {}
+
+        if context is not None:
+            for code in self.currency_factors:
+                context.strengths[code] = strengths.get(code)
+        return strengths.get(currency)
+
+    async def factor_snapshot_async(self, context=None):
+        if context is None:
+            context = AnalysisContext()
+        if context.snapshot is None:
+            pages = await self.prefetch_async(self.snapshot_pages(), context)
+            await self.get_currency_strength_async('USD', context)
+            context.snapshot = self.build_snapshot(pages, context)
+        return context.snapshot
+
+    async def analyze_pair_async(self, pair, context=None):
+        logger.debug(f"🔍 Analyzing {pair}...", extra=sampled(symbol=pair))
+
+        if pair not in self.symbols:
+            logger.warning(f"⚠️ Symbol {pair} not configured")
+            return None
+
+        if context is None:
+            context = AnalysisContext()
+
+        # Symbol page and snapshot pages are fetched together
+        pages = await self.prefetch_async(self.required_pages(pair), context)
+        symbol_data = pages.get(pair)
+
+        if not symbol_data:
+            return None
+
+        snapshot = await self.factor_snapshot_async(context)
+
+        with timed('bias', pair):
+            return self.build_prediction(pair, symbol_data, snapshot)
+
+    async def analyze_pairs_async(self, pairs, context=None):
+        batch = await self.analyze_batch_async(pairs, context)
+        return {pair: result['data'] for pair, result in batch['results'].items()}
+
+    async def analyze_batch_async(self, pairs, context=None):
+        if context is None:
+            context = AnalysisContext()
+
+        started = time.perf_counter()
+
+        pages = set()
+        for pair in pairs:
+            if pair in self.symbols:
+                pages |= self.required_pages(pair)
+
+        await self.prefetch_async(pages, context)
+        if pages:
+            await self.factor_snapshot_async(context)
+
+        fetched = time.perf_counter()
+
+        items = await asyncio.gather(*[self.analyze_batch_item_async(pair, context) for pair in pairs])
+
+        return {
+            'results': dict(zip(pairs, items)),
+            'fetch_ms': round((fetched - started) * 1000, 2),
+            'total_ms': round((time.perf_counter() - started) * 1000, 2),
+            'pages_fetched': len(context.pages)
+        }
+
+    async def analyze_batch_item_async(self, pair, context):
+        started = time.perf_counter()
+        data = None
+
+        if pair not in self.symbols:
+            error = f'Symbol {pair} not configured'
+        else:
+            try:
+                data = await self.analyze_pair_async(pair, context)
+                error = None if data else f'Could not analyze {pair}'
+            except Exception as e:
+                logger.error(f"❌ Error analyzing {pair}: {e}")
+                error = str(e)
+
+        return {
+            'success': error is None,
+            'data': data,
+            'error': error,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    async def enhance_signal_with_fundamentals_async(self, technical_signal, context=None):
+        if not technical_signal:
+            return None
+
+        symbol = technical_signal.get('symbol', 'XAUUSD')
+        with timed('enhance', symbol if symbol in self.symbols else 'other'):
+            fundamental = await self.analyze_pair_async(symbol, context)
+
+            if not fundamental:
+                return technical_signal
+
+            return self.combine_signal(technical_signal, fundamental)
+
+    # ========================================================================
+    # SYNC API (drop-in for MultiCurrencyAnalyzer)
+    # ========================================================================
+
+    def fetch_symbol_data(self, symbol):
+        return self.run(self.fetch_symbol_data_async(symbol))
+
+    def fetch_dxy_data(self):
+        return self.run(self.fetch_dxy_data_async())
+
+    def scrape_symbol_data(self, symbol, context=None):
+        return self.run(self.scrape_symbol_data_async(symbol, context))
+
+    def scrape_dxy_data(self, context=None):
+        return self.run(self.scrape_dxy_data_async(context))
+
+    def load_page(self, key, context=None):
+        return self.run(self.load_page_async(key, context))
+
+    def prefetch(self, keys, context=None):
+        return self.run(self.prefetch_async(keys, context))
+
+    def get_currency_strength(self, currency, context=None):
+        return self.run(self.get_currency_strength_async(currency, context))
+
+    def factor_snapshot(self, context=None):
+        return self.run(self.factor_snapshot_async(context))
+
+    def analyze_pair(self, pair, context=None):
+        return self.run(self.analyze_pair_async(pair, context))
+
+    def analyze_pairs(self, pairs, context=None):
+        return self.run(self.analyze_pairs_async(pairs, context))
+
+    def analyze_batch(self, pairs, context=None):
+        return self.run(self.analyze_batch_async(pairs, context))
+
+    def enhance_signal_with_fundamentals(self, technical_signal, context=None):
+        return self.run(self.enhance_signal_with_fundamentals_async(technical_signal, context))
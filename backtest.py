@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Signal Backtester
+Replays OHLC history against batches of signals with NumPy: finds the
+first candle that touches TP1, TP2, TP3 and SL for every signal at once,
+turns that into an outcome in R (multiples of the entry-to-SL risk) and
+summarises win rate and expectancy per symbol, confluence level or
+confidence band.
+
+Targets can be re-derived the way enhance_signal_with_fundamentals expands
+them (1.3x in MultiCurrencyAnalyzer, 1.2/1.3/1.4x in GoldAnalyzer), so
+the expansion can be measured against the technical levels on the same
+signals.
+
+Trade model: the position is entered at the signal's entry price on the
+first candle after the signal, one third is closed at each target and the
+remainder stays on the original stop. A candle that touches a target and
+the stop counts as the stop (the intrabar order is unknown). Trades still
+open after the horizon are marked to the last close.
+"""
+
+import csv
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import numpy as np
+
+LEVELS = ('tp1', 'tp2', 'tp3', 'sl')
+
+# Target multipliers applied on high volatility by the analyzers
+TP_EXPANSIONS = {
+    'technical': (1.0, 1.0, 1.0),
+    'multi_currency': (1.3, 1.3, 1.3),
+    'gold': (1.2, 1.3, 1.4)
+}
+
+DEFAULT_HORIZON_MS = 7 * 24 * 3600 * 1000
+
+# Keeps the (signals x window) scratch arrays around 32MB each
+MAX_WINDOW_CELLS = 4_000_000
+
+# Candles per block for the block max/min index used on long horizons
+BLOCK_SIZE = 64
+
+
+# ============================================================================
+# HISTORY AND SIGNALS
+# ============================================================================
+
+def load_csv(path):
+    """CSV of time,open,high,low,close (header optional, time in s or ms) -> (times ms, ohlc)"""
+    rows = []
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            try:
+                rows.append([float(value) for value in row[:5]])
+            except ValueError:
+                continue  # header
+
+    data = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    times = data[:, 0].astype(np.int64)
+    if len(times) and times[-1] < 10 ** 11:
+        times *= 1000
+    order = np.argsort(times, kind='stable')
+    return times[order], data[order, 1:]
+
+
+def resample(times, ohlc, timeframe):
+    """Aggregate candles into timeframe-second buckets (e.g. 1m -> 15m)"""
+    bucket_ms = timeframe * 1000
+    buckets = times // bucket_ms
+    starts = np.flatnonzero(np.concatenate([[True], buckets[1:] != buckets[:-1]]))
+    ends = np.concatenate([starts[1:], [len(times)]]) - 1
+    return buckets[starts] * bucket_ms, np.column_stack([
+        ohlc[starts, 0],
+        np.maximum.reduceat(ohlc[:, 1], starts),
+        np.minimum.reduceat(ohlc[:, 2], starts),
+        ohlc[ends, 3]
+    ])
+
+
+def generate_signals(times, ohlc, timeframe, symbol, warmup=200):
+    """Replay history through IncrementalSMC; a signal fires whenever the bias changes"""
+    from smc import IncrementalSMC
+
+    engine = IncrementalSMC(timeframe, symbol)
+    signals = []
+    bias = None
+    for i, (t, (o, h, l, c)) in enumerate(zip(times.tolist(), ohlc.tolist())):
+        signal = engine.update(t, o, h, l, c, emit=i >= warmup)
+        current = signal['bias'] if signal else None
+        if current is not None and current != bias:
+            signal['candle_time'] = t
+            signal['timestamp'] = t + timeframe * 1000
+            signals.append(signal)
+        bias = current
+    return signals
+
+
+def signal_time(signal):
+    """Milliseconds when a signal became known"""
+    timestamp = signal.get('timestamp')
+    if isinstance(timestamp, str):
+        return int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+    return int(timestamp)
+
+
+def signals_to_arrays(signals):
+    """Signal dicts (scanner, browser or stored format) -> dict of columns"""
+    columns = {
+        'time': np.array([signal_time(s) for s in signals], dtype=np.int64),
+        'direction': np.array([1 if s['bias'] == 'bullish' else -1 for s in signals], dtype=np.int8),
+        'symbol': np.array([s.get('symbol', 'XAUUSD') for s in signals], dtype=object),
+        'confluence': np.array([s.get('confluence', 'technical') for s in signals], dtype=object),
+        'confidence': np.array([float(s.get('confidence', 0)) for s in signals])
+    }
+    for level in ('entry',) + LEVELS:
+        columns[level] = np.array([float(s[level]) for s in signals], dtype=np.float64)
+
+    band = (columns['confidence'] // 10 * 10).astype(int)
+    columns['confidence_band'] = np.array([f'{b}-{b + 9}' for b in band], dtype=object)
+    return columns
+
+
+def expand_targets(columns, multipliers):
+    """Copy of the columns with targets moved away from entry, like the fundamentals enhancement"""
+    expanded = dict(columns)
+    entry = columns['entry']
+    for level, multiplier in zip(('tp1', 'tp2', 'tp3'), multipliers):
+        expanded[level] = entry + (columns[level] - entry) * multiplier
+    return expanded
+
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def first_touch(series, starts, ends, levels, above):
+    """
+    Index of the first candle in [start, end) whose value reaches level
+    (>= when above, <= otherwise), or -1.
+
+    Every pending signal scans a window of candles at once; windows double
+    in size, so trades that resolve quickly cost a few candles each.
+    """
+    hits = np.full(len(starts), -1, dtype=np.int64)
+    pending = np.flatnonzero(starts < ends)
+    last = len(series) - 1
+    offset, size = 0, 16
+
+    while len(pending):
+        size = max(16, min(size, MAX_WINDOW_CELLS // len(pending)))
+        index = starts[pending, None] + offset + np.arange(size)
+        valid = index < ends[pending, None]
+        values = series[np.minimum(index, last)]
+        touched = (values >= levels[pending, None] if above else values <= levels[pending, None]) & valid
+
+        found = touched.any(axis=1)
+        hits[pending[found]] = index[found, touched[found].argmax(axis=1)]
+        pending = pending[~found & valid[:, -1]]
+        offset += size
+        size *= 2
+
+    return hits
+
+
+def block_extremes(series, above, block=BLOCK_SIZE):
+    """Max (above) or min of every block of candles"""
+    reduce = np.maximum if above else np.minimum
+    return reduce.reduceat(series, np.arange(0, len(series), block))
+
+
+def first_touch_blocked(series, extremes, starts, ends, levels, above, block=BLOCK_SIZE):
+    """
+    first_touch over long horizons: scan the rest of the start block, then
+    find the first later block whose extreme reaches the level, then the
+    candle inside it. Each signal reads ~3 blocks of candles plus one value
+    per block it skips.
+    """
+    # Rest of the block the trade starts in
+    head_ends = np.minimum(ends, (starts // block + 1) * block)
+    hits = first_touch(series, starts, head_ends, levels, above)
+
+    pending = np.flatnonzero((hits < 0) & (head_ends < ends))
+    if len(pending):
+        first_block = head_ends[pending] // block
+        last_block = (ends[pending] - 1) // block + 1
+        found = first_touch(extremes, first_block, last_block, levels[pending], above)
+        pending, found = pending[found >= 0], found[found >= 0]
+
+        # The extreme may lie past the horizon in the final block
+        hits[pending] = first_touch(series, found * block, np.minimum(ends[pending], (found + 1) * block),
+                                    levels[pending], above)
+    return hits
+
+
+def simulate(times, ohlc, columns, horizon_ms=DEFAULT_HORIZON_MS):
+    """
+    Outcome of every signal against one symbol's candles.
+
+    Returns a dict of columns: '<level>_index' (-1 if not hit),
+    '<level>_minutes' (time to hit, NaN if not hit), '<tp>_taken' (hit
+    before the stop), 'stopped' (stop hit while the trade was open, i.e.
+    not after TP3 closed it), 'r' (outcome in R), 'win', 'expired' and
+    'order' (e.g. 'TP1>TP2>SL').
+    """
+    times = np.asarray(times, dtype=np.int64)
+    high, low, close = ohlc[:, 1], ohlc[:, 2], ohlc[:, 3]
+    count = len(columns['time'])
+
+    starts = np.searchsorted(times, columns['time'], side='left')
+    ends = np.searchsorted(times, columns['time'] + horizon_ms, side='left')
+
+    extremes = {True: block_extremes(high, True), False: block_extremes(low, False)}
+
+    result = {}
+    for level in LEVELS:
+        hits = np.full(count, -1, dtype=np.int64)
+        for direction in (1, -1):
+            mask = columns['direction'] == direction
+            # Longs take profit on highs and stop on lows, shorts the reverse
+            above = (direction == 1) != (level == 'sl')
+            hits[mask] = first_touch_blocked(high if above else low, extremes[above], starts[mask], ends[mask],
+                                             columns[level][mask], above)
+        result[f'{level}_index'] = hits
+        minutes = (times[np.maximum(hits, 0)] - columns['time']) / 60000
+        result[f'{level}_minutes'] = np.where(hits >= 0, np.maximum(minutes, 0), np.nan)
+
+    direction = columns['direction']
+    entry = columns['entry']
+    risk = np.abs(entry - columns['sl'])
+    risk = np.where(risk > 0, risk, np.nan)
+
+    sl_index = result['sl_index']
+    stopped = sl_index >= 0
+    sl_at = np.where(stopped, sl_index, np.iinfo(np.int64).max)
+
+    # Unresolved thirds are marked to the last close inside the horizon
+    last = np.clip(np.maximum(ends, starts + 1) - 1, 0, len(times) - 1)
+    open_r = direction * (close[last] - entry) / risk
+    remainder_r = np.where(stopped, -1.0, open_r)
+
+    r = np.zeros(count)
+    for level in ('tp1', 'tp2', 'tp3'):
+        index = result[f'{level}_index']
+        taken = result[f'{level}_taken'] = (index >= 0) & (index < sl_at)
+        reward = direction * (columns[level] - entry) / risk
+        r += np.where(taken, reward, remainder_r) / 3
+
+    result['stopped'] = stopped & ~result['tp3_taken']
+    result['r'] = r
+    result['win'] = r > 0
+    result['expired'] = ~stopped & (result['tp3_index'] < 0)
+    result['order'] = hit_order(result)
+    return result
+
+
+def hit_order(result):
+    """'TP1>TP2>SL'-style labels; levels touched on the same candle are joined with '='"""
+    indices = np.column_stack([result[f'{level}_index'] for level in LEVELS])
+    labels = [level.upper() for level in LEVELS]
+    orders = []
+    for row in indices.tolist():
+        hit = sorted((index, i) for i, index in enumerate(row) if index >= 0)
+        if not hit:
+            orders.append('none')
+            continue
+        text = labels[hit[0][1]]
+        for (previous, _), (index, i) in zip(hit, hit[1:]):
+            text += ('=' if index == previous else '>') + labels[i]
+        orders.append(text)
+    return np.array(orders, dtype=object)
+
+
+def backtest(history, signals, horizon_ms=DEFAULT_HORIZON_MS, multipliers=None):
+    """
+    Simulate signals across symbols.
+
+    history: {symbol: (times ms, ohlc)}; signals: list of signal dicts.
+    multipliers: optional TP expansion, see TP_EXPANSIONS.
+    Returns (columns, result) with rows in the order of signals.
+    """
+    columns = signals_to_arrays(signals)
+    if multipliers:
+        columns = expand_targets(columns, multipliers)
+
+    count = len(signals)
+    result = {}
+    for symbol in np.unique(columns['symbol']):
+        if symbol not in history:
+            continue
+        rows = np.flatnonzero(columns['symbol'] == symbol)
+        times, ohlc = history[symbol]
+        part = simulate(times, ohlc, {name: values[rows] for name, values in columns.items()}, horizon_ms)
+        for name, values in part.items():
+            if name not in result:
+                fill = np.nan if values.dtype.kind == 'f' else (False if values.dtype == bool else -1)
+                result[name] = np.full(count, fill, dtype=values.dtype)
+            result[name][rows] = values
+
+    # Signals without candles stay out of the summary
+    result['tested'] = np.isin(columns['symbol'], list(history))
+    return columns, result
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def summarize(columns, result, by=('symbol', 'confluence')):
+    """Win rate, expectancy (mean R) and hit statistics per group"""
+    groups = defaultdict(list)
+    keys = [columns[name] for name in by]
+    for row in np.flatnonzero(result.get('tested', np.ones(len(columns['time']), dtype=bool))):
+        groups[tuple(key[row] for key in keys)].append(row)
+
+    summary = []
+    for group, rows in sorted(groups.items()):
+        rows = np.array(rows)
+        r = result['r'][rows]
+        wins = result['win'][rows]
+        summary.append({
+            **dict(zip(by, group)),
+            'signals': len(rows),
+            'win_rate': round(float(wins.mean()) * 100, 1),
+            'expectancy_r': round(float(np.nanmean(r)), 3),
+            'avg_win_r': round(float(r[wins].mean()), 3) if wins.any() else None,
+            'avg_loss_r': round(float(r[~wins].mean()), 3) if (~wins).any() else None,
+            'tp1_rate': round(float(result['tp1_taken'][rows].mean()) * 100, 1),
+            'tp2_rate': round(float(result['tp2_taken'][rows].mean()) * 100, 1),
+            'tp3_rate': round(float(result['tp3_taken'][rows].mean()) * 100, 1),
+            'sl_rate': round(float(result['stopped'][rows].mean()) * 100, 1),
+            'expired_rate': round(float(result['expired'][rows].mean()) * 100, 1),
+            'median_minutes_tp1': _median(result['tp1_minutes'][rows]),
+            'median_minutes_sl': _median(np.where(result['stopped'][rows], result['sl_minutes'][rows], np.nan)),
+            'top_orders': Counter(result['order'][rows].tolist()).most_common(3)
+        })
+    return summary
+
+
+def _median(values):
+    values = values[~np.isnan(values)]
+    return round(float(np.median(values)), 1) if len(values) else None
+
+
+def compare_expansions(history, signals, expansions=TP_EXPANSIONS, by=('symbol', 'confluence'),
+                       horizon_ms=DEFAULT_HORIZON_MS):
+    """{expansion name: summary} for the same signals under each target expansion"""
+    return {
+        name: summarize(*backtest(history, signals, horizon_ms, multipliers), by=by)
+        for name, multipliers in expansions.items()
+    }
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Quote Aggregator Benchmark
+Asks for the Gold quote --quotes times from three local sources with
+different latency and failure profiles, using only the primary source,
+hedged requests across all three, and a median consensus. Reports quote
+latency percentiles, how often a price came back, requests sent per
+quote, and the source ranking the aggregator learned.
+
+Usage:
+    python benchmarks/bench_aggregator.py --quotes 200 --timeout 1.5
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from aggregator import PARSERS, QuoteAggregator, QuoteSource
+from fixture_server import FixtureServer
+from http_client import HttpClient
+
+# name: (fixture page, server settings)
+PROFILES = {
+    # Usually fastest, but a heavy tail: errors and the odd hang past the timeout
+    'investing': ('https://www.investing.com/commodities/gold',
+                  {'latency_ms': 120, 'jitter_ms': 100, 'error_rate': 0.08, 'hang_rate': 0.04}),
+    'cnbc': ('https://www.cnbc.com/quotes/GC.1',
+             {'latency_ms': 250, 'jitter_ms': 60, 'error_rate': 0.02}),
+    # Slow but always answers (serves the Investing.com page, parsed as such)
+    'backup': ('https://www.investing.com/commodities/gold',
+               {'latency_ms': 450, 'jitter_ms': 50})
+}
+
+
+def start_sources():
+    servers, sources = {}, []
+    for name, (page, settings) in PROFILES.items():
+        server = FixtureServer(**settings).start()
+        url = server.url_for(page)
+        servers[name] = server
+        sources.append(QuoteSource(name, lambda symbol, url=url: url, PARSERS.get(name, PARSERS['investing'])))
+    return servers, sources
+
+
+def run(mode, args):
+    servers, sources = start_sources()
+    # No rate limit or breaker: every source shares the 127.0.0.1 host
+    http = HttpClient(retries=0, timeout=args.timeout)
+    if mode == 'single':
+        sources = sources[:1]
+    aggregator = QuoteAggregator(sources, http, budget=args.budget, hedge_delay=args.hedge_ms / 1000,
+                                 consensus=mode == 'consensus')
+
+    latencies, answered = [], 0
+    for _ in range(args.quotes):
+        started = time.perf_counter()
+        quote = aggregator.quote('XAUUSD')
+        latencies.append((time.perf_counter() - started) * 1000)
+        answered += quote is not None
+
+    sent = sum(server.requests for server in servers.values())
+    ranking = [source.name for source in aggregator.ranked('XAUUSD')]
+    for server in servers.values():
+        server.stop()
+
+    ordered = sorted(latencies)
+    return {
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': ordered[int(len(ordered) * 0.95)],
+        'p99_ms': ordered[int(len(ordered) * 0.99)],
+        'answered': answered / len(latencies) * 100,
+        'sent': sent / len(latencies),
+        'ranking': ranking,
+        'sources': aggregator.stats()['sources']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark single-source, hedged and consensus quotes')
+    parser.add_argument('--quotes', type=int, default=200)
+    parser.add_argument('--timeout', type=float, default=1.5)
+    parser.add_argument('--budget', type=float, default=2.0)
+    parser.add_argument('--hedge-ms', type=float, default=300)
+    args = parser.parse_args()
+
+    # Injected failures are expected; keep them off the report
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    print(f"🚀 {args.quotes} Gold quotes, client timeout {args.timeout}s, budget {args.budget}s, "
+          f"hedge after {args.hedge_ms:.0f}ms\n")
+    for name, (_, settings) in PROFILES.items():
+        print(f"  {name:<10} " + ', '.join(f'{key}={value}' for key, value in settings.items()))
+
+    print(f"\n  {'mode':<11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'answered':>10}{'req/quote':>11}  ranking")
+    results = {}
+    for mode in ('single', 'hedged', 'consensus'):
+        result = results[mode] = run(mode, args)
+        print(f"  {mode:<11}{result['p50_ms']:>9.0f}{result['p95_ms']:>9.0f}{result['p99_ms']:>9.0f}"
+              f"{result['answered']:>9.1f}%{result['sent']:>11.2f}  {' > '.join(result['ranking'])}")
+
+    print("\n  learned source stats (hedged run):")
+    for name, stats in results['hedged']['sources'].items():
+        latency = f"{stats['latency_ms']}ms" if stats['latency_ms'] is not None else 'unmeasured'
+        print(f"    {name:<10} latency {latency}, reliability {stats['reliability']}, {stats['requests']} requests")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Backtest Benchmark
+Times backtest.py on years of synthetic 1-minute candles with thousands of
+signals, compares the technical targets with the fundamentals expansions
+and, with --verify, checks hit indices against a plain per-candle loop.
+
+Signals are random ATR-based setups (same TP/SL multiples as smc.py) by
+default, or generated by replaying the candles through IncrementalSMC on
+a higher timeframe with --smc. --csv backtests real history instead.
+
+Usage:
+    python benchmarks/bench_backtest.py --years 3 --signals 5000 --verify
+    python benchmarks/bench_backtest.py --years 1 --smc --timeframe 900
+    python benchmarks/bench_backtest.py --csv XAUUSD_1m.csv --symbol XAUUSD --smc
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backtest import (LEVELS, TP_EXPANSIONS, backtest, compare_expansions, generate_signals,
+                      load_csv, resample)
+from bench_smc import synthetic_candles
+
+CONFLUENCE = ('strong', 'moderate', 'weak')
+
+
+def random_signals(times, ohlc, symbol, count, timeframe=900, seed=7):
+    """ATR-based setups on random candles, shaped like smc.py signals"""
+    rng = np.random.default_rng(seed)
+    high, low = ohlc[:, 1], ohlc[:, 2]
+    atr_window = max(1, timeframe // 60) * 14
+    picks = np.sort(rng.choice(np.arange(atr_window, len(times) - 1), count, replace=False))
+
+    signals = []
+    for i in picks.tolist():
+        entry = float(ohlc[i, 3])
+        atr = float((high[i - atr_window:i] - low[i - atr_window:i]).mean()) * max(1, timeframe // 60) ** 0.5
+        side = 1 if rng.random() < 0.5 else -1
+        signals.append({
+            'symbol': symbol,
+            'bias': 'bullish' if side == 1 else 'bearish',
+            'entry': entry,
+            'tp1': entry + side * atr * 1.5,
+            'tp2': entry + side * atr * 2.5,
+            'tp3': entry + side * atr * 4.0,
+            'sl': entry - side * atr * 1.2,
+            'confidence': float(rng.integers(70, 99)),
+            'confluence': CONFLUENCE[rng.integers(0, 3)],
+            'timestamp': int(times[i]) + 60000
+        })
+    return signals
+
+
+def reference_hits(times, ohlc, signal, horizon_ms):
+    """First touch of every level, one candle at a time"""
+    start = int(np.searchsorted(times, signal['timestamp']))
+    long = signal['bias'] == 'bullish'
+    hits = {}
+    for level in LEVELS:
+        price = float(signal[level])
+        above = long != (level == 'sl')
+        hits[level] = -1
+        for j in range(start, len(times)):
+            if times[j] >= signal['timestamp'] + horizon_ms:
+                break
+            if (ohlc[j, 1] >= price) if above else (ohlc[j, 2] <= price):
+                hits[level] = j
+                break
+    return hits
+
+
+def print_summary(name, summary, by):
+    print(f"\n📊 {name}")
+    print(f"  {'group':<24} {'n':>6} {'win %':>6} {'exp R':>7} {'TP1 %':>6} {'TP2 %':>6} {'TP3 %':>6} "
+          f"{'SL %':>6} {'TP1 min':>8} {'SL min':>8}")
+    for row in summary:
+        group = ' '.join(str(row[key]) for key in by)
+        print(f"  {group:<24} {row['signals']:>6} {row['win_rate']:>6} {row['expectancy_r']:>7} "
+              f"{row['tp1_rate']:>6} {row['tp2_rate']:>6} {row['tp3_rate']:>6} {row['sl_rate']:>6} "
+              f"{str(row['median_minutes_tp1']):>8} {str(row['median_minutes_sl']):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the vectorized signal backtester')
+    parser.add_argument('--years', type=float, default=3)
+    parser.add_argument('--symbols', nargs='*', default=['XAUUSD', 'EURUSD'])
+    parser.add_argument('--signals', type=int, default=5000, help='random signals per symbol')
+    parser.add_argument('--smc', action='store_true', help='generate signals with IncrementalSMC instead')
+    parser.add_argument('--timeframe', type=int, default=900, help='signal timeframe in seconds')
+    parser.add_argument('--horizon-days', type=float, default=7)
+    parser.add_argument('--csv', help='1-minute history (time,open,high,low,close) for --symbol')
+    parser.add_argument('--symbol', default='XAUUSD')
+    parser.add_argument('--by', nargs='*', default=['symbol', 'confluence'])
+    parser.add_argument('--verify', type=int, nargs='?', const=300, default=0,
+                        help='check N signals against a per-candle loop')
+    args = parser.parse_args()
+    horizon_ms = int(args.horizon_days * 86400 * 1000)
+
+    started = time.perf_counter()
+    if args.csv:
+        history = {args.symbol: load_csv(args.csv)}
+    else:
+        count = int(args.years * 365 * 24 * 60)
+        history = {
+            symbol: synthetic_candles(count, 60, start_price=price, seed=seed)
+            for seed, (symbol, price) in enumerate(zip(args.symbols, (2650.0, 1.10, 150.0, 1.27, 0.66)))
+        }
+    candles = sum(len(times) for times, _ in history.values())
+    print(f"🕯️ {candles:,} 1m candles across {len(history)} symbols ({time.perf_counter() - started:.1f}s to load)")
+
+    started = time.perf_counter()
+    signals = []
+    for symbol, (times, ohlc) in history.items():
+        if args.smc:
+            signals += generate_signals(*resample(times, ohlc, args.timeframe), args.timeframe, symbol)
+        else:
+            signals += random_signals(times, ohlc, symbol, args.signals, args.timeframe)
+    print(f"🎯 {len(signals):,} signals ({time.perf_counter() - started:.1f}s to generate)")
+    if not signals:
+        return
+
+    started = time.perf_counter()
+    columns, result = backtest(history, signals, horizon_ms)
+    elapsed = time.perf_counter() - started
+    print(f"⚡ Backtest: {elapsed * 1000:.0f}ms ({len(signals) / elapsed:,.0f} signals/s, "
+          f"{candles / elapsed / 1e6:,.1f}M candles/s of history)")
+
+    if args.verify:
+        rows = np.random.default_rng(1).choice(len(signals), min(args.verify, len(signals)), replace=False)
+        mismatches = 0
+        for row in rows.tolist():
+            times, ohlc = history[signals[row]['symbol']]
+            expected = reference_hits(times, ohlc, {**signals[row], 'timestamp': int(columns['time'][row])}, horizon_ms)
+            mismatches += any(expected[level] != result[f'{level}_index'][row] for level in LEVELS)
+        print(f"{'✅' if not mismatches else '❌'} Verified {len(rows)} signals against the loop: {mismatches} mismatches")
+
+    started = time.perf_counter()
+    summaries = compare_expansions(history, signals, by=tuple(args.by), horizon_ms=horizon_ms)
+    elapsed = time.perf_counter() - started
+    print(f"⚡ {len(TP_EXPANSIONS)} target variants: {elapsed * 1000:.0f}ms")
+
+    for name, summary in summaries.items():
+        print_summary(f"{name} targets {TP_EXPANSIONS[name]}", summary, args.by)
+
+    if 'confidence_band' not in args.by:
+        print_summary('technical targets by confidence', compare_expansions(
+            history, signals, {'technical': TP_EXPANSIONS['technical']}, by=('confidence_band',),
+            horizon_ms=horizon_ms)['technical'], ['confidence_band'])
+
+
+if __name__ == '__main__':
+    main()
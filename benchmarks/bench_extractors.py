@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Extractor Benchmark
+Parse time and peak memory per page for each quote extractor
+
+Usage:
+    python benchmarks/bench_extractors.py [page.html ...]
+
+Without arguments a synthetic ~400KB Investing.com-style page is used.
+"""
+
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractors import (BS4_AVAILABLE, LXML_AVAILABLE, LxmlExtractor,
+                        RegexExtractor, SoupExtractor)
+
+
+def synthetic_page(size_kb=400):
+    """Build a page shaped like an instrument page: lots of markup, three targets"""
+    row = ('<div class="row"><a href="/news/item">Market headline text</a>'
+           '<span class="text-xs">1.2345</span><script>var x = {"a": 1};</script></div>\n')
+    filler = row * (size_kb * 1024 // len(row))
+    half = len(filler) // 2
+    return (
+        '<!DOCTYPE html><html><head><title>Gold Futures</title></head><body>'
+        + filler[:half]
+        + '<div class="instrument-header">'
+          '<span data-test="instrument-price-last">2,650.25</span>'
+          '<span data-test="instrument-price-change">+12.30</span>'
+          '</div>'
+        + filler[half:]
+        + '<div class="sentiment"><div class="bar">Strong Buy</div></div>'
+        + '</body></html>'
+    ).encode('utf-8')
+
+
+def bench(extractor, page, repeat):
+    # Warm up (and check the extractor finds the quote)
+    result = extractor.extract(page)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extractor.extract(page)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    extractor.extract(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'found': result is not None,
+        'median_ms': statistics.median(timings) * 1000,
+        'min_ms': min(timings) * 1000,
+        'peak_kb': peak / 1024
+    }
+
+
+def main():
+    pages = []
+    for path in sys.argv[1:]:
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+    if not pages:
+        pages.append(('synthetic', synthetic_page()))
+
+    extractors = [RegexExtractor()]
+    if LXML_AVAILABLE:
+        extractors.append(LxmlExtractor())
+    else:
+        print("⚠️ lxml not installed - skipping lxml extractor")
+    if BS4_AVAILABLE:
+        extractors.append(SoupExtractor())
+    else:
+        print("⚠️ beautifulsoup4 not installed - skipping bs4 extractor")
+
+    for name, page in pages:
+        print(f"\n📄 {name} ({len(page) / 1024:.0f} KB)")
+        print(f"   {'extractor':<10} {'found':<6} {'median ms':>10} {'min ms':>10} {'peak KB':>10}")
+        for extractor in extractors:
+            repeat = 5 if extractor.name == 'bs4' else 20
+            result = bench(extractor, page, repeat)
+            print(f"   {extractor.name:<10} {str(result['found']):<6} "
+                  f"{result['median_ms']:>10.2f} {result['min_ms']:>10.2f} {result['peak_kb']:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Firebase Write-Behind Benchmark
+Saves bursts of signals to a fake Realtime Database (benchmarks/fake_rtdb.py)
+one synchronous write per signal, as save_signal_to_firebase used to, and
+through FirebaseWriter, reporting how long producers block, how many
+requests reach the database and whether every signal arrived. Also runs
+the writer against injected failures and a full queue.
+
+Usage:
+    python benchmarks/bench_firebase_writer.py --signals 2000 --producers 8 --latency-ms 80
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_rtdb import FakeRealtimeDatabase
+from firebase_writer import FirebaseWriter
+from http_client import HttpClient
+from signal_store import push_id
+
+
+def make_signal(i):
+    return {'symbol': 'XAUUSD', 'bias': 'bullish' if i % 2 else 'bearish', 'entry': '2650.25',
+            'tp1': '2665.00', 'tp2': '2680.00', 'tp3': '2700.00', 'sl': '2640.00',
+            'confidence': 70 + i % 28, 'timestamp': int(time.time() * 1000)}
+
+
+def run_producers(save, signals, producers):
+    """Call save(i) for range(signals) across producer threads; returns per-call latencies (ms)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def produce(start):
+        local = []
+        for i in range(start, signals, producers):
+            started = time.perf_counter()
+            save(i)
+            local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies)
+
+
+def report(name, latencies, elapsed, db, expected):
+    stored = len(db.get('signals') or {})
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"  {name:<14} {p50:>9.2f} {p99:>9.2f} {elapsed:>8.2f} {db.requests:>9} {stored:>7}/{expected}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched Firebase signal writes')
+    parser.add_argument('--signals', type=int, default=2000)
+    parser.add_argument('--producers', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=80)
+    parser.add_argument('--flush-interval', type=float, default=0.25)
+    parser.add_argument('--batch-size', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"🧪 {args.signals} signals from {args.producers} threads, {args.latency_ms:.0f}ms database latency")
+    print(f"\n  {'mode':<14} {'p50 ms':>9} {'p99 ms':>9} {'total s':>8} {'requests':>9} {'stored':>7}")
+
+    # One synchronous write per signal on the caller's thread
+    db = FakeRealtimeDatabase(latency_ms=args.latency_ms).start()
+    http = HttpClient(pool_size=args.producers, retries=0)
+    started = time.perf_counter()
+    latencies = run_producers(
+        lambda i: http.request('PUT', f'{db.base_url}/signals/{push_id()}.json', data=json.dumps(make_signal(i))),
+        args.signals, args.producers)
+    report('sync', latencies, time.perf_counter() - started, db, args.signals)
+    db.stop()
+
+    # Write-behind
+    db = FakeRealtimeDatabase(latency_ms=args.latency_ms).start()
+    writer = FirebaseWriter(db.base_url, flush_interval=args.flush_interval, batch_size=args.batch_size,
+                            max_queue=args.signals)
+    started = time.perf_counter()
+    latencies = run_producers(lambda i: writer.put(f'signals/{push_id()}', make_signal(i)),
+                              args.signals, args.producers)
+    writer.flush()
+    report('write-behind', latencies, time.perf_counter() - started, db, args.signals)
+    print(f"  {'':<14} {writer.stats()}")
+    writer.stop()
+    db.stop()
+
+    # The first batches fail and are retried with backoff
+    db = FakeRealtimeDatabase(latency_ms=args.latency_ms, fail_next=3).start()
+    writer = FirebaseWriter(db.base_url, flush_interval=args.flush_interval, batch_size=args.batch_size,
+                            backoff=0.1)
+    for i in range(500):
+        writer.put(f'signals/{push_id()}', make_signal(i))
+    writer.flush()
+    stats = writer.stats()
+    print(f"\n🔁 Injected 3 failures: stored {len(db.get('signals') or {})}/500, "
+          f"retries {stats['retries']}, failed {stats['failed']}")
+    writer.stop()
+    db.stop()
+
+    # A slow database fills the bounded queue and producers are turned away
+    db = FakeRealtimeDatabase(latency_ms=1000).start()
+    writer = FirebaseWriter(db.base_url, flush_interval=0.05, batch_size=10, max_queue=20, put_timeout=0.05)
+    accepted = sum(writer.put(f'signals/{push_id()}', make_signal(i)) for i in range(200))
+    writer.flush()
+    stats = writer.stats()
+    print(f"🚧 Queue of 20 at 1s latency: accepted {accepted}/200, rejected {stats['rejected']}, "
+          f"stored {len(db.get('signals') or {})}")
+    writer.stop()
+    db.stop()
+
+
+if __name__ == '__main__':
+    main()
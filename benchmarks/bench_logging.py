@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Logging Benchmark
+Time spent by the calling thread per log line with print() and with the
+queued logger, writing to a stdout that takes --write-ms per write (a
+slow log pipe), for per-request lines (sampled) and error lines (kept).
+
+Usage:
+    python benchmarks/bench_logging.py --lines 2000 --write-ms 0.5
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class SlowStream(io.TextIOBase):
+    """stdout stand-in whose writes block like a backed-up pipe"""
+
+    def __init__(self, write_ms):
+        self.write_ms = write_ms
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        time.sleep(self.write_ms / 1000)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def per_call_us(log, lines):
+    timings = []
+    for i in range(lines):
+        started = time.perf_counter()
+        log(i)
+        timings.append(time.perf_counter() - started)
+    ordered = sorted(timings)
+    return statistics.mean(timings) * 1e6, ordered[int(len(ordered) * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark queued logging against print')
+    parser.add_argument('--lines', type=int, default=2000)
+    parser.add_argument('--write-ms', type=float, default=0.5)
+    args = parser.parse_args()
+
+    stream = SlowStream(args.write_ms)
+    real_stdout, sys.stdout = sys.stdout, stream
+
+    # Imported with stdout swapped so the log writer thread writes to the slow stream
+    import logs
+    logs.setup_logging()
+    logger = logs.get_logger('bench')
+
+    def old_analysis_lines(i):
+        print(f"✅ XAUUSD Analysis:")
+        print(f"   Bias: bullish")
+        print(f"   Confidence: {60 + i % 30}%")
+        print(f"   Price: 2650.25")
+
+    def new_analysis_line(i):
+        logger.info(f"✅ XAUUSD analysis: bullish ({60 + i % 30}%) @ 2650.25",
+                    extra=logs.sampled(symbol='XAUUSD', bias='bullish', confidence=60 + i % 30, price=2650.25))
+
+    rows = [
+        ('print, analysis (4 lines)', old_analysis_lines),
+        ('print, error', lambda i: print(f"❌ Error scraping XAUUSD: timeout {i}")),
+        ('logger, analysis (sampled)', new_analysis_line),
+        ('logger, error', lambda i: logger.error(f"❌ Error scraping XAUUSD: timeout {i}")),
+    ]
+    results = [(label, *per_call_us(log, args.lines)) for label, log in rows]
+
+    started = time.perf_counter()
+    logs.stop_logging()
+    drained_ms = (time.perf_counter() - started) * 1000
+    stats = logs.logging_stats()
+    sys.stdout = real_stdout
+
+    print(f"🚀 {args.lines} calls each, stdout write {args.write_ms}ms, sample rate {logs.LOG_SAMPLE_RATE}\n")
+    print(f"  {'caller':<30}{'mean us':>10}{'p99 us':>10}")
+    for label, mean, p99 in results:
+        print(f"  {label:<30}{mean:>10.1f}{p99:>10.1f}")
+    print(f"\n  logger: {stats['queued']} queued, {stats['sampled_out']} sampled out, "
+          f"{stats['dropped']} dropped; writer drained the rest in {drained_ms:.0f}ms off the caller")
+
+
+if __name__ == '__main__':
+    main()
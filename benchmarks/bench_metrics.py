@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark
+Runs analyze_batch against the local fixture server (no added latency, no
+quote cache, so every stage runs every time) with stage timing on and with
+timed() swapped for a no-op, alternating rounds, and reports the overhead.
+Also reports the raw cost of one timed() block.
+
+Usage:
+    python benchmarks/bench_metrics.py --rounds 20 --iterations 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aggregator
+import metrics
+import scraper
+from bench_scraper import SYMBOLS, TECHNICAL_SIGNAL, build_analyzer
+from fixture_server import FixtureServer
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def fail(self):
+        pass
+
+
+def noop_timed(stage, symbol):
+    return _NoopTimer()
+
+
+def workload(analyzer, iterations):
+    started = time.perf_counter()
+    for i in range(iterations):
+        analyzer.analyze_batch(SYMBOLS)
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        analyzer.enhance_signal_with_fundamentals({**TECHNICAL_SIGNAL, 'symbol': symbol})
+        analyzer.calculate_volatility_prediction(symbol, 2650.25)
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure analyzer stage timing overhead')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=5)
+    args = parser.parse_args()
+
+    server = FixtureServer().start()
+    analyzer = build_analyzer(server, cache_ttl=0, backend='sync')
+
+    # Raw cost of one timed block
+    calls = 200000
+    started = time.perf_counter()
+    for _ in range(calls):
+        with metrics.timed('bench', 'XAUUSD'):
+            pass
+    per_call_us = (time.perf_counter() - started) / calls * 1e6
+
+    workload(analyzer, 2)
+    observed_before = sum(sum(child[:-1]) for child in metrics.stage_seconds._children.values())
+
+    timings = {'on': [], 'off': []}
+    for round in range(args.rounds):
+        # Alternate which goes first so warm-up effects don't favour one
+        for mode in (('on', 'off') if round % 2 else ('off', 'on')):
+            # Fetch and parse are timed in the aggregator, the rest in the scraper
+            scraper.timed = aggregator.timed = metrics.timed if mode == 'on' else noop_timed
+            timings[mode].append(workload(analyzer, args.iterations))
+    scraper.timed = aggregator.timed = metrics.timed
+
+    observed = sum(sum(child[:-1]) for child in metrics.stage_seconds._children.values())
+    stages_per_iteration = (observed - observed_before) / (args.rounds * args.iterations)
+
+    on, off = statistics.median(timings['on']), statistics.median(timings['off'])
+    # Paired per round, so drift between rounds cancels out
+    paired = statistics.median(a / b - 1 for a, b in zip(timings['on'], timings['off']))
+    print(f"🚀 {args.rounds} rounds x {args.iterations} iterations "
+          f"(analyze_batch of {len(SYMBOLS)} symbols + enhance + volatility)\n")
+    print(f"  timed() block:          {per_call_us:.2f} us")
+    print(f"  stages per iteration:   {stages_per_iteration:.0f}")
+    print(f"  per iteration, off:     {off:.2f} ms")
+    print(f"  per iteration, on:      {on:.2f} ms")
+    print(f"  overhead (measured):    {paired * 100:+.2f}%  (round-to-round noise dominates)")
+    print(f"  overhead (cost model):  {stages_per_iteration * per_call_us / 1000 / off * 100:.3f}%")
+
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
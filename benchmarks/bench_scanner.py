@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Scanner Benchmark
+Feeds synthetic candle histories for many symbol x timeframe keys through
+the SignalScanner worker processes and reports warm-up and per-candle
+throughput (symbol-timeframes per second) and close-to-result lag.
+
+Usage:
+    python benchmarks/bench_scanner.py --symbols 12 --timeframes 300 900 3600 --workers 1 2 4 --rounds 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_smc import synthetic_candles
+from scanner import SignalScanner
+
+SYMBOLS = ['XAUUSD', 'XAGUSD', 'EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD', 'USDCAD', 'USDCHF',
+           'NZDUSD', 'EURJPY', 'GBPJPY', 'EURGBP']
+
+
+def wait_for(scanner, scans, timeout=300):
+    deadline = time.time() + timeout
+    while scanner.scans < scans and time.time() < deadline:
+        time.sleep(0.001)
+
+
+def run(workers, keys, history, rounds, interval):
+    scanner = SignalScanner(symbols=[k[0] for k in keys], timeframes=sorted({k[1] for k in keys}), workers=workers)
+    scanner.start(warm=False)
+
+    data = {key: synthetic_candles(history + rounds, key[1], seed=i) for i, key in enumerate(keys)}
+
+    started = time.perf_counter()
+    for key, (times, ohlc) in data.items():
+        scanner.load(key[0], key[1], times[:history], ohlc[:history])
+    wait_for(scanner, len(keys))
+    warm_s = time.perf_counter() - started
+
+    # Every key closes a candle each round, like a timeframe boundary
+    started = time.perf_counter()
+    for r in range(rounds):
+        for key, (times, ohlc) in data.items():
+            i = history + r
+            scanner.push(key[0], key[1], times[i:i + 1], ohlc[i:i + 1])
+        if interval:
+            time.sleep(interval)
+    wait_for(scanner, len(keys) * (rounds + 1))
+    steady_s = time.perf_counter() - started
+
+    stats = scanner.stats()
+    scanner.stop()
+    return {
+        'warm_keys_per_sec': len(keys) / warm_s,
+        'scans_per_sec': len(keys) * rounds / steady_s,
+        'lag': stats['lag_ms'],
+        'compute_ms': stats['avg_compute_ms'],
+        'fired': stats['fired'],
+        'errors': stats['errors']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the multi-symbol signal scanner')
+    parser.add_argument('--symbols', type=int, default=12)
+    parser.add_argument('--timeframes', type=int, nargs='*', default=[300, 900, 3600])
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, 2, 4])
+    parser.add_argument('--history', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=0, help='seconds between rounds (0 = flood)')
+    args = parser.parse_args()
+
+    symbols = (SYMBOLS * (args.symbols // len(SYMBOLS) + 1))[:args.symbols]
+    keys = [(f'{symbol}{i // len(SYMBOLS) or ""}', tf) for i, symbol in enumerate(symbols) for tf in args.timeframes]
+
+    print(f"🔎 {len(keys)} symbol-timeframes | {args.history} candles history | {args.rounds} rounds | {os.cpu_count()} cores")
+    print(f"\n{'workers':>7} {'warm keys/s':>12} {'scans/s':>9} {'lag p50':>8} {'lag p95':>8} {'lag max':>8} "
+          f"{'compute ms':>11} {'fired':>6}")
+
+    # Silence the per-signal prints while timing
+    real_stdout = sys.stdout
+    for workers in args.workers:
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            result = run(workers, keys, args.history, args.rounds, args.interval)
+        finally:
+            sys.stdout.close()
+            sys.stdout = real_stdout
+        lag = result['lag']
+        print(f"{workers:>7} {result['warm_keys_per_sec']:>12.1f} {result['scans_per_sec']:>9.0f} "
+              f"{lag['p50']:>8} {lag['p95']:>8} {lag['max']:>8} {result['compute_ms']:>11} {result['fired']:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmark
+Runs the analyzer against the local fixture server and reports per-method
+latency percentiles, throughput and allocations.
+
+Usage:
+    python benchmarks/bench_scraper.py --iterations 50 --concurrency 4 \
+        --latency-ms 120 --jitter-ms 40 --error-rate 0.02 --cache-ttl 0
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import FixtureServer
+from http_client import HttpClient
+from quote_cache import QuoteCache
+from scraper import MultiCurrencyAnalyzer
+
+SYMBOLS = ['XAUUSD', 'EURUSD', 'GBPUSD', 'USDJPY', 'EURJPY', 'AUDUSD']
+
+TECHNICAL_SIGNAL = {
+    'symbol': 'XAUUSD',
+    'bias': 'bullish',
+    'entry': '2650.25',
+    'tp1': '2665.00',
+    'tp2': '2680.00',
+    'tp3': '2700.00',
+    'sl': '2640.00',
+    'confidence': 72
+}
+
+
+def build_analyzer(server, cache_ttl, backend):
+    cache = QuoteCache(ttl=cache_ttl, max_entries=64)
+    # Its own client: the shared one rate-limits each host (HTTP_RATE_LIMIT),
+    # which would measure token bucket sleeps instead of the analyzer
+    http = HttpClient()
+    if backend == 'async':
+        from async_scraper import AsyncMultiCurrencyAnalyzer
+        analyzer = AsyncMultiCurrencyAnalyzer(cache=cache, http=http, use_firebase=False)
+    else:
+        analyzer = MultiCurrencyAnalyzer(cache=cache, http=http, use_firebase=False)
+
+    # Point every page at the fixture server
+    for config in analyzer.symbols.values():
+        config['url'] = server.url_for(config['url'])
+    for name in ('dxy_url', 'yields_url', 'news_url'):
+        setattr(analyzer, name, server.url_for(getattr(analyzer, name)))
+    return analyzer
+
+
+def workloads(analyzer):
+    return {
+        'scrape_symbol_data': lambda i: analyzer.scrape_symbol_data(SYMBOLS[i % len(SYMBOLS)]),
+        'analyze_pair': lambda i: analyzer.analyze_pair(SYMBOLS[i % len(SYMBOLS)]),
+        'get_currency_strength': lambda i: analyzer.get_currency_strength(['USD', 'EUR'][i % 2]),
+        'enhance_signal_with_fundamentals': lambda i: analyzer.enhance_signal_with_fundamentals(
+            {**TECHNICAL_SIGNAL, 'symbol': SYMBOLS[i % len(SYMBOLS)]})
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def run_method(fn, iterations, concurrency):
+    timings = []
+    failures = 0
+
+    def call(i):
+        started = time.perf_counter()
+        result = fn(i)
+        return time.perf_counter() - started, result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, result in pool.map(call, range(iterations)):
+            timings.append(elapsed)
+            if result is None:
+                failures += 1
+    wall = time.perf_counter() - started
+
+    # Allocation profile on a short sequential pass so timings stay clean
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(min(iterations, 10)):
+        fn(i)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    allocated = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+
+    return {
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p90_ms': percentile(timings, 90) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'mean_ms': statistics.mean(timings) * 1000,
+        'ops_per_sec': iterations / wall,
+        'failures': failures,
+        'retained_kb_per_call': allocated / 1024 / min(iterations, 10),
+        'blocks_per_call': blocks / min(iterations, 10),
+        'peak_kb': peak / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the analyzer against recorded fixtures')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--pad-kb', type=int, default=0, help='inflate fixtures to live-page size')
+    parser.add_argument('--cache-ttl', type=float, default=0, help='0 measures the uncached scrape path')
+    parser.add_argument('--backend', choices=['sync', 'async'], default='sync')
+    parser.add_argument('--methods', nargs='*', help='subset of methods to run')
+    args = parser.parse_args()
+
+    server = FixtureServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, pad_kb=args.pad_kb).start()
+    analyzer = build_analyzer(server, args.cache_ttl, args.backend)
+
+    print(f"🧪 Fixture server {server.base_url} | latency {args.latency_ms}±{args.jitter_ms}ms | "
+          f"errors {args.error_rate:.0%} | cache ttl {args.cache_ttl}s | backend {args.backend}")
+    print(f"\n{'method':<34} {'p50':>8} {'p90':>8} {'p99':>8} {'ops/s':>8} {'fail':>5} "
+          f"{'KB/call':>8} {'blk/call':>9} {'peak KB':>8}")
+
+    # The analyzer logs every call (and every injected error); raise the
+    # log level so only the report is printed while timing
+    logging.getLogger().setLevel(logging.CRITICAL)
+    try:
+        for name, fn in workloads(analyzer).items():
+            if args.methods and name not in args.methods:
+                continue
+            result = run_method(fn, args.iterations, args.concurrency)
+            print(f"{name:<34} {result['p50_ms']:>8.2f} {result['p90_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                  f"{result['ops_per_sec']:>8.1f} {result['failures']:>5} {result['retained_kb_per_call']:>8.1f} "
+                  f"{result['blocks_per_call']:>9.0f} {result['peak_kb']:>8.0f}")
+    finally:
+        if args.backend == 'async':
+            analyzer.close()
+        server.stop()
+
+    print(f"\n📡 Upstream requests: {server.requests} ({server.errors} injected errors)")
+    print(f"💾 Cache: {analyzer.quote_cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
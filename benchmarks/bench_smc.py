@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+SMC Benchmark
+Times the NumPy SMC engine (smc.py) on synthetic candle histories and,
+when node is installed, the browser engine (smc.js) on the same candles.
+--parity checks that both engines find the same structures and signal,
+and that the incremental engine agrees with a full rescan.
+--incremental times per-candle updates against history length.
+
+Usage:
+    python benchmarks/bench_smc.py --sizes 1000 10000 100000 250000 --compare-js
+    python benchmarks/bench_smc.py --parity --sizes 1000 5000
+    python benchmarks/bench_smc.py --incremental --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from smc import IncrementalSMC, SMCAnalyzer
+
+# Runs smc.js under node: reads {candles, timeframe, symbol} from a file and
+# prints timing, signal and structures as JSON
+NODE_RUNNER = """
+const fs = require('fs');
+console.log = () => {};
+const SMCAnalyzer = require(process.argv[1]);
+const input = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+const analyzer = new SMCAnalyzer();
+const started = process.hrtime.bigint();
+const signal = analyzer.analyze(input.candles, input.timeframe, input.symbol);
+const elapsed = Number(process.hrtime.bigint() - started) / 1e6;
+process.stdout.write(JSON.stringify({elapsed_ms: elapsed, signal: signal, smcData: analyzer.smcData}));
+"""
+
+DETECTORS = [
+    'identify_swing_points', 'detect_market_structure', 'calculate_premium_discount',
+    'detect_order_blocks', 'detect_breakers', 'detect_fair_value_gaps', 'detect_optimal_trade_entry',
+    'detect_liquidity_zones', 'detect_liquidity_sweeps', 'detect_break_of_structure',
+    'detect_change_of_character', 'detect_smart_money_reversal', 'detect_inducement_zones',
+    'identify_kill_zones', 'check_fvg_fills'
+]
+
+
+def synthetic_candles(count, timeframe=300, start_price=2650.0, seed=42):
+    """Random-walk candles with clustered volatility, as (times ms, ohlc)"""
+    rng = np.random.default_rng(seed)
+    vol = np.exp(np.convolve(rng.normal(0, 0.3, count), np.ones(50) / 50, mode='same')) * 0.0015
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 1, count) * vol))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.5, count)) * vol)
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.5, count)) * vol)
+
+    start = 1704067200 - count * timeframe
+    times = (start + np.arange(count, dtype=np.int64) * timeframe) * 1000
+    return times, np.column_stack([open_, high, low, close])
+
+
+def to_chart_data(times, ohlc):
+    return [{'x': int(x), 'o': o, 'h': h, 'l': l, 'c': c} for x, (o, h, l, c) in zip(times.tolist(), ohlc.tolist())]
+
+
+def time_python(times, ohlc, timeframe, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        signal = SMCAnalyzer().analyze_arrays(times, ohlc, timeframe)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, signal
+
+
+def time_detectors(times, ohlc, timeframe):
+    """Per-detector cost of one fresh analysis"""
+    analyzer = SMCAnalyzer()
+    costs = {}
+    originals = {name: getattr(analyzer, name) for name in DETECTORS}
+
+    def timed(name):
+        def run():
+            started = time.perf_counter()
+            originals[name]()
+            costs[name] = (time.perf_counter() - started) * 1000
+        return run
+
+    for name in DETECTORS:
+        setattr(analyzer, name, timed(name))
+    analyzer.analyze_arrays(times, ohlc, timeframe)
+    return costs
+
+
+def run_js(times, ohlc, timeframe):
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump({'candles': to_chart_data(times, ohlc), 'timeframe': timeframe, 'symbol': 'XAUUSD'}, f)
+        path = f.name
+    try:
+        output = subprocess.run(['node', '-e', NODE_RUNNER, os.path.join(ROOT, 'smc.js'), path],
+                                capture_output=True, text=True, check=True).stdout
+        return json.loads(output)
+    finally:
+        os.unlink(path)
+
+
+def compare(python, js):
+    """List of mismatches between smc.py and smc.js results"""
+    py_data, js_data = python['smc_data'], js['smcData']
+    mismatches = []
+
+    def check(name, left, right):
+        if left != right:
+            mismatches.append(f'{name}: python={str(left)[:120]} js={str(right)[:120]}')
+
+    def indices(items, fields=('type', 'index')):
+        return [tuple(item[f] for f in fields) for item in items]
+
+    check('swing points', indices(py_data['swing_points'], ('type', 'index', 'price')),
+          indices(js_data['swingPoints'], ('type', 'index', 'price')))
+    check('trend', (py_data['market_structure'], py_data['trend']), (js_data['marketStructure'], js_data['trend']))
+    check('order blocks', indices(py_data['order_blocks'], ('type', 'index', 'top', 'bottom', 'strength', 'touches')),
+          indices(js_data['orderBlocks'], ('type', 'index', 'top', 'bottom', 'strength', 'touches')))
+    check('fvgs', indices(py_data['fvgs'], ('type', 'index', 'top', 'bottom', 'quality', 'filled')),
+          indices(js_data['fvgs'], ('type', 'index', 'top', 'bottom', 'quality', 'filled')))
+    check('liquidity zones', indices(py_data['liquidity_zones'], ('type', 'price', 'swept')),
+          indices(js_data['liquidityZones'], ('type', 'price', 'swept')))
+    check('bos', indices(py_data['bos']), indices(js_data['bos']))
+    check('choch', indices(py_data['choch']), indices(js_data['choch']))
+    check('smart money reversal', indices(py_data['smart_money_reversal']), indices(js_data['smartMoneyReversal']))
+    check('inducement', indices(py_data['inducement_zones']), indices(js_data['inducementZones']))
+
+    fields = ('bias', 'entry', 'tp1', 'tp2', 'tp3', 'sl', 'rr', 'confidence', 'zone', 'reasons', 'volatility')
+    py_signal, js_signal = python['signal'], js['signal']
+    check('signal', py_signal and {f: py_signal[f] for f in fields}, js_signal and {f: js_signal[f] for f in fields})
+    return mismatches
+
+
+def compare_incremental(times, ohlc, timeframe):
+    """Mismatches between an incremental replay and a full rescan of the same history"""
+    batch = SMCAnalyzer()
+    batch.analyze_arrays(times, ohlc, timeframe)
+    incremental = IncrementalSMC(timeframe)
+    incremental.load(times, ohlc, warmup=len(times))
+    b, i = batch.smc_data, incremental.smc_data
+    mismatches = []
+
+    def rows(items, fields=('type', 'index')):
+        return [tuple(item[f] for f in fields) for item in items]
+
+    for name, fields in (('swing_points', ('type', 'index', 'price')), ('bos', ('type', 'index')),
+                         ('choch', ('type', 'index')), ('liquidity_zones', ('type', 'price')),
+                         ('inducement_zones', ('type', 'index')), ('smart_money_reversal', ('type', 'index'))):
+        if rows(b[name], fields) != rows(i[name], fields):
+            mismatches.append(name)
+    for name in ('market_structure', 'trend', 'premium_discount'):
+        if b[name] != i[name]:
+            mismatches.append(name)
+
+    # Touches and fills are counted per candle, so only compare what was detected
+    fields = ('type', 'index', 'top', 'bottom', 'quality')
+    if not set(rows(i['fvgs'], fields)) <= set(rows(b['fvgs'], fields)):
+        mismatches.append('fvgs')
+    fields = ('type', 'index', 'top', 'bottom', 'strength')
+    oldest = min((ob['index'] for ob in b['order_blocks']), default=0)
+    if not {ob for ob in rows(i['order_blocks'], fields) if ob[1] >= oldest} <= set(rows(b['order_blocks'], fields)):
+        mismatches.append('order_blocks')
+    return mismatches
+
+
+def time_incremental(times, ohlc, timeframe, history, updates):
+    """Per-candle update cost after replaying history candles"""
+    analyzer = IncrementalSMC(timeframe)
+    started = time.perf_counter()
+    analyzer.load(times[:history], ohlc[:history], warmup=history)
+    load_us = (time.perf_counter() - started) / history * 1e6
+
+    timings = []
+    for t, (o, h, l, c) in zip(times[history:history + updates].tolist(), ohlc[history:history + updates].tolist()):
+        started = time.perf_counter()
+        analyzer.update(t, o, h, l, c)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return load_us, timings[len(timings) // 2] * 1e6, timings[int(len(timings) * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the NumPy SMC engine')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[1000, 10000, 100000, 250000])
+    parser.add_argument('--timeframe', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seeds', type=int, default=5, help='candle sets per size for --parity')
+    parser.add_argument('--compare-js', action='store_true', help='also time smc.js under node')
+    parser.add_argument('--parity', action='store_true', help='check results match smc.js')
+    parser.add_argument('--detectors', action='store_true', help='per-detector breakdown')
+    parser.add_argument('--incremental', action='store_true', help='per-candle update cost vs history length')
+    parser.add_argument('--updates', type=int, default=2000, help='candles appended per --incremental run')
+    args = parser.parse_args()
+
+    node = shutil.which('node')
+    if args.compare_js and not node:
+        print("⚠️ node not found - skipping smc.js comparison")
+        args.compare_js = False
+
+    if args.incremental:
+        print(f"\n{'history':>8} {'rescan ms':>10} {'update p50 us':>14} {'update p99 us':>14} {'replay us/candle':>17}")
+        for size in args.sizes:
+            times, ohlc = synthetic_candles(size + args.updates, args.timeframe)
+            rescan_ms, _ = time_python(times[:size], ohlc[:size], args.timeframe, args.repeat)
+            load_us, p50, p99 = time_incremental(times, ohlc, args.timeframe, size, args.updates)
+            print(f"{size:>8} {rescan_ms:>10.2f} {p50:>14.1f} {p99:>14.1f} {load_us:>17.1f}")
+        return
+
+    if args.parity:
+        failures = 0
+        for size in args.sizes:
+            for seed in range(args.seeds):
+                times, ohlc = synthetic_candles(size, args.timeframe, seed=seed)
+                mismatches = [f'incremental {name}' for name in compare_incremental(times, ohlc, args.timeframe)]
+                if node:
+                    analyzer = SMCAnalyzer()
+                    signal = analyzer.analyze_arrays(times, ohlc, args.timeframe)
+                    mismatches += compare({'signal': signal, 'smc_data': analyzer.smc_data},
+                                          run_js(times, ohlc, args.timeframe))
+                status = '✅' if not mismatches else '❌'
+                print(f"{status} {size:>7} candles seed {seed}: {len(mismatches)} mismatches")
+                for mismatch in mismatches:
+                    print(f"      {mismatch}")
+                failures += bool(mismatches)
+        sys.exit(1 if failures else 0)
+
+    print(f"\n{'candles':>8} {'smc.py ms':>10} {'smc.js ms':>10} {'speedup':>8} {'cand/ms':>9} {'signal':>8}")
+    for size in args.sizes:
+        times, ohlc = synthetic_candles(size, args.timeframe)
+        py_ms, signal = time_python(times, ohlc, args.timeframe, args.repeat)
+        js_ms = run_js(times, ohlc, args.timeframe)['elapsed_ms'] if args.compare_js else None
+        print(f"{size:>8} {py_ms:>10.2f} {js_ms if js_ms is not None else float('nan'):>10.2f} "
+              f"{(js_ms / py_ms) if js_ms else float('nan'):>7.1f}x {size / py_ms:>9.0f} "
+              f"{signal['bias'] if signal else '-':>8}")
+
+        if args.detectors:
+            for name, cost in sorted(time_detectors(times, ohlc, args.timeframe).items(), key=lambda kv: -kv[1]):
+                print(f"{'':>10}{name:<32} {cost:>8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
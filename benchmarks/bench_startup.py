@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Starts web.py in a fresh interpreter for each ANALYZER_INIT mode and
+reports how long until the module is imported, /health answers, a static
+page is served and the analyzer services are ready.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child: times are from interpreter start (before importing web)
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import web
+imported = time.perf_counter()
+client = web.app.test_client()
+assert client.get('/health').status_code == 200
+health = time.perf_counter()
+assert client.get('/signals').status_code == 200
+static = time.perf_counter()
+web.ensure_analyzer(timeout=60)
+ready = time.perf_counter()
+with open(sys.argv[2], 'w') as f:
+    json.dump({
+        'import_ms': (imported - started) * 1000,
+        'health_ms': (health - started) * 1000,
+        'static_ms': (static - started) * 1000,
+        'ready_ms': (ready - started) * 1000,
+        'timings': web.startup_timings
+    }, f)
+"""
+
+
+def run(mode, env):
+    with tempfile.NamedTemporaryFile(suffix='.json') as result:
+        subprocess.run([sys.executable, '-c', CHILD, ROOT, result.name], env={**env, 'ANALYZER_INIT': mode},
+                       cwd=ROOT, capture_output=True, timeout=120, check=True)
+        with open(result.name) as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark web.py cold start per ANALYZER_INIT mode')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--modes', nargs='*', default=['eager', 'background', 'lazy'])
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        'SIGNAL_DB': os.path.join(tempfile.mkdtemp(), 'signals.db'),
+        # No network during the measurement
+        'BACKGROUND_REFRESH': '0',
+        'FIREBASE_WRITE_BEHIND': '0'
+    }
+
+    print(f"🚀 Cold start, median of {args.runs} runs (ms since interpreter start)\n")
+    print(f"  {'mode':<11} {'import':>8} {'/health':>8} {'static':>8} {'ready':>8}")
+    for mode in args.modes:
+        results = [run(mode, env) for _ in range(args.runs)]
+        median = {key: statistics.median(r[key] for r in results) for key in ('import_ms', 'health_ms', 'static_ms', 'ready_ms')}
+        print(f"  {mode:<11} {median['import_ms']:>8.0f} {median['health_ms']:>8.0f} "
+              f"{median['static_ms']:>8.0f} {median['ready_ms']:>8.0f}")
+        print(f"  {'':<11} {results[-1]['timings']}")
+
+
+if __name__ == '__main__':
+    main()
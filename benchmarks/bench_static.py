@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Static Asset Benchmark
+Serves the terminal's pages and scripts through Flask's test client the
+old way (send_from_directory per request) and through StaticAssets,
+for a first visit (full bodies) and a repeat visit (If-None-Match),
+reporting time per request and bytes on the wire.
+
+Usage:
+    python benchmarks/bench_static.py --requests 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, Response, request, send_from_directory
+
+from static_assets import StaticAssets
+
+FILES = ('index.html', 'signals.html', 'smc.js', 'data.js')
+
+
+def make_app():
+    app = Flask(__name__, root_path=ROOT)
+    assets = StaticAssets(ROOT)
+
+    @app.route('/disk/<path:filename>')
+    def disk(filename):
+        return send_from_directory('.', filename)
+
+    @app.route('/assets/<path:filename>')
+    def preloaded(filename):
+        status, body, headers = assets.respond(filename, request.headers)
+        return Response(body, status=status, headers=headers)
+
+    return app, assets
+
+
+def visit(client, prefix, names, requests, etags=None):
+    """Fetch names round-robin; returns (us per request, bytes received, statuses)"""
+    received, statuses = 0, {}
+    started = time.perf_counter()
+    for i in range(requests):
+        name = names[i % len(names)]
+        headers = {'Accept-Encoding': 'br, gzip'}
+        if etags:
+            headers['If-None-Match'] = etags[name]
+        response = client.get(f'{prefix}/{name}', headers=headers)
+        received += len(response.data)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        response.close()
+    return (time.perf_counter() - started) / requests * 1e6, received / requests, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark static asset serving')
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    app, assets = make_app()
+    client = app.test_client()
+    names = list(FILES)
+    hashed = [assets.assets[name].hashed_name for name in FILES]
+
+    etags = {}
+    for prefix, keys in (('/disk', names), ('/assets', names), ('/assets', hashed)):
+        for name in keys:
+            response = client.get(f'{prefix}/{name}', headers={'Accept-Encoding': 'br, gzip'})
+            etags.setdefault(prefix, {})[name] = response.headers.get('ETag')
+            response.close()
+
+    print(f"🚀 {args.requests} requests over {', '.join(FILES)}\n")
+    print(f"  {'route':<28}{'us/request':>12}{'bytes':>10}  statuses")
+    rows = (
+        ('disk, first visit', '/disk', names, None),
+        ('disk, revalidate', '/disk', names, etags['/disk']),
+        ('preloaded, first visit', '/assets', names, None),
+        ('preloaded, revalidate', '/assets', names, etags['/assets']),
+        ('preloaded, hashed URL', '/assets', hashed, None),
+    )
+    for label, prefix, keys, tags in rows:
+        per_request, size, statuses = visit(client, prefix, keys, args.requests, tags)
+        print(f"  {label:<28}{per_request:>12.1f}{size:>10.0f}  {statuses}")
+
+
+if __name__ == '__main__':
+    main()
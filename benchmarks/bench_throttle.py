@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Upstream Outage Benchmark
+Runs analyze_pair in a loop against the fixture server, makes every page
+hang past the client timeout for --outage-s, then heals it, with the
+per-host circuit breaker off and on. Reports call latency during the
+outage, how many requests still reached the failing host, how many
+results were served stale, and how long after healing fresh data returned.
+
+Usage:
+    python benchmarks/bench_throttle.py --outage-s 8 --timeout 1 --reset 3
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_server import FixtureServer
+from http_client import HttpClient
+from quote_cache import QuoteCache
+from scraper import MultiCurrencyAnalyzer
+
+
+def build_analyzer(server, http):
+    analyzer = MultiCurrencyAnalyzer(cache=QuoteCache(ttl=0.5), http=http, use_firebase=False)
+    for config in analyzer.symbols.values():
+        config['url'] = server.url_for(config['url'])
+    analyzer.dxy_url = server.url_for(analyzer.dxy_url)
+    return analyzer
+
+
+def run(server, breaker, args):
+    http = HttpClient(retries=0, timeout=args.timeout, rate=args.rate, burst=args.rate * 2,
+                      failure_threshold=5 if breaker else None, reset_timeout=args.reset)
+    analyzer = build_analyzer(server, http)
+    analyzer.analyze_pair('XAUUSD')
+
+    server.hang_rate = 1.0
+    time.sleep(analyzer.quote_cache.ttl)  # let the warm-up quotes expire
+    requests_before = server.requests
+    latencies, stale, missing = [], 0, 0
+    ends = time.monotonic() + args.outage_s
+    while time.monotonic() < ends:
+        started = time.perf_counter()
+        result = analyzer.analyze_pair('XAUUSD')
+        latencies.append((time.perf_counter() - started) * 1000)
+        if not result:
+            missing += 1
+        elif result.get('stale'):
+            stale += 1
+    sent = server.requests - requests_before
+
+    server.hang_rate = 0.0
+    healed = time.monotonic()
+    recovered = None
+    while time.monotonic() - healed < args.reset * 4 + 5:
+        result = analyzer.analyze_pair('XAUUSD')
+        if result and not result.get('stale'):
+            recovered = time.monotonic() - healed
+            break
+        time.sleep(0.05)
+
+    guard = http.stats()['hosts'].get('127.0.0.1', {})
+    return {
+        'calls': len(latencies),
+        'p50_ms': statistics.median(latencies),
+        'max_ms': max(latencies),
+        'sent': sent,
+        'stale': stale,
+        'missing': missing,
+        'recovered_s': recovered,
+        'transitions': guard.get('circuit', {}).get('transitions')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the circuit breaker through an upstream outage')
+    parser.add_argument('--outage-s', type=float, default=8)
+    parser.add_argument('--timeout', type=float, default=1)
+    parser.add_argument('--reset', type=float, default=3)
+    parser.add_argument('--rate', type=float, default=50)
+    args = parser.parse_args()
+
+    # The outage is expected; keep its errors off the report
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    server = FixtureServer().start()
+    print(f"🚀 {args.outage_s}s outage (every page hangs past the {args.timeout}s timeout), "
+          f"breaker reset {args.reset}s\n")
+    print(f"  {'breaker':<9}{'calls':>7}{'p50 ms':>9}{'max ms':>9}{'sent':>7}{'stale':>7}{'none':>6}"
+          f"{'fresh after':>13}  transitions")
+    for breaker in (False, True):
+        result = run(server, breaker, args)
+        recovered = f"{result['recovered_s']:.1f}s" if result['recovered_s'] is not None else 'never'
+        print(f"  {'on' if breaker else 'off':<9}{result['calls']:>7}{result['p50_ms']:>9.0f}{result['max_ms']:>9.0f}"
+              f"{result['sent']:>7}{result['stale']:>7}{result['missing']:>6}{recovered:>13}  "
+              f"{result['transitions'] or '-'}")
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
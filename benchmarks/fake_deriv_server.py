@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Fake Deriv Server
+Local stand-in for wss://ws.derivws.com that speaks just enough of the
+Deriv API (ticks_history with candles + subscribe, ticks, forget_all, ping)
+to drive candles.CandleStore or the browser chart without the network.
+
+Prices are a random walk per symbol shared by every connection, so all
+clients see the same market.
+
+Usage:
+    python benchmarks/fake_deriv_server.py --port 8766 --tick-ms 500
+    DERIV_WS_URL=ws://127.0.0.1:8766 python web.py
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import socketserver
+import struct
+import threading
+import time
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+BASE_PRICES = {
+    'XAUUSD': 2650, 'XAGUSD': 30, 'EURUSD': 1.10, 'GBPUSD': 1.27,
+    'USDJPY': 150, 'AUDUSD': 0.66, 'USDCAD': 1.36, 'USDCHF': 0.88,
+    'NZDUSD': 0.61, 'EURJPY': 163, 'GBPJPY': 190, 'EURGBP': 0.86
+}
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class Market:
+    """Shared random-walk prices, one per symbol"""
+
+    def __init__(self, volatility=0.0004, seed=None):
+        self.volatility = volatility
+        self.random = random.Random(seed)
+        self.prices = {}
+        self._lock = threading.Lock()
+
+    def price(self, symbol):
+        with self._lock:
+            if symbol not in self.prices:
+                self.prices[symbol] = float(BASE_PRICES.get(symbol, 1.0))
+            return self.prices[symbol]
+
+    def step(self, symbol):
+        with self._lock:
+            price = self.prices.get(symbol, float(BASE_PRICES.get(symbol, 1.0)))
+            price *= 1 + self.random.gauss(0, self.volatility)
+            self.prices[symbol] = price
+            return price
+
+    def history(self, symbol, granularity, count, end):
+        """Synthetic candles ending at the current price"""
+        rng = random.Random(f'{symbol}:{granularity}')
+        close = self.price(symbol)
+        last_open = end - end % granularity
+        candles = []
+        for i in range(count):
+            open_ = close * (1 + rng.gauss(0, self.volatility * 4))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, self.volatility)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, self.volatility)))
+            candles.append({'epoch': last_open - i * granularity, 'open': open_,
+                            'high': high, 'low': low, 'close': close})
+            close = open_
+        candles.reverse()
+        return candles
+
+
+class Connection:
+    def __init__(self, server, sock):
+        self.server = server
+        self.sock = sock
+        self.closed = False
+        self._send_lock = threading.Lock()
+
+        # subscription id -> (kind, symbol, granularity, candle)
+        self.subscriptions = {}
+        self._lock = threading.Lock()
+        self.sent = 0
+
+    # ------------------------------------------------------------------
+    # RFC 6455 framing
+    # ------------------------------------------------------------------
+
+    def handshake(self):
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                return False
+            request += chunk
+
+        headers = {}
+        for line in request.decode('latin-1').split('\r\n')[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        key = headers.get('sec-websocket-key')
+        if not key:
+            self.sock.sendall(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n')
+            return False
+
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.sock.sendall((
+            'HTTP/1.1 101 Switching Protocols\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Accept: {accept}\r\n\r\n'
+        ).encode())
+        return True
+
+    def _recv_exact(self, size):
+        data = b''
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('client went away')
+            data += chunk
+        return data
+
+    def read_frame(self):
+        """(opcode, payload) of the next frame from the client"""
+        first, second = self._recv_exact(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', self._recv_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self._recv_exact(8))[0]
+
+        mask = self._recv_exact(4) if second & 0x80 else None
+        payload = self._recv_exact(length)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return opcode, payload
+
+    def send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([length])
+        elif length < 65536:
+            header += bytes([126]) + struct.pack('!H', length)
+        else:
+            header += bytes([127]) + struct.pack('!Q', length)
+
+        with self._send_lock:
+            if self.closed:
+                return
+            try:
+                self.sock.sendall(header + payload)
+            except OSError:
+                self.closed = True
+
+    def send_json(self, message):
+        self.send_frame(0x1, json.dumps(message).encode())
+        self.sent += 1
+        if self.server.drop_after and self.sent >= self.server.drop_after:
+            # Simulate an upstream that cuts the connection mid-stream
+            self.close()
+
+    def close(self):
+        with self._send_lock:
+            if self.closed:
+                return
+            self.closed = True
+        try:
+            self.sock.shutdown(2)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Deriv API
+    # ------------------------------------------------------------------
+
+    def handle(self, request):
+        self.server.requests += 1
+
+        if 'ping' in request:
+            self.send_json({'msg_type': 'ping', 'ping': 'pong', 'echo_req': request})
+
+        elif 'forget_all' in request:
+            kinds = request['forget_all']
+            kinds = kinds if isinstance(kinds, list) else [kinds]
+            with self._lock:
+                forgotten = [sid for sid, sub in self.subscriptions.items() if sub[0] in kinds]
+                for sid in forgotten:
+                    del self.subscriptions[sid]
+            self.send_json({'msg_type': 'forget_all', 'forget_all': forgotten, 'echo_req': request})
+
+        elif 'ticks_history' in request:
+            symbol = request['ticks_history'].replace('frx', '', 1)
+            if symbol not in BASE_PRICES:
+                self.send_json({'msg_type': 'candles', 'echo_req': request,
+                                'error': {'code': 'InvalidSymbol', 'message': 'Symbol not found'}})
+                return
+
+            granularity = int(request.get('granularity', 60))
+            count = min(int(request.get('count', 1000)), 5000)
+            candles = self.server.market.history(symbol, granularity, count, int(time.time()))
+            message = {'msg_type': 'candles', 'candles': candles, 'echo_req': request}
+
+            if request.get('subscribe'):
+                sid = f'{random.getrandbits(64):016x}'
+                with self._lock:
+                    self.subscriptions[sid] = ['candles', symbol, granularity, dict(candles[-1])]
+                message['subscription'] = {'id': sid}
+            self.send_json(message)
+
+        elif 'ticks' in request:
+            symbol = request['ticks'].replace('frx', '', 1)
+            sid = f'{random.getrandbits(64):016x}'
+            with self._lock:
+                self.subscriptions[sid] = ['ticks', symbol, None, None]
+            self.send_json({'msg_type': 'tick', 'echo_req': request, 'subscription': {'id': sid},
+                            'tick': {'symbol': f'frx{symbol}', 'epoch': int(time.time()),
+                                     'quote': self.server.market.price(symbol), 'id': sid}})
+
+        else:
+            self.send_json({'msg_type': 'error', 'echo_req': request,
+                            'error': {'code': 'UnrecognisedRequest', 'message': 'Unrecognised request'}})
+
+    def tick(self):
+        """Push one update for every live subscription"""
+        now = int(time.time())
+        with self._lock:
+            subscriptions = list(self.subscriptions.items())
+
+        for sid, subscription in subscriptions:
+            kind, symbol, granularity, candle = subscription
+            price = self.server.market.step(symbol)
+
+            if kind == 'ticks':
+                self.send_json({'msg_type': 'tick', 'subscription': {'id': sid},
+                                'tick': {'symbol': f'frx{symbol}', 'epoch': now, 'quote': price, 'id': sid}})
+                continue
+
+            open_time = now - now % granularity
+            if open_time > candle['epoch']:
+                candle = {'epoch': open_time, 'open': price, 'high': price, 'low': price, 'close': price}
+            else:
+                candle = {**candle, 'high': max(candle['high'], price),
+                          'low': min(candle['low'], price), 'close': price}
+            subscription[3] = candle
+
+            # Deriv sends OHLC values as strings
+            self.send_json({'msg_type': 'ohlc', 'subscription': {'id': sid}, 'ohlc': {
+                'symbol': f'frx{symbol}', 'granularity': granularity, 'epoch': now,
+                'open_time': candle['epoch'], 'open': f"{candle['open']:.5f}",
+                'high': f"{candle['high']:.5f}", 'low': f"{candle['low']:.5f}",
+                'close': f"{candle['close']:.5f}", 'id': sid
+            }})
+
+
+class FakeDerivServer:
+    def __init__(self, host='127.0.0.1', port=0, tick_ms=500, volatility=0.0004,
+                 drop_after=0, seed=None):
+        self.tick_ms = tick_ms
+        self.drop_after = drop_after
+        self.market = Market(volatility, seed)
+
+        self.connections = set()
+        self.connects = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self.tcp = _Server((host, port), self._handler())
+        self._threads = []
+
+    @property
+    def url(self):
+        host, port = self.tcp.server_address[:2]
+        return f'ws://{host}:{port}'
+
+    def start(self):
+        for target in (self.tcp.serve_forever, self._tick_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            for connection in list(self.connections):
+                connection.close()
+        self.tcp.shutdown()
+        self.tcp.server_close()
+
+    def drop_all(self):
+        """Close every client connection (reconnect testing)"""
+        with self._lock:
+            for connection in list(self.connections):
+                connection.close()
+
+    def _tick_loop(self):
+        while not self._stop.wait(self.tick_ms / 1000):
+            with self._lock:
+                connections = list(self.connections)
+            for connection in connections:
+                connection.tick()
+
+    def _handler(self):
+        server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                connection = Connection(server, self.request)
+                if not connection.handshake():
+                    return
+
+                with server._lock:
+                    server.connections.add(connection)
+                    server.connects += 1
+                try:
+                    while not connection.closed:
+                        opcode, payload = connection.read_frame()
+                        if opcode == 0x8:
+                            connection.send_frame(0x8, payload[:2])
+                            break
+                        if opcode == 0x9:
+                            connection.send_frame(0xA, payload)
+                        elif opcode == 0x1:
+                            try:
+                                connection.handle(json.loads(payload))
+                            except ValueError:
+                                connection.send_json({'msg_type': 'error', 'error': {
+                                    'code': 'InputValidationFailed', 'message': 'Invalid JSON'}})
+                except (ConnectionError, OSError):
+                    pass
+                finally:
+                    with server._lock:
+                        server.connections.discard(connection)
+                    connection.close()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a fake Deriv WebSocket API locally')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--tick-ms', type=float, default=500)
+    parser.add_argument('--volatility', type=float, default=0.0004)
+    parser.add_argument('--drop-after', type=int, default=0, help='close each connection after N messages')
+    args = parser.parse_args()
+
+    server = FakeDerivServer(port=args.port, tick_ms=args.tick_ms, volatility=args.volatility,
+                             drop_after=args.drop_after)
+    print(f"🧪 Fake Deriv server on {server.url} | tick {args.tick_ms}ms")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Fake Realtime Database
+Local stand-in for the Firebase Realtime Database REST API: an in-memory
+JSON tree served at /<path>.json with GET, PUT, POST (push), PATCH
+(including multi-path updates, rejecting overlapping paths like Firebase)
+and DELETE, plus latency and error injection.
+
+Usage:
+    python benchmarks/fake_rtdb.py --port 8767 --latency-ms 80 --error-rate 0.1
+    FIREBASE_DATABASE_URL=http://127.0.0.1:8767 python web.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+from fixture_server import _Server
+
+
+def split_path(path):
+    return [part for part in path.strip('/').split('/') if part]
+
+
+class FakeRealtimeDatabase:
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, error_rate=0.0, fail_next=0):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.fail_next = fail_next  # fail exactly the next N writes with 503
+
+        self.data = {}
+        self.requests = 0
+        self.writes = 0
+        self.errors = 0
+        self.methods = {}
+        self._lock = threading.Lock()
+
+        self.httpd = _Server((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # ------------------------------------------------------------------
+    # JSON tree
+    # ------------------------------------------------------------------
+
+    def get(self, path):
+        node = self.data
+        for part in split_path(path):
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+
+    def set(self, path, value):
+        parts = split_path(path)
+        if not parts:
+            self.data = value if isinstance(value, dict) else {}
+            return
+
+        node = self.data
+        for part in parts[:-1]:
+            if not isinstance(node.get(part), dict):
+                node[part] = {}
+            node = node[part]
+
+        if value is None:
+            node.pop(parts[-1], None)
+            self._prune(parts[:-1])
+        else:
+            node[parts[-1]] = value
+
+    def _prune(self, parts):
+        """Firebase has no empty objects: drop parents left empty by a delete"""
+        while parts:
+            parent = self.get('/'.join(parts[:-1]))
+            if isinstance(parent, dict) and parent.get(parts[-1]) == {}:
+                del parent[parts[-1]]
+            parts = parts[:-1]
+
+    def update(self, path, values):
+        """Multi-path update: every key is a path relative to path"""
+        keys = ['/'.join(split_path(key)) for key in values]
+        for i, key in enumerate(keys):
+            for other in keys[i + 1:]:
+                if key == other or other.startswith(key + '/') or key.startswith(other + '/'):
+                    raise ValueError(f'Path {key} overlaps {other} in a multi-path update')
+        for key, value in zip(keys, values.values()):
+            self.set(f'{path}/{key}', value)
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self, status, body):
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def _handle(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                path = urlparse(self.path).path
+                if not path.endswith('.json'):
+                    self._respond(400, {'error': 'Paths must end in .json'})
+                    return
+                path = path[:-len('.json')]
+
+                with server._lock:
+                    server.requests += 1
+                    server.methods[method] = server.methods.get(method, 0) + 1
+                    inject = method != 'GET' and (server.fail_next > 0 or random.random() < server.error_rate)
+                    if inject:
+                        server.fail_next = max(0, server.fail_next - 1)
+                        server.errors += 1
+
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                if inject:
+                    self._respond(503, {'error': 'Injected error'})
+                    return
+
+                try:
+                    value = json.loads(body) if body else None
+                except ValueError:
+                    self._respond(400, {'error': 'Invalid data; couldn\'t parse JSON object'})
+                    return
+
+                with server._lock:
+                    try:
+                        if method == 'GET':
+                            result = server.get(path)
+                        elif method == 'PUT':
+                            server.set(path, value)
+                            result = value
+                        elif method == 'POST':
+                            name = f'-{random.getrandbits(96):024x}'[:20]
+                            server.set(f'{path}/{name}', value)
+                            result = {'name': name}
+                        elif method == 'PATCH':
+                            if not isinstance(value, dict):
+                                raise ValueError('PATCH body must be an object')
+                            server.update(path, value)
+                            result = value
+                        else:
+                            server.set(path, None)
+                            result = None
+                    except ValueError as e:
+                        self._respond(400, {'error': str(e)})
+                        return
+                    if method != 'GET':
+                        server.writes += 1
+
+                self._respond(200, result)
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_PUT(self):
+                self._handle('PUT')
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_PATCH(self):
+                self._handle('PATCH')
+
+            def do_DELETE(self):
+                self._handle('DELETE')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a fake Firebase Realtime Database locally')
+    parser.add_argument('--port', type=int, default=8767)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeRealtimeDatabase(port=args.port, latency_ms=args.latency_ms, error_rate=args.error_rate)
+    print(f"🧪 Fake Realtime Database on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
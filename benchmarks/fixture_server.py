@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Fixture Server
+Local stand-in for investing.com / cnbc.com that serves the recorded pages
+in benchmarks/fixtures with configurable latency and error injection.
+
+Pages are served at /<host>/<path>, e.g.
+    https://www.investing.com/commodities/gold
+    -> http://127.0.0.1:8765/www.investing.com/commodities/gold
+
+Usage:
+    python benchmarks/fixture_server.py --port 8765 --latency-ms 150 --error-rate 0.05
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class _Server(ThreadingHTTPServer):
+    # The default backlog of 5 drops SYNs under concurrent fan-out
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FixtureServer:
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, hang_rate=0.0, pad_kb=0, fixtures_dir=FIXTURES_DIR):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.pad_kb = pad_kb
+        self.fixtures_dir = fixtures_dir
+
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._pages = {}
+
+        self.httpd = _Server((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url_for(self, url):
+        """Rewrite a live URL to its fixture URL on this server"""
+        parsed = urlparse(url)
+        return f'{self.base_url}/{parsed.hostname}{parsed.path}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def page(self, path):
+        """Fixture bytes for a request path (cached), or None"""
+        if path in self._pages:
+            return self._pages[path]
+
+        file_path = os.path.normpath(os.path.join(self.fixtures_dir, path.lstrip('/') + '.html'))
+        if not file_path.startswith(self.fixtures_dir) or not os.path.isfile(file_path):
+            return None
+
+        with open(file_path, 'rb') as f:
+            content = f.read()
+
+        # Pad with inert markup to simulate full-size live pages
+        if self.pad_kb:
+            filler = b'<div class="row"><a href="/news">Headline</a><span>1.2345</span></div>\n'
+            content = content.replace(b'</body>', filler * (self.pad_kb * 1024 // len(filler)) + b'</body>')
+
+        self._pages[path] = content
+        return content
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+
+                delay = server.latency_ms + random.uniform(-server.jitter_ms, server.jitter_ms)
+                if delay > 0:
+                    time.sleep(delay / 1000)
+
+                roll = random.random()
+                if roll < server.hang_rate:
+                    # Simulate an upstream that never answers within the client timeout
+                    time.sleep(60)
+                    return
+                if roll < server.hang_rate + server.error_rate:
+                    with server._lock:
+                        server.errors += 1
+                    self.send_error(503, 'Injected error')
+                    return
+
+                content = server.page(urlparse(self.path).path)
+                if content is None:
+                    self.send_error(404, 'No fixture')
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded quote pages locally')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--hang-rate', type=float, default=0.0)
+    parser.add_argument('--pad-kb', type=int, default=0)
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, hang_rate=args.hang_rate, pad_kb=args.pad_kb)
+    print(f"🧪 Fixture server on {server.base_url} (fixtures: {server.fixtures_dir})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
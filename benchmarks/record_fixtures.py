@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Record Fixtures
+Download the live pages the analyzers scrape into benchmarks/fixtures so the
+fixture server and benchmarks can replay them offline.
+
+Usage:
+    python benchmarks/record_fixtures.py
+"""
+
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import FIXTURES_DIR
+from scraper import MultiCurrencyAnalyzer, http_client
+
+# CNBC pages behind the Gold quote/NEWS and US10Y data nodes
+CNBC_URLS = [
+    'https://www.cnbc.com/quotes/GC.1',
+    'https://www.cnbc.com/quotes/US10Y'
+]
+
+
+def live_urls():
+    analyzer = MultiCurrencyAnalyzer(use_firebase=False)
+    urls = [config['url'] for config in analyzer.symbols.values()]
+    urls.append(analyzer.dxy_url)
+    return urls + CNBC_URLS
+
+
+def main():
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+    for url in live_urls():
+        parsed = urlparse(url)
+        path = os.path.join(FIXTURES_DIR, parsed.hostname, parsed.path.lstrip('/') + '.html')
+        try:
+            response = http_client.get(url, headers=headers)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"❌ {url}: {e}")
+            continue
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        print(f"✅ {url} -> {os.path.relpath(path)} ({len(response.content) / 1024:.0f} KB)")
+        time.sleep(1)  # Rate limiting
+
+
+if __name__ == '__main__':
+    main()
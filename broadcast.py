@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Snapshot Broadcaster
+Fans one computation of analysis snapshots out to many stream subscribers.
+Only changed fields are sent, and each subscriber has its own bounded,
+coalescing buffer so a slow client never blocks the publisher.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+# Fields that change on every computation and shouldn't count as a change
+VOLATILE_FIELDS = {'timestamp'}
+
+# Event types a subscriber gets when it doesn't ask for specific topics
+DEFAULT_TOPICS = ('analysis', 'strength')
+
+
+class Subscriber:
+    def __init__(self, max_pending=64, topics=None):
+        self.max_pending = max_pending
+        self.created = time.time()
+
+        # Event types ('analysis') or single keys ('candle:XAUUSD:300')
+        self.topics = set(topics or DEFAULT_TOPICS)
+
+        # (type, key) -> event; a newer event for the same key replaces the
+        # undelivered one, so a slow client only ever gets the latest state
+        self._pending = OrderedDict()
+        self._cond = threading.Condition()
+        self.closed = False
+
+        # Keys whose event was dropped; the next event for them is sent in full
+        self.resync = set()
+
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def wants(self, event_type, key):
+        return event_type in self.topics or f'{event_type}:{key}' in self.topics
+
+    def offer(self, event):
+        with self._cond:
+            slot = (event['type'], event['key'])
+            previous = self._pending.pop(slot, None)
+            if previous is not None:
+                # Merge so fields changed in the older delta aren't lost
+                event = {**previous, 'changes': {**previous['changes'], **event['changes']}}
+                self.coalesced += 1
+
+            self._pending[slot] = event
+            while len(self._pending) > self.max_pending:
+                dropped_slot, _ = self._pending.popitem(last=False)
+                self.resync.add(dropped_slot)
+                self.dropped += 1
+            self._cond.notify()
+
+    def next(self, timeout=None):
+        """Wait for pending events and return them all (empty list on timeout)"""
+        with self._cond:
+            if not self._pending and not self.closed:
+                self._cond.wait(timeout)
+            events = list(self._pending.values())
+            self._pending.clear()
+            self.delivered += len(events)
+            return events
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class SnapshotBroadcaster:
+    def __init__(self, max_subscribers=50, max_pending=64):
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+
+        self._subscribers = set()
+        self._state = {}
+        self._lock = threading.Lock()
+
+        self.published = 0
+        self.unchanged = 0
+
+    def subscribe(self, topics=None):
+        """Register a subscriber primed with the current full state, or None when full"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscriber = Subscriber(self.max_pending, topics)
+            for (event_type, key), payload in self._state.items():
+                if subscriber.wants(event_type, key):
+                    subscriber.offer({'type': event_type, 'key': key, 'changes': dict(payload), 'full': True})
+            self._subscribers.add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        subscriber.close()
+
+    def publish(self, event_type, key, payload):
+        """Send the fields of payload that changed since the last publish for key"""
+        with self._lock:
+            previous = self._state.get((event_type, key))
+            if previous is None:
+                changes = dict(payload)
+            else:
+                changes = {
+                    field: value for field, value in payload.items()
+                    if field not in VOLATILE_FIELDS and previous.get(field) != value
+                }
+
+            if not changes:
+                self.unchanged += 1
+                return False
+
+            self._state[(event_type, key)] = dict(payload)
+            self.published += 1
+
+            event = {'type': event_type, 'key': key, 'changes': changes, 'full': previous is None}
+            for subscriber in self._subscribers:
+                if not subscriber.wants(event_type, key):
+                    continue
+                if (event_type, key) in subscriber.resync:
+                    subscriber.resync.discard((event_type, key))
+                    subscriber.offer({**event, 'changes': dict(payload), 'full': True})
+                else:
+                    subscriber.offer(event)
+            return True
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'max_subscribers': self.max_subscribers,
+                'published': self.published,
+                'unchanged': self.unchanged,
+                'keys': len(self._state),
+                'per_subscriber': [
+                    {
+                        'age': round(time.time() - subscriber.created, 1),
+                        'delivered': subscriber.delivered,
+                        'coalesced': subscriber.coalesced,
+                        'dropped': subscriber.dropped
+                    }
+                    for subscriber in self._subscribers
+                ]
+            }
+
+
+class SnapshotPublisher:
+    """Recomputes analysis snapshots from the cache when the refresher updates it"""
+
+    def __init__(self, analyzer, broadcaster, min_interval=1.0):
+        self.analyzer = analyzer
+        self.broadcaster = broadcaster
+        self.min_interval = min_interval
+
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def notify(self, key=None):
+        """Refresher listener: a page changed, recompute soon"""
+        self._dirty.set()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='snapshot-publisher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._dirty.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._dirty.wait()
+            if self._stop.is_set():
+                break
+            self._dirty.clear()
+
+            # Nobody listening - skip the work until someone subscribes
+            if self.broadcaster.subscriber_count:
+                try:
+                    self.publish_once()
+                except Exception as e:
+                    logger.error(f"❌ Error publishing snapshots: {e}")
+
+            # Debounce bursts of refreshes into one computation
+            self._stop.wait(self.min_interval)
+
+    def publish_once(self):
+        """Compute every symbol's analysis once and broadcast the deltas"""
+        batch = self.analyzer.analyze_batch(list(self.analyzer.symbols))
+
+        for symbol, result in batch['results'].items():
+            if result['success']:
+                self.broadcaster.publish('analysis', symbol, result['data'])
+
+        for currency, factor in self.analyzer.currency_factors.items():
+            self.broadcaster.publish('strength', currency, {
+                'value': factor['value'],
+                'strength': factor['data'].get('strength')
+            })
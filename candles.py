@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Deriv Candle Store
+Holds one upstream Deriv subscription per symbol/timeframe and keeps the
+candles in fixed-size NumPy ring buffers, so every browser tab is served
+history and live updates from memory instead of opening its own socket.
+"""
+
+import json
+import os
+import random
+import threading
+
+import numpy as np
+import websocket
+
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+DERIV_WS_URL = os.getenv('DERIV_WS_URL', 'wss://ws.derivws.com/websockets/v3?app_id=1089')
+
+# Candle sizes (seconds) accepted by Deriv's ticks_history
+GRANULARITIES = (60, 120, 180, 300, 600, 900, 1800, 3600, 7200, 14400, 28800, 86400)
+
+
+class CandleRingBuffer:
+    """Fixed-capacity OHLC buffer; the oldest candle is overwritten when full"""
+
+    def __init__(self, capacity=5000):
+        self.capacity = capacity
+        self.epochs = np.zeros(capacity, dtype=np.int64)
+        self.ohlc = np.zeros((capacity, 4), dtype=np.float64)
+        self.size = 0
+        self.head = 0  # index where the next candle goes
+        self._lock = threading.Lock()
+
+    def _last_index(self):
+        return (self.head - 1) % self.capacity
+
+    def load(self, epochs, ohlc):
+        """Replace contents with history (arrays sorted by epoch)"""
+        epochs = np.asarray(epochs, dtype=np.int64)[-self.capacity:]
+        ohlc = np.asarray(ohlc, dtype=np.float64).reshape(-1, 4)[-self.capacity:]
+        with self._lock:
+            count = len(epochs)
+            self.epochs[:count] = epochs
+            self.ohlc[:count] = ohlc
+            self.size = count
+            self.head = count % self.capacity
+
+    def upsert(self, epoch, open_, high, low, close):
+        """Update the forming candle or append a new one. Returns False if stale."""
+        with self._lock:
+            if self.size:
+                last = self._last_index()
+                last_epoch = self.epochs[last]
+                if epoch == last_epoch:
+                    self.ohlc[last] = (open_, high, low, close)
+                    return True
+                if epoch < last_epoch:
+                    return False
+
+            self.epochs[self.head] = epoch
+            self.ohlc[self.head] = (open_, high, low, close)
+            self.head = (self.head + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+            return True
+
+    def arrays(self, count=None):
+        """(epochs, ohlc) copies in chronological order, newest last"""
+        with self._lock:
+            count = self.size if count is None else min(count, self.size)
+            start = (self.head - count) % self.capacity
+            index = (start + np.arange(count)) % self.capacity
+            return self.epochs[index].copy(), self.ohlc[index].copy()
+
+    def to_list(self, count=None):
+        """Candles in the browser chart format ({x: ms, o, h, l, c})"""
+        epochs, ohlc = self.arrays(count)
+        return [
+            {'x': int(epoch) * 1000, 'o': o, 'h': h, 'l': l, 'c': c}
+            for epoch, (o, h, l, c) in zip(epochs.tolist(), ohlc.tolist())
+        ]
+
+    def last(self):
+        with self._lock:
+            if not self.size:
+                return None
+            index = self._last_index()
+            o, h, l, c = self.ohlc[index].tolist()
+            return {'x': int(self.epochs[index]) * 1000, 'o': o, 'h': h, 'l': l, 'c': c}
+
+    def __len__(self):
+        return self.size
+
+
+class CandleStore:
+    def __init__(self, url=DERIV_WS_URL, capacity=5000, history_count=1000):
+        self.url = url
+        self.capacity = capacity
+        self.history_count = history_count
+
+        # (symbol, granularity) -> CandleRingBuffer
+        self.buffers = {}
+        self._ready = {}
+        self.listeners = []
+        self.close_listeners = []
+        self._lock = threading.Lock()
+
+        self._ws = None
+        self._connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._failures = 0
+
+        self.messages = 0
+        self.reconnects = 0
+        self.last_error = None
+
+    # ========================================================================
+    # SUBSCRIPTIONS
+    # ========================================================================
+
+    def ensure(self, symbol, granularity):
+        """Subscribe upstream once per symbol/timeframe; later calls are free"""
+        return self._ensure((symbol, int(granularity)))[0]
+
+    def _ensure(self, key):
+        with self._lock:
+            if key in self.buffers:
+                return self.buffers[key], self._ready[key]
+            buffer = self.buffers[key] = CandleRingBuffer(self.capacity)
+            ready = self._ready[key] = threading.Event()
+
+        self.start()
+        if self._connected.is_set():
+            self._send_subscribe(key)
+        return buffer, ready
+
+    def add_listener(self, callback):
+        """Call callback(symbol, granularity, candle) on every live update"""
+        self.listeners.append(callback)
+
+    def add_close_listener(self, callback):
+        """Call callback(symbol, granularity, candle) when a candle closes"""
+        self.close_listeners.append(callback)
+
+    def history(self, symbol, granularity, count=1000, timeout=5):
+        """Candles for a symbol/timeframe, waiting briefly for the first load"""
+        buffer, ready = self._ensure((symbol, int(granularity)))
+        ready.wait(timeout)
+        return buffer.to_list(count)
+
+    def arrays(self, symbol, granularity, count=None, timeout=5):
+        """(epochs, ohlc) NumPy arrays for a symbol/timeframe"""
+        buffer, ready = self._ensure((symbol, int(granularity)))
+        ready.wait(timeout)
+        return buffer.arrays(count)
+
+    # ========================================================================
+    # UPSTREAM CONNECTION
+    # ========================================================================
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='deriv-feed', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._ws:
+            self._ws.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close
+            )
+            self._ws.run_forever(ping_interval=30, ping_timeout=10)
+            self._connected.clear()
+
+            if self._stop.is_set():
+                break
+
+            # Reconnect with capped exponential backoff and jitter
+            self._failures += 1
+            self.reconnects += 1
+            delay = min(2 ** self._failures, 60) * random.uniform(0.8, 1.2)
+            logger.info(f"🔄 Deriv feed reconnecting in {delay:.1f}s")
+            self._stop.wait(delay)
+
+    def _on_open(self, ws):
+        logger.info("✅ Connected to Deriv")
+        self._failures = 0
+        self._connected.set()
+        with self._lock:
+            keys = list(self.buffers)
+        for key in keys:
+            self._send_subscribe(key)
+
+    def _send_subscribe(self, key):
+        symbol, granularity = key
+        try:
+            self._ws.send(json.dumps({
+                'ticks_history': f'frx{symbol}',
+                'count': self.history_count,
+                'end': 'latest',
+                'style': 'candles',
+                'granularity': granularity,
+                'subscribe': 1
+            }))
+        except Exception as e:
+            logger.error(f"❌ Error subscribing {symbol} {granularity}s: {e}")
+
+    def _on_message(self, ws, message):
+        self.messages += 1
+        data = json.loads(message)
+
+        if data.get('error'):
+            self.last_error = data['error'].get('message')
+            logger.error(f"❌ Deriv Error: {self.last_error}")
+
+            # Unknown symbol etc. - forget it so reconnects don't retry it
+            request = data.get('echo_req', {})
+            if 'ticks_history' in request and data['error'].get('code') != 'AlreadySubscribed':
+                key = (request['ticks_history'].replace('frx', '', 1), int(request.get('granularity', 0)))
+                with self._lock:
+                    self.buffers.pop(key, None)
+                    ready = self._ready.pop(key, None)
+                if ready:
+                    ready.set()
+            return
+
+        if 'candles' in data:
+            request = data.get('echo_req', {})
+            key = (request.get('ticks_history', '').replace('frx', '', 1), int(request.get('granularity', 0)))
+            buffer = self.buffers.get(key)
+            if buffer is None:
+                return
+            candles = data['candles']
+            buffer.load(
+                [c['epoch'] for c in candles],
+                [[float(c['open']), float(c['high']), float(c['low']), float(c['close'])] for c in candles]
+            )
+            ready = self._ready.get(key)
+            if ready:
+                ready.set()
+            logger.info(f"✅ Received {len(candles)} candles for {key[0]} {key[1]}s")
+
+        elif 'ohlc' in data:
+            ohlc = data['ohlc']
+            key = (ohlc['symbol'].replace('frx', '', 1), int(ohlc['granularity']))
+            buffer = self.buffers.get(key)
+            if buffer is None:
+                return
+            previous = buffer.last()
+            if buffer.upsert(int(ohlc['open_time']), float(ohlc['open']), float(ohlc['high']),
+                             float(ohlc['low']), float(ohlc['close'])):
+                candle = buffer.last()
+
+                # A newer open time means the previous candle is final
+                if previous and candle['x'] > previous['x']:
+                    self._notify(self.close_listeners, key, previous)
+                self._notify(self.listeners, key, candle)
+
+    def _notify(self, listeners, key, candle):
+        for callback in listeners:
+            try:
+                callback(key[0], key[1], candle)
+            except Exception as e:
+                logger.error(f"❌ Candle listener error: {e}")
+
+    def _on_error(self, ws, error):
+        self.last_error = str(error)
+        logger.error(f"❌ Deriv WebSocket Error: {error}")
+
+    def _on_close(self, ws, status, message):
+        self._connected.clear()
+        logger.info("🔌 Deriv WebSocket closed")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'connected': self._connected.is_set(),
+                'subscriptions': [
+                    {'symbol': symbol, 'granularity': granularity, 'candles': len(buffer)}
+                    for (symbol, granularity), buffer in self.buffers.items()
+                ],
+                'messages': self.messages,
+                'reconnects': self.reconnects,
+                'last_error': self.last_error
+            }
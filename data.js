@@ -169,9 +169,6 @@ if (typeof SMCAnalyzer !== 'undefined') {
     console.log('✅ SMC Analyzer initialized');
 }
 
-// Firebase configuration
-const FIREBASE_URL = 'https://mzanzifx-default-rtdb.firebaseio.com';
-
 // Global State
 let canvas, ctx;
 let chartData = [];
@@ -180,6 +177,12 @@ let currentTimeframe = 300; // 5 minutes
 let ws = null;
 let isConnected = false;
 
+// Server candle feed (shared upstream subscription); falls back to a direct
+// Deriv connection when the server doesn't offer it
+let useServerFeed = true;
+let candleStream = null;
+let streamCandle = null;
+
 // Chart Settings (match working code exactly)
 let zoom = 80;
 let scroll = 0;
@@ -211,7 +214,7 @@ document.addEventListener('DOMContentLoaded', () => {
     window.addEventListener('resize', resizeCanvas);
     
     setupInteraction();
-    connectWebSocket();
+    connectCandleFeed();
 });
 
 function resizeCanvas() {
@@ -221,6 +224,62 @@ function resizeCanvas() {
     if (chartData.length > 0) drawChart();
 }
 
+// ============================================================================
+// SERVER CANDLE FEED
+// ============================================================================
+async function connectCandleFeed() {
+    if (candleStream) {
+        candleStream.close();
+        candleStream = null;
+    }
+    
+    const key = `${currentSymbol}:${currentTimeframe}`;
+    showLoading();
+    
+    try {
+        const response = await fetch(`/api/candles?symbol=${currentSymbol}&timeframe=${currentTimeframe}&count=1000`);
+        const result = await response.json();
+        if (!result.success) throw new Error(result.error);
+        
+        // User switched symbol/timeframe while this was loading
+        if (key !== `${currentSymbol}:${currentTimeframe}`) return;
+        
+        console.log(`✅ Received ${result.candles.length} candles from server`);
+        chartData = result.candles;
+        streamCandle = chartData.length ? { ...chartData[chartData.length - 1] } : null;
+        drawChart();
+        updatePriceDisplay();
+        hideLoading();
+        updateConnectionStatus(true);
+    } catch (error) {
+        console.warn('⚠️ Server candle feed unavailable, connecting to Deriv directly:', error.message);
+        useServerFeed = false;
+        connectWebSocket();
+        return;
+    }
+    
+    // Live updates arrive as deltas of the forming candle
+    candleStream = new EventSource(`/api/stream?topics=candle:${key}`);
+    candleStream.addEventListener('candle', (event) => {
+        const data = JSON.parse(event.data);
+        if (data.key !== key) return;
+        streamCandle = data.full ? data.changes : { ...streamCandle, ...data.changes };
+        updateCandle({ ...streamCandle });
+    });
+    candleStream.onopen = () => updateConnectionStatus(true);
+    candleStream.onerror = (event) => {
+        updateConnectionStatus(false);
+        // EventSource reconnects itself after a dropped connection, but gives
+        // up when the server refuses the stream (503: all stream slots taken)
+        if (event.target === candleStream && candleStream.readyState === EventSource.CLOSED) {
+            console.warn('⚠️ Server stream full, connecting to Deriv directly');
+            candleStream = null;
+            useServerFeed = false;
+            connectWebSocket();
+        }
+    };
+}
+
 // ============================================================================
 // WEBSOCKET CONNECTION - EXACT COPY FROM WORKING CODE
 // ============================================================================
@@ -634,7 +693,9 @@ window.changeTimeframe = function(tf) {
     
     showLoading();
     
-    if (isConnected && ws) {
+    if (useServerFeed) {
+        connectCandleFeed();
+    } else if (isConnected && ws) {
         const apiSymbol = SYMBOLS[currentSymbol].apiSymbol;
         
         ws.send(JSON.stringify({ forget_all: 'ticks' }));
@@ -668,6 +729,11 @@ window.changeSymbol = function() {
     
     showLoading();
     
+    if (useServerFeed) {
+        connectCandleFeed();
+        return;
+    }
+    
     // Close existing WebSocket
     if (ws) {
         ws.close();
@@ -794,8 +860,8 @@ window.generateSignal = async function() {
             // Display signal
             displaySignal(signal);
             
-            // Save to Firebase
-            await saveSignalToFirebase(signal);
+            // Save to signal history
+            await saveSignal(signal);
             
             console.log('✅ Signal generated:', signal.bias, signal.confidence + '%');
         } else {
@@ -823,7 +889,7 @@ window.toggleAutoAnalyze = function() {
         smcAnalyzer.startAutoAnalysis(chartData, currentTimeframe, currentSymbol, (signal) => {
             console.log('🔔 Auto-signal detected!');
             displaySignal(signal);
-            saveSignalToFirebase(signal);
+            saveSignal(signal);
         });
         btn.classList.add('active');
         console.log('▶️ Auto-analyze started');
@@ -869,9 +935,10 @@ window.closeSignal = function() {
     document.getElementById('signalPanel').classList.add('hidden');
 };
 
-async function saveSignalToFirebase(signal) {
+async function saveSignal(signal) {
+    // The server stores the signal for /api/signals and mirrors it to Firebase
     try {
-        const response = await fetch(`${FIREBASE_URL}/signals.json`, {
+        const response = await fetch('/api/signals', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -881,12 +948,12 @@ async function saveSignalToFirebase(signal) {
         
         if (response.ok) {
             const data = await response.json();
-            console.log('✅ Signal saved to Firebase:', data.name);
+            console.log('✅ Signal saved:', data.id);
         } else {
             console.error('❌ Failed to save signal');
         }
     } catch (error) {
-        console.error('❌ Error saving to Firebase:', error);
+        console.error('❌ Error saving signal:', error);
     }
 }
 
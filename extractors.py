@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Quote Extractors
+Pluggable extraction of price/change/sentiment from Investing.com instrument
+pages. A targeted regex scanner and precompiled lxml XPath run first;
+BeautifulSoup only parses the full page when both miss.
+"""
+
+import html
+import re
+import threading
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+
+def to_number(text):
+    """Parse a scraped number like '2,650.25' or '+1.30'"""
+    return float(text.strip().replace(',', ''))
+
+
+def sentiment_from_text(text):
+    """Map sentiment widget text to bullish/bearish/neutral"""
+    if not text:
+        return 'neutral'
+
+    text = text.lower()
+
+    if 'bullish' in text or 'buy' in text or 'strong buy' in text:
+        return 'bullish'
+    elif 'bearish' in text or 'sell' in text or 'strong sell' in text:
+        return 'bearish'
+    else:
+        return 'neutral'
+
+
+def decode(content):
+    if isinstance(content, bytes):
+        return content.decode('utf-8', errors='replace')
+    return content
+
+
+class RegexExtractor:
+    """Scans raw HTML for the three elements without building a tree"""
+
+    name = 'regex'
+
+    _PRICE = re.compile(r'<span\b[^>]*\bdata-test=["\']instrument-price-last["\'][^>]*>(.*?)</span>',
+                        re.S | re.I)
+    _CHANGE = re.compile(r'<span\b[^>]*\bdata-test=["\']instrument-price-change["\'][^>]*>(.*?)</span>',
+                         re.S | re.I)
+    _DIV_CLASS = re.compile(r'<div\b[^>]*?\bclass\s*=\s*["\']([^"\']*)["\'][^>]*>', re.I)
+    _DIV_TAG = re.compile(r'<(/?)div\b[^>]*>', re.I)
+    _TAG = re.compile(r'<[^>]+>')
+
+    def text(self, fragment):
+        return html.unescape(self._TAG.sub('', fragment))
+
+    def element_text(self, page, start):
+        """Text of the div opened just before start, honouring nested divs"""
+        depth = 1
+        for tag in self._DIV_TAG.finditer(page, start):
+            depth += -1 if tag.group(1) else 1
+            if depth == 0:
+                return self.text(page[start:tag.start()])
+        return self.text(page[start:])
+
+    def extract(self, content):
+        page = decode(content)
+
+        price_match = self._PRICE.search(page)
+        if not price_match:
+            return None
+
+        change_match = self._CHANGE.search(page)
+
+        sentiment_text = None
+        for div in self._DIV_CLASS.finditer(page):
+            if 'sentiment' in div.group(1).split():
+                sentiment_text = self.element_text(page, div.end())
+                break
+
+        try:
+            return {
+                'price': to_number(self.text(price_match.group(1))),
+                'change': to_number(self.text(change_match.group(1))) if change_match else 0,
+                'sentiment_text': sentiment_text
+            }
+        except ValueError:
+            return None
+
+
+class LxmlExtractor:
+    """lxml parse with precompiled XPath lookups"""
+
+    name = 'lxml'
+
+    if LXML_AVAILABLE:
+        _PRICE = etree.XPath('//span[@data-test="instrument-price-last"]')
+        _CHANGE = etree.XPath('//span[@data-test="instrument-price-change"]')
+        _SENTIMENT = etree.XPath('//div[contains(concat(" ", normalize-space(@class), " "), " sentiment ")]')
+
+    def extract(self, content):
+        if not LXML_AVAILABLE:
+            return None
+
+        try:
+            tree = lxml_html.fromstring(content)
+        except (etree.ParserError, ValueError):
+            return None
+
+        price = self._PRICE(tree)
+        if not price:
+            return None
+
+        change = self._CHANGE(tree)
+        sentiment = self._SENTIMENT(tree)
+
+        try:
+            return {
+                'price': to_number(price[0].text_content()),
+                'change': to_number(change[0].text_content()) if change else 0,
+                'sentiment_text': sentiment[0].text_content() if sentiment else None
+            }
+        except ValueError:
+            return None
+
+
+class SoupExtractor:
+    """Full BeautifulSoup html.parser tree (original behaviour)"""
+
+    name = 'bs4'
+
+    def extract(self, content):
+        if not BS4_AVAILABLE:
+            return None
+
+        soup = BeautifulSoup(content, 'html.parser')
+
+        price_elem = soup.find('span', {'data-test': 'instrument-price-last'})
+        if not price_elem:
+            return None
+
+        change_elem = soup.find('span', {'data-test': 'instrument-price-change'})
+        sentiment_elem = soup.find('div', class_='sentiment')
+
+        try:
+            return {
+                'price': to_number(price_elem.text),
+                'change': to_number(change_elem.text) if change_elem else 0,
+                'sentiment_text': sentiment_elem.text if sentiment_elem else None
+            }
+        except ValueError:
+            return None
+
+
+class ExtractorChain:
+    def __init__(self, extractors=None):
+        self.extractors = extractors or [RegexExtractor(), LxmlExtractor(), SoupExtractor()]
+        self.counts = {extractor.name: 0 for extractor in self.extractors}
+        self.counts['miss'] = 0
+        self._lock = threading.Lock()
+
+    def extract(self, content):
+        """First extractor that finds a price wins"""
+        for extractor in self.extractors:
+            quote = extractor.extract(content)
+            if quote:
+                with self._lock:
+                    self.counts[extractor.name] += 1
+                return quote
+
+        with self._lock:
+            self.counts['miss'] += 1
+        return None
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+# Shared chain used by the analyzers
+quote_extractor = ExtractorChain()
+
+
+def extract_quote(content):
+    """Extract {'price', 'change', 'sentiment_text'} from an Investing.com page"""
+    return quote_extractor.extract(content)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Factor Graph
+Fundamental factors as functions of data nodes. A data node is a cache
+key loaded once per refresh cycle (pair quotes, DXY, US10Y, NEWS); a
+factor reads nodes from one FactorSnapshot and never fetches anything,
+so every symbol's fundamentals come from the same pages and no analysis
+re-scrapes a page another one already loaded.
+
+    snapshot = analyzer.factor_snapshot(context)
+    gold_prediction(snapshot.gold)
+"""
+
+from datetime import datetime
+
+# Data nodes the Gold factors read, besides the currency strength pages
+GOLD_NODES = {'XAUUSD', 'DXY', 'US10Y', 'NEWS'}
+
+BULLISH_KEYWORDS = ['rise', 'up', 'gain', 'higher', 'rally', 'surge', 'climb', 'jump', 'boost']
+BEARISH_KEYWORDS = ['fall', 'down', 'drop', 'lower', 'decline', 'plunge', 'slide', 'sink', 'tumble']
+
+
+def news_sentiment(headlines):
+    """bullish/bearish/neutral from keyword counts in the top 5 headlines"""
+    bullish_count = 0
+    bearish_count = 0
+
+    for text in headlines[:5]:
+        text = text.lower()
+        bullish_count += sum(keyword in text for keyword in BULLISH_KEYWORDS)
+        bearish_count += sum(keyword in text for keyword in BEARISH_KEYWORDS)
+
+    if bullish_count > bearish_count:
+        return 'bullish'
+    elif bearish_count > bullish_count:
+        return 'bearish'
+    return 'neutral'
+
+
+# ============================================================================
+# GOLD FACTORS: snapshot -> value in [-1, 1] (positive = bullish for Gold)
+# ============================================================================
+
+def _price(snapshot, key):
+    data = snapshot.pages.get(key)
+    return data['price'] if data else None
+
+
+def usd_level(snapshot):
+    # Strong USD = bearish for Gold, weak USD = bullish
+    dxy = _price(snapshot, 'DXY')
+    if dxy is None:
+        return 0
+    if dxy > 105:
+        return -1
+    if dxy < 95:
+        return 1
+    return 0
+
+
+def usd_strength(snapshot):
+    # The 'DXY' factor reads the solved USD strength (DXY change plus every
+    # USD pair), negated, rather than the index level, which usd_level
+    # already covers; it used to be a placeholder that stayed at 0
+    return -snapshot.currency_values.get('USD', 0)
+
+
+def yields_level(snapshot):
+    # Higher yields = bearish for Gold, lower yields = bullish
+    yields = _price(snapshot, 'US10Y')
+    if yields is None:
+        return 0
+    if yields > 4.5:
+        return -1
+    if yields < 3.5:
+        return 1
+    return 0
+
+
+def news_tone(snapshot):
+    # Keyword sentiment of the Gold headlines: bullish news = bullish for Gold
+    news = snapshot.pages.get('NEWS')
+    if not news:
+        return 0
+    return {'bullish': 1, 'bearish': -1}.get(news['news_sentiment'], 0)
+
+
+def unsourced(snapshot):
+    # No data node yet; stays neutral
+    return 0
+
+
+# name: (weight, factor)
+GOLD_FACTORS = {
+    'USD': (0.30, usd_level),
+    'DXY': (0.25, usd_strength),
+    'YIELDS': (0.20, yields_level),
+    'INFLATION': (0.15, unsourced),
+    # Headlines stand in for the unsourced geopolitical factor's weight
+    'NEWS': (0.10, news_tone)
+}
+
+
+def gold_factors(snapshot=None):
+    """{name: {'weight', 'value'}} evaluated on snapshot (all neutral without one)"""
+    return {
+        name: {'weight': weight, 'value': round(factor(snapshot), 3) if snapshot else 0}
+        for name, (weight, factor) in GOLD_FACTORS.items()
+    }
+
+
+def gold_score(factors):
+    """Weighted factor sum on a 0-100 scale"""
+    score = sum(data['value'] * data['weight'] for data in factors.values())
+    return round(((score + 1) / 2) * 100, 2)
+
+
+def gold_prediction(factors):
+    score = gold_score(factors)
+
+    if score > 65:
+        bias = 'bullish'
+        confidence = min(score, 95)
+    elif score < 35:
+        bias = 'bearish'
+        confidence = min(100 - score, 95)
+    else:
+        bias = 'neutral'
+        confidence = 50
+
+    return {
+        'bias': bias,
+        'confidence': round(confidence, 2),
+        'score': score,
+        'factors': factors
+    }
+
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+class FactorSnapshot:
+    """Every data node and derived factor from one data pass; read-only once built"""
+
+    def __init__(self, pages, strengths, currency_values):
+        self.pages = dict(pages)
+        self.strengths = dict(strengths)
+        self.currency_values = dict(currency_values)
+        self.timestamp = datetime.now().isoformat()
+        self.gold = gold_factors(self)
+
+    @property
+    def stale(self):
+        return any(data.get('stale') for data in self.pages.values() if data)
+
+    def to_dict(self):
+        news = self.pages.get('NEWS')
+        return {
+            'nodes': {key: data['price'] if data else None for key, data in sorted(self.pages.items())},
+            'missing': sorted(key for key, data in self.pages.items() if not data),
+            'strengths': {code: round(value, 4) for code, value in self.strengths.items() if value is not None},
+            'news_sentiment': news['news_sentiment'] if news else None,
+            'gold': gold_prediction(self.gold),
+            'stale': self.stale,
+            'timestamp': self.timestamp
+        }
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Firebase Write-Behind Queue
+Collects Realtime Database writes off the request thread and sends them
+as multi-path updates (one PATCH of {"signals/<id>": {...}, ...}) every
+flush interval or batch size, retrying failed batches with backoff.
+
+The queue is bounded: when Firebase falls behind, put() blocks for up to
+put_timeout and then rejects the write, instead of growing without limit.
+"""
+
+import json
+import queue
+import random
+import threading
+import time
+
+from http_client import HttpClient
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+
+def overlaps(path, other):
+    """True if one path is the other or its ancestor (not allowed in one update)"""
+    return path == other or path.startswith(other + '/') or other.startswith(path + '/')
+
+
+class FirebaseWriter:
+    def __init__(self, database_url, auth=None, flush_interval=1.0, batch_size=100, max_queue=1000,
+                 put_timeout=0.5, max_retries=5, backoff=0.5, max_backoff=30, http=None):
+        self.database_url = database_url.rstrip('/')
+        self.auth = auth  # callable -> query params, e.g. {'access_token': ...}
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.http = http if http is not None else HttpClient(pool_size=2, retries=0)
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._carry = []  # writes held back because they overlapped the last batch
+        self._idle = threading.Condition()
+        self._in_flight = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.rejected = 0
+        self.failed = 0
+        self.last_error = None
+
+    # ========================================================================
+    # PRODUCERS
+    # ========================================================================
+
+    def put(self, path, value, timeout=None):
+        """Queue a write (value None deletes path). Returns False if the queue stayed full."""
+        self.start()
+        try:
+            with self._idle:
+                self._in_flight += 1
+            self._queue.put((path.strip('/'), value), timeout=self.put_timeout if timeout is None else timeout)
+        except queue.Full:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+            with self._lock:
+                self.rejected += 1
+            logger.warning(f"⚠️ Firebase write queue full, dropped write to {path}")
+            return False
+
+        with self._lock:
+            self.queued += 1
+        return True
+
+    def flush(self, timeout=30):
+        """Block until every queued write has been sent (or given up on)"""
+        deadline = time.time() + timeout
+        with self._idle:
+            while self._in_flight:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    # ========================================================================
+    # FLUSHER
+    # ========================================================================
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='firebase-writer', daemon=True)
+            self._thread.start()
+
+    def stop(self, flush=True):
+        if flush:
+            self.flush()
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _next_batch(self):
+        """Wait for a first write, then gather more until flush_interval or batch_size"""
+        writes = self._carry
+        self._carry = []
+        if not writes:
+            try:
+                writes.append(self._queue.get(timeout=1))
+            except queue.Empty:
+                return {}
+
+        deadline = time.time() + self.flush_interval
+        while len(writes) < self.batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                writes.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # Later writes to the same path replace earlier ones; a write that
+        # overlaps a different path in the batch waits for the next one
+        batch = {}
+        for index, (path, value) in enumerate(writes):
+            if path not in batch and any(overlaps(path, other) for other in batch):
+                self._carry = writes[index:]
+                break
+            batch.pop(path, None)
+            batch[path] = value
+
+        coalesced = len(writes) - len(self._carry) - len(batch)
+        if coalesced:
+            self._done(coalesced)
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._send(batch)
+
+    def _send(self, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                params = self.auth() if self.auth else None
+                response = self.http.request('PATCH', f'{self.database_url}/.json',
+                                             params=params, data=json.dumps(batch, default=str))
+                if response.status_code < 400:
+                    with self._lock:
+                        self.batches += 1
+                        self.written += len(batch)
+                    self._done(len(batch))
+                    return
+                self.last_error = f'HTTP {response.status_code}: {response.text[:200]}'
+
+                # Client errors other than throttling won't succeed on retry
+                if response.status_code < 500 and response.status_code != 429:
+                    break
+            except Exception as e:
+                self.last_error = str(e)
+
+            if attempt < self.max_retries:
+                with self._lock:
+                    self.retries += 1
+                delay = min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.8, 1.2)
+                if self._stop.wait(delay):
+                    break
+
+        logger.error(f"❌ Firebase batch of {len(batch)} writes failed: {self.last_error}")
+        with self._lock:
+            self.failed += len(batch)
+        self._done(len(batch))
+
+    def _done(self, count):
+        with self._idle:
+            self._in_flight -= count
+            self._idle.notify_all()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': self._queue.qsize() + len(self._carry),
+                'queued': self.queued,
+                'written': self.written,
+                'batches': self.batches,
+                'avg_batch_size': round(self.written / self.batches, 1) if self.batches else 0,
+                'retries': self.retries,
+                'rejected': self.rejected,
+                'failed': self.failed,
+                'last_error': self.last_error
+            }
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Client
+One keep-alive requests.Session per upstream host with bounded connection
+pools, retries with backoff, per-host timeouts and connection reuse metrics.
+Optionally each host also gets a token bucket (rate) and a circuit breaker
+(failure_threshold) from throttle.py. Retries are sent here rather than
+inside urllib3, so each one takes a token and is refused once the breaker
+opens.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from throttle import CircuitBreaker, HostGuard, TokenBucket, failed_status
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    def __init__(self, pool_size=10, retries=2, backoff=0.3, timeout=10,
+                 host_timeouts=None, headers=None, rate=None, burst=None, host_rates=None,
+                 max_wait=2.0, failure_threshold=None, reset_timeout=30, max_retry_after=5.0):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        # A Retry-After longer than this is not waited for; the response is returned
+        self.max_retry_after = max_retry_after
+        self.timeout = timeout
+        self.host_timeouts = dict(host_timeouts or {})
+        self.headers = dict(headers or {})
+
+        # Requests/second per host (None = unlimited) and breaker settings (None = no breaker)
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = dict(host_rates or {})
+        self.max_wait = max_wait
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._sessions = {}
+        self._metrics = {}
+        self._guards = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, host):
+        """Get (or create) the pooled session for a host"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                # Retries are done by request(), through the host's guard
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.pool_size,
+                    max_retries=0
+                )
+                session = requests.Session()
+                session.headers.update(self.headers)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+                self._metrics[host] = {
+                    'requests': 0,
+                    'errors': 0,
+                    'total_time': 0.0
+                }
+            return session
+
+    def timeout_for(self, host):
+        """Timeout in seconds for a host"""
+        return self.host_timeouts.get(host, self.timeout)
+
+    def guard_for(self, host):
+        """Get (or create) the rate limiter and breaker shared by every request to a host"""
+        with self._lock:
+            guard = self._guards.get(host)
+            if guard is None:
+                rate = self.host_rates.get(host, self.rate)
+                guard = self._guards[host] = HostGuard(
+                    host,
+                    bucket=TokenBucket(rate, self.burst) if rate else None,
+                    breaker=CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+                    if self.failure_threshold else None,
+                    max_wait=self.max_wait
+                )
+            return guard
+
+    def circuit_open(self, url):
+        """True while the breaker for url's host is open"""
+        guard = self._guards.get(urlparse(url).hostname or '')
+        return guard is not None and guard.is_open
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the host's pooled session, rate limit and
+        breaker. Idempotent methods are retried on connection errors and
+        RETRY_STATUSES with backoff (or a capped Retry-After); every attempt
+        goes through the guard, so a retry can raise CircuitOpenError.
+        """
+        host = urlparse(url).hostname or ''
+        guard = self.guard_for(host)
+        session = self.session_for(host)
+        kwargs.setdefault('timeout', self.timeout_for(host))
+        attempts = self.retries + 1 if method.upper() in Retry.DEFAULT_ALLOWED_METHODS else 1
+
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = self._send(guard, session, host, method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    return response
+                delay = self.retry_delay(response, attempt)
+                if delay is None:
+                    return response
+            time.sleep(delay)
+
+    def retry_delay(self, response, attempt):
+        """Seconds before retrying a response: its Retry-After, else backoff; None if over max_retry_after"""
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return self.backoff * 2 ** attempt
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return self.backoff * 2 ** attempt
+        delay = max(0.0, delay)
+        return delay if delay <= self.max_retry_after else None
+
+    def _send(self, guard, session, host, method, url, **kwargs):
+        """One attempt: admitted by the guard, result recorded on its breaker"""
+        wait = guard.admit()
+        if wait:
+            time.sleep(wait)
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = session.request(method, url, **kwargs)
+            failed = failed_status(response.status_code)
+            return response
+        except requests.RequestException:
+            with self._lock:
+                self._metrics[host]['errors'] += 1
+            raise
+        finally:
+            guard.record(not failed)
+            with self._lock:
+                metrics = self._metrics[host]
+                metrics['requests'] += 1
+                metrics['total_time'] += time.perf_counter() - started
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def stats(self):
+        """Per-host request counts, latency and connection reuse rate"""
+        with self._lock:
+            hosts = {}
+            for host, session in self._sessions.items():
+                metrics = self._metrics[host]
+                opened, sent = self._pool_counters(session)
+                hosts[host] = {
+                    'requests': metrics['requests'],
+                    'errors': metrics['errors'],
+                    'avg_latency_ms': round(metrics['total_time'] / metrics['requests'] * 1000, 2)
+                    if metrics['requests'] else 0,
+                    'connections_opened': opened,
+                    'connection_reuse_rate': round(1 - opened / sent, 4) if sent else 0,
+                    'timeout': self.timeout_for(host)
+                }
+            for host, guard in self._guards.items():
+                hosts.setdefault(host, {'requests': 0, 'errors': 0}).update(guard.stats())
+            return {
+                'pool_size': self.pool_size,
+                'retries': self.retries,
+                'hosts': hosts
+            }
+
+    @staticmethod
+    def _pool_counters(session):
+        # urllib3 pools count new connections and requests sent over them
+        opened = sent = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    sent += pool.num_requests
+        return opened, sent
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def parse_host_timeouts(value):
+    """Parse 'host=seconds,host=seconds' (or any host=number list) into a dict"""
+    timeouts = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            host, seconds = item.split('=', 1)
+            timeouts[host.strip()] = float(seconds)
+    return timeouts
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Logs
+Structured logging that keeps stdout off the request path: loggers put
+records on a bounded queue and one background thread formats them (JSON
+lines by default) and writes them out. When the queue is full records
+are dropped and counted rather than blocking the caller.
+
+Per-request lines (analysis results, saved signals) are marked with
+extra=sampled(...) and only LOG_SAMPLE_RATE of them are kept; warnings
+and errors are never sampled.
+
+    logger = get_logger(__name__)
+    logger.info(f"✅ {pair} analysis", extra=sampled(symbol=pair, bias=bias))
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', 0.1))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+# Attributes every LogRecord has; anything else came from extra=
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'sampled'}
+
+_lock = threading.Lock()
+_handler = None
+_listener = None
+
+
+def get_logger(name):
+    return logging.getLogger(name)
+
+
+def sampled(**fields):
+    """extra= for a per-request line: kept at LOG_SAMPLE_RATE"""
+    return {'sampled': True, **fields}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+        self.sampled_out = 0
+
+    def filter(self, record):
+        if getattr(record, 'sampled', False) and record.levelno < logging.WARNING:
+            if random.random() >= self.rate:
+                self.sampled_out += 1
+                return False
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking or raising when full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.queued = 0
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.queued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(start=True):
+    """
+    Route the root logger through the queue (idempotent). With start=False
+    records are buffered until start_logging(), e.g. until worker
+    processes have been forked.
+    """
+    global _handler, _listener
+    with _lock:
+        if _handler is None:
+            stream = logging.StreamHandler(sys.stdout)
+            if LOG_FORMAT == 'json':
+                stream.setFormatter(JsonFormatter())
+            else:
+                stream.setFormatter(logging.Formatter('%(message)s'))
+
+            _handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+            _handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+            _listener = logging.handlers.QueueListener(_handler.queue, stream, respect_handler_level=True)
+
+            root = logging.getLogger()
+            root.addHandler(_handler)
+            root.setLevel(LOG_LEVEL)
+            atexit.register(stop_logging)
+    if start:
+        start_logging()
+
+
+def start_logging():
+    """Start the writer thread"""
+    with _lock:
+        if _listener and _listener._thread is None:
+            _listener.start()
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    with _lock:
+        if _listener and _listener._thread is not None:
+            _listener.stop()
+
+
+def logging_stats():
+    if _handler is None:
+        return {'queued': 0, 'dropped': 0, 'sampled_out': 0, 'pending': 0}
+    return {
+        'queued': _handler.queued,
+        'dropped': _handler.dropped,
+        'sampled_out': _handler.filters[0].sampled_out,
+        'pending': _handler.queue.qsize()
+    }
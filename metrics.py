@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Metrics
+Minimal in-process counters and histograms rendered in the Prometheus
+text format for /metrics. Analyzer stages (fetch, parse, strength, bias,
+volatility, enhance) are timed per symbol with timed():
+
+    with timed('fetch', symbol):
+        response = http.get(url)
+
+An exception leaving the block counts as an error for that stage.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds; covers a cached parse (~ms) up to a slow upstream fetch
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(self.labels, labels)} {_number(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket..., count above the last bucket, sum]
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._children.get(labels)
+            if child is None:
+                child = self._children[labels] = [0] * (len(self.buckets) + 2)
+            child[index] += 1
+            child[-1] += value
+
+    def snapshot(self, *labels):
+        """{'count', 'sum'} for one label set"""
+        with self._lock:
+            child = self._children.get(labels)
+            return {'count': sum(child[:-1]), 'sum': child[-1]} if child else {'count': 0, 'sum': 0}
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            children = sorted((labels, list(child)) for labels, child in self._children.items())
+
+        for labels, child in children:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), child[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{_number(bound)}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labels, labels)} {repr(float(child[-1]))}')
+            lines.append(f'{self.name}_count{_labels(self.labels, labels)} {cumulative}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def counter(self, name, help, labels=()):
+        metric = Counter(name, help, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect):
+        """collect() -> iterable of (name, type, help, [(labels dict, value), ...]) read at scrape time"""
+        self.collectors.append(collect)
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines += metric.render()
+
+        for collect in self.collectors:
+            try:
+                families = list(collect())
+            except Exception as e:
+                logger.error(f"❌ Metrics collector failed: {e}")
+                continue
+            for name, kind, help, samples in families:
+                lines += [f'# HELP {name} {help}', f'# TYPE {name} {kind}']
+                for labels, value in samples:
+                    if value is not None:
+                        lines.append(f'{name}{_labels(labels.keys(), labels.values())} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# Shared by every analyzer and web.py
+registry = Registry()
+
+stage_seconds = registry.histogram(
+    'analyzer_stage_seconds', 'Time spent in each analyzer stage', ('stage', 'symbol')
+)
+stage_errors = registry.counter(
+    'analyzer_stage_errors_total', 'Analyzer stages that raised or produced no result', ('stage', 'symbol')
+)
+
+
+class StageTimer:
+    __slots__ = ('stage', 'symbol', 'started', 'failed')
+
+    def __init__(self, stage, symbol):
+        self.stage = stage
+        self.symbol = symbol
+        self.failed = False
+
+    def fail(self):
+        """Count the stage as an error without raising"""
+        self.failed = True
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stage_seconds.observe(time.perf_counter() - self.started, self.stage, self.symbol)
+        if exc_type is not None or self.failed:
+            stage_errors.inc(self.stage, self.symbol)
+        return False
+
+
+def timed(stage, symbol):
+    return StageTimer(stage, symbol)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Quote Cache
+Thread-safe TTL + LRU cache for scraped quotes, with single-flight loading
+so concurrent misses for the same key only trigger one upstream fetch
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """A load in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class QuoteCache:
+    def __init__(self, ttl=30, max_entries=64):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # key -> (value, stored_at)
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.load_failures = 0
+        self.evictions = 0
+
+    def get(self, key, loader, allow_stale=False):
+        """
+        Return a fresh cached value for key, calling loader() on a miss.
+        With allow_stale, any cached value is returned regardless of age.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                fresh = time.monotonic() - entry[1] < self.ttl
+                if fresh or allow_stale:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if not fresh:
+                        self.stale_hits += 1
+                    return entry[0]
+
+            self.misses += 1
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = _Flight()
+                self._inflight[key] = flight
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        # Another thread is already fetching this key - wait for its result
+        if not leader:
+            flight.event.wait()
+            if flight.error:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self.loads += 1
+                if flight.value is not None:
+                    self._store(key, flight.value)
+                else:
+                    self.load_failures += 1
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+        return flight.value
+
+    def lookup(self, key, allow_stale=False):
+        """Return a cached value without loading, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                fresh = time.monotonic() - entry[1] < self.ttl
+                if fresh or allow_stale:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if not fresh:
+                        self.stale_hits += 1
+                    return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store a value directly (used by background refreshers)"""
+        if value is None:
+            return
+        with self._lock:
+            self._store(key, value)
+
+    def peek(self, key):
+        """Return (value, age_seconds) even if expired, or (None, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None, None
+            return entry[0], time.monotonic() - entry[1]
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Counters snapshot for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+                'coalesced': self.coalesced,
+                'loads': self.loads,
+                'load_failures': self.load_failures,
+                'evictions': self.evictions,
+                'inflight': len(self._inflight)
+            }
+
+    def _store(self, key, value):
+        # Caller must hold the lock
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
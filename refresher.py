@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Background Quote Refresher
+Keeps the analyzer's quote cache warm so request handlers read the latest
+snapshot instead of blocking on investing.com
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundRefresher:
+    def __init__(self, analyzer, interval=20, jitter=0.1, max_backoff=300, max_workers=4, min_interval=5):
+        self.analyzer = analyzer
+        self.min_interval = min_interval
+        self.default_interval = max(interval, min_interval)
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+
+        # key -> job state
+        self.jobs = {}
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='refresher')
+
+        # Pair quotes, DXY, US10Y and news: one refresh feeds every analysis
+        for key, fetch in analyzer.data_nodes().items():
+            self.add_job(key, fetch)
+
+    # ========================================================================
+    # JOB MANAGEMENT
+    # ========================================================================
+
+    def add_job(self, key, fetch, interval=None):
+        """Register a page to refresh; first run is spread over one interval"""
+        interval = self.clamp_interval(interval)
+        with self._lock:
+            self.jobs[key] = {
+                'fetch': fetch,
+                'interval': interval,
+                'next_run': time.monotonic() + random.uniform(0, min(interval, 5)),
+                'running': False,
+                'failures': 0,
+                'runs': 0,
+                'last_success': None,
+                'last_error': None
+            }
+        self._wakeup.set()
+
+    def add_listener(self, callback):
+        """Call callback(key) after every successful refresh"""
+        self.listeners.append(callback)
+
+    def clamp_interval(self, interval):
+        """Seconds between refreshes, at least min_interval (None = the default)"""
+        if interval is None:
+            return self.default_interval
+        return max(float(interval), self.min_interval)
+
+    def set_interval(self, key, interval=None):
+        """Change refresh interval for a key (None restores the default)"""
+        interval = self.clamp_interval(interval)
+        with self._lock:
+            job = self.jobs.get(key)
+            if not job:
+                return False
+            job['interval'] = interval
+            job['next_run'] = min(job['next_run'], time.monotonic() + job['interval'])
+        self._wakeup.set()
+        return True
+
+    # ========================================================================
+    # SCHEDULING LOOP
+    # ========================================================================
+
+    def start(self):
+        """Start the scheduler thread and switch the analyzer to snapshot reads"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.analyzer.prefer_snapshot = True
+        self._thread = threading.Thread(target=self._run, name='quote-refresher', daemon=True)
+        self._thread.start()
+        logger.info(f"🔄 Background refresher started for {len(self.jobs)} pages")
+
+    def stop(self):
+        """Stop the scheduler thread"""
+        self._stop.set()
+        self._wakeup.set()
+        self.analyzer.prefer_snapshot = False
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            now = time.monotonic()
+            next_due = now + self.default_interval
+
+            with self._lock:
+                for key, job in self.jobs.items():
+                    if job['running']:
+                        continue
+                    if job['next_run'] <= now:
+                        try:
+                            self._executor.submit(self._refresh, key, job)
+                        except RuntimeError:
+                            # The pool is shut down at interpreter exit, before atexit handlers run
+                            self._stop.set()
+                            return
+                        job['running'] = True
+                    else:
+                        next_due = min(next_due, job['next_run'])
+
+            self._wakeup.wait(timeout=max(next_due - time.monotonic(), 0.05))
+
+    def _refresh(self, key, job):
+        try:
+            value = job['fetch']()
+            error = None if value is not None else 'no data'
+        except Exception as e:
+            value = None
+            error = str(e)
+
+        now = time.monotonic()
+        with self._lock:
+            job['running'] = False
+            job['runs'] += 1
+            job['last_error'] = error
+            if value is not None:
+                self.analyzer.quote_cache.put(key, value)
+                job['failures'] = 0
+                job['last_success'] = time.time()
+                delay = job['interval']
+            else:
+                # Exponential backoff so a failing page isn't hammered
+                job['failures'] += 1
+                delay = min(job['interval'] * (2 ** job['failures']), self.max_backoff)
+            job['next_run'] = now + delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._wakeup.set()
+
+        if value is not None:
+            for callback in self.listeners:
+                try:
+                    callback(key)
+                except Exception as e:
+                    logger.error(f"❌ Refresh listener error for {key}: {e}")
+
+    def status(self):
+        """Per-page refresh state for monitoring"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: {
+                    'interval': job['interval'],
+                    'next_run_in': round(max(job['next_run'] - now, 0), 2),
+                    'failures': job['failures'],
+                    'runs': job['runs'],
+                    'last_success': job['last_success'],
+                    'last_error': job['last_error']
+                }
+                for key, job in self.jobs.items()
+            }
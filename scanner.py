@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Signal Scanner
+Runs SMC signal generation for every symbol x timeframe on worker
+processes, enhances fired signals with fundamentals and hands them to
+listeners (the stream broadcaster) as they fire.
+
+Each (symbol, timeframe) is pinned to one worker process that keeps its
+IncrementalSMC state, so a closed candle costs one incremental update
+instead of a full rescan, and the keys spread across all cores.
+
+Workers are forked (where available) by start_workers(), so call it (or
+start()) before other background threads are running.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from logs import get_logger
+from smc import IncrementalSMC
+
+logger = get_logger(__name__)
+
+DEFAULT_TIMEFRAMES = (300, 900, 3600)
+
+
+def _scan_worker(inbox, outbox):
+    """Worker process: owns the SMC engines for its share of keys"""
+    engines = {}
+    while True:
+        job = inbox.get()
+        if job is None:
+            break
+
+        kind, key, times, ohlc, submitted = job
+        started = time.perf_counter()
+        signal = None
+        try:
+            if kind == 'load':
+                engine = engines[key] = IncrementalSMC(key[1], key[0])
+                engine.load(times, ohlc, warmup=len(times))
+                signal = engine.generate_signal(key[1], key[0]) if engine.count >= 100 else None
+            else:
+                engine = engines[key]
+                rows = list(zip(times.tolist(), ohlc.tolist()))
+                for i, (t, (o, h, l, c)) in enumerate(rows):
+                    signal = engine.update(t, o, h, l, c, emit=i == len(rows) - 1)
+            error = None
+        except Exception as e:
+            error = str(e)
+
+        outbox.put((kind, key, signal, int(times[-1]), submitted, (time.perf_counter() - started) * 1000, error))
+
+
+class SignalScanner:
+    def __init__(self, analyzer=None, candle_store=None, symbols=None, timeframes=DEFAULT_TIMEFRAMES,
+                 workers=None, history=1000, enhance_workers=4):
+        self.analyzer = analyzer
+        self.candle_store = candle_store
+        self.symbols = list(symbols or (analyzer.symbols if analyzer else []))
+        self.timeframes = list(timeframes)
+        self.workers = workers or os.cpu_count() or 1
+        self.history = history
+
+        # (symbol, timeframe) -> {'shard', 'last_time', 'bias', ...}
+        self.keys = {}
+        self.listeners = []
+        self.recent = deque(maxlen=100)
+        self._lock = threading.Lock()
+        self._feed_lock = threading.RLock()
+
+        # Spawned children would re-import web.py as their main module
+        method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._context = multiprocessing.get_context(method)
+        self._inboxes = []
+        self._outbox = None
+        self._processes = []
+        self._collector = None
+        self._enhancer = ThreadPoolExecutor(max_workers=enhance_workers, thread_name_prefix='scanner-enhance')
+        self._running = False
+
+        self.started_at = None
+        self.scans = 0
+        self.fired = 0
+        self.errors = 0
+        self._scan_times = deque(maxlen=10000)
+        self._lags = deque(maxlen=1000)
+        self._publish_lags = deque(maxlen=1000)
+        self._compute = deque(maxlen=1000)
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    def add_listener(self, callback):
+        """Call callback(signal) for every newly fired signal"""
+        self.listeners.append(callback)
+
+    def start_workers(self):
+        """Fork the worker processes; can run early, before the analyzer exists"""
+        if self._processes:
+            return
+        self._outbox = self._context.Queue()
+        for _ in range(self.workers):
+            inbox = self._context.Queue()
+            process = self._context.Process(target=_scan_worker, args=(inbox, self._outbox), daemon=True)
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+
+    def start(self, warm=True):
+        """Start scanning (and the workers if needed); warm=True loads every key from the candle store"""
+        if self._running:
+            return
+        self.start_workers()
+        self._running = True
+        self.started_at = time.time()
+
+        self._collector = threading.Thread(target=self._collect, name='scanner-collector', daemon=True)
+        self._collector.start()
+
+        if self.candle_store:
+            self.candle_store.add_close_listener(self.on_candle_close)
+            if warm:
+                threading.Thread(target=self.warm_up, name='scanner-warmup', daemon=True).start()
+
+        logger.info(f"🔎 Signal scanner started: {len(self.symbols)} symbols x {len(self.timeframes)} timeframes "
+                    f"on {self.workers} processes")
+
+    def stop(self):
+        self._running = False
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+        if self._outbox:
+            self._outbox.put(None)
+        self._enhancer.shutdown(wait=False)
+        self._inboxes, self._processes = [], []
+
+    # ========================================================================
+    # FEEDING CANDLES
+    # ========================================================================
+
+    def _key_state(self, key):
+        with self._lock:
+            if key not in self.keys:
+                self.keys[key] = {
+                    'shard': len(self.keys) % self.workers,
+                    'last_time': None,
+                    'bias': None,
+                    'loaded': False,
+                    'signal': None
+                }
+            return self.keys[key]
+
+    def load(self, symbol, timeframe, times, ohlc):
+        """Build the state for a key from closed-candle history (times in ms)"""
+        times = np.asarray(times, dtype=np.int64)[-self.history:]
+        if not len(times):
+            return
+        with self._feed_lock:
+            state = self._key_state((symbol, timeframe))
+            state['last_time'] = int(times[-1])
+            state['loaded'] = True
+            self._submit('load', (symbol, timeframe), times, np.asarray(ohlc, dtype=np.float64)[-self.history:])
+
+    def push(self, symbol, timeframe, times, ohlc):
+        """Feed newly closed candles; ones already seen are skipped"""
+        with self._feed_lock:
+            state = self._key_state((symbol, timeframe))
+            if not state['loaded']:
+                return self.load(symbol, timeframe, times, ohlc)
+
+            times = np.asarray(times, dtype=np.int64)
+            fresh = times > state['last_time']
+            if not fresh.any():
+                return
+            state['last_time'] = int(times[fresh][-1])
+            self._submit('candles', (symbol, timeframe), times[fresh], np.asarray(ohlc, dtype=np.float64)[fresh])
+
+    def _submit(self, kind, key, times, ohlc):
+        shard = self._key_state(key)['shard']
+        self._inboxes[shard].put((kind, key, times, ohlc, time.time()))
+
+    def warm_up(self):
+        """Load every symbol x timeframe from the candle store"""
+        # Subscribe everything first so the history requests overlap
+        for symbol in self.symbols:
+            for timeframe in self.timeframes:
+                self.candle_store.ensure(symbol, timeframe)
+
+        for symbol in self.symbols:
+            for timeframe in self.timeframes:
+                if not self._running:
+                    return
+                try:
+                    self.catch_up(symbol, timeframe)
+                except Exception as e:
+                    logger.error(f"❌ Scanner warm-up failed for {symbol} {timeframe}s: {e}")
+
+    def catch_up(self, symbol, timeframe):
+        """Send every closed candle the store has that the worker hasn't seen"""
+        epochs, ohlc = self.candle_store.arrays(symbol, timeframe)
+
+        # The newest candle is still forming
+        if len(epochs) < 2:
+            return
+        self.push(symbol, timeframe, epochs[:-1] * 1000, ohlc[:-1])
+
+    def on_candle_close(self, symbol, granularity, candle):
+        """CandleStore close listener"""
+        if symbol in self.symbols and granularity in self.timeframes:
+            self.catch_up(symbol, granularity)
+
+    # ========================================================================
+    # RESULTS
+    # ========================================================================
+
+    def _collect(self):
+        while True:
+            try:
+                result = self._outbox.get(timeout=1)
+            except queue.Empty:
+                if not self._running:
+                    break
+                continue
+            if result is None:
+                break
+
+            kind, key, signal, candle_time, submitted, compute_ms, error = result
+            now = time.time()
+            with self._lock:
+                self.scans += 1
+                self._scan_times.append(now)
+                if kind == 'candles':
+                    # Close notification -> technical result; warm-up replays don't count
+                    self._lags.append((now - submitted) * 1000)
+                    self._compute.append(compute_ms)
+                if error:
+                    self.errors += 1
+
+            if error:
+                logger.error(f"❌ Scanner error for {key[0]} {key[1]}s: {error}")
+                continue
+
+            state = self.keys[key]
+            bias = signal['bias'] if signal else None
+            fired = bias is not None and bias != state['bias']
+            state['bias'] = bias
+            if fired:
+                signal['candle_time'] = candle_time
+                self._enhancer.submit(self._publish, key, signal, submitted)
+
+    def _publish(self, key, signal, submitted):
+        """Enhance a fired signal with fundamentals and hand it to listeners"""
+        try:
+            if self.analyzer:
+                signal = self.analyzer.enhance_signal_with_fundamentals(signal) or signal
+            signal['scanner_lag_ms'] = round((time.time() - submitted) * 1000, 1)
+
+            with self._lock:
+                self.fired += 1
+                self._publish_lags.append(signal['scanner_lag_ms'])
+                self.keys[key]['signal'] = signal
+                self.recent.appendleft(signal)
+
+            logger.info(f"🔔 {signal['symbol']} {signal['timeframe']} {signal['bias']} signal ({signal['confidence']}%)")
+            for callback in self.listeners:
+                try:
+                    callback(signal)
+                except Exception as e:
+                    logger.error(f"❌ Scanner listener error: {e}")
+        except Exception as e:
+            logger.error(f"❌ Error publishing scanner signal: {e}")
+
+    # ========================================================================
+    # METRICS
+    # ========================================================================
+
+    @staticmethod
+    def _percentiles(values):
+        values = sorted(values)
+        if not values:
+            return {'p50': None, 'p95': None, 'max': None}
+        return {
+            'p50': round(values[len(values) // 2], 1),
+            'p95': round(values[int(len(values) * 0.95)], 1),
+            'max': round(values[-1], 1)
+        }
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            window = [t for t in self._scan_times if now - t <= 60]
+            compute = list(self._compute)
+            return {
+                'running': self._running,
+                'workers': self.workers,
+                'keys': len(self.keys),
+                'scans': self.scans,
+                'fired': self.fired,
+                'errors': self.errors,
+                'scans_per_sec': round(len(window) / 60, 2),
+                'lag_ms': self._percentiles(self._lags),
+                'publish_lag_ms': self._percentiles(self._publish_lags),
+                'avg_compute_ms': round(sum(compute) / len(compute), 2) if compute else None,
+                'uptime': round(now - self.started_at, 1) if self.started_at else 0
+            }
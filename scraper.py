@@ -5,19 +5,139 @@ Supports: Gold, Silver, and Major/Minor Forex Pairs
 Collects real-time data from multiple sources to predict movements
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
+import os
 import time
-from datetime import datetime
-import firebase_admin
-from firebase_admin import credentials, db
-import schedule
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import threading
+from aggregator import QuoteAggregator, build_sources, parse_cnbc
+from extractors import sentiment_from_text
+from factors import GOLD_NODES, FactorSnapshot, gold_prediction, news_sentiment
+from http_client import HttpClient, parse_host_timeouts
+from logs import get_logger, sampled, setup_logging
+from metrics import timed
+from quote_cache import QuoteCache
+from signal_store import push_id
+from strength import solve_currency_strength, strength_to_value
 
-class MultiCurrencyAnalyzer:
+logger = get_logger(__name__)
+
+# Shared across analyzer instances so every endpoint reads the same quotes
+quote_cache = QuoteCache(
+    ttl=float(os.getenv('QUOTE_CACHE_TTL', 30)),
+    max_entries=int(os.getenv('QUOTE_CACHE_SIZE', 64))
+)
+
+# Keep-alive connection pools per upstream host, shared by all scrapers,
+# with a per-host rate limit and circuit breaker (HTTP_RATE_LIMIT=0 or
+# BREAKER_FAILURES=0 turns them off)
+http_client = HttpClient(
+    pool_size=int(os.getenv('HTTP_POOL_SIZE', 10)),
+    retries=int(os.getenv('HTTP_RETRIES', 2)),
+    backoff=float(os.getenv('HTTP_BACKOFF', 0.3)),
+    timeout=float(os.getenv('HTTP_TIMEOUT', 10)),
+    host_timeouts=parse_host_timeouts(os.getenv('HTTP_HOST_TIMEOUTS')),
+    rate=float(os.getenv('HTTP_RATE_LIMIT', 5)) or None,
+    burst=float(os.getenv('HTTP_RATE_BURST', 10)),
+    host_rates=parse_host_timeouts(os.getenv('HTTP_HOST_RATE_LIMITS')),
+    max_wait=float(os.getenv('HTTP_RATE_MAX_WAIT', 2)),
+    failure_threshold=int(os.getenv('BREAKER_FAILURES', 5)) or None,
+    reset_timeout=float(os.getenv('BREAKER_RESET', 30))
+)
+
+# Quote sources asked per symbol (hedged, or all at once with QUOTE_CONSENSUS=1)
+QUOTE_SOURCES = os.getenv('QUOTE_SOURCES', 'investing').split(',')
+
+def quote_fields(quote):
+    """price/change/source fields shared by every snapshot built from a quote"""
+    price = quote['price']
+    change = quote['change']
+    fields = {
+        'price': price,
+        # None when the source publishes no change; strength solving skips the pair
+        'change': change,
+        'change_percent': (change / price) * 100 if change is not None else None,
+        'source': quote.get('source', 'investing.com')
+    }
+    if 'sources' in quote:
+        fields['sources'] = quote['sources']
+        fields['spread'] = quote['spread']
+    return fields
+
+class AnalysisContext:
+    """
+    Memoizes fetched pages and derived currency strengths for one logical
+    request or batch, so the same page is never fetched twice in it
+    """
+    
     def __init__(self):
-        # Initialize Firebase
-        self.firebase_url = 'https://mzanzifx-default-rtdb.firebaseio.com'
+        self.pages = {}
+        self.strengths = {}
+        self.snapshot = None
+
+
+def signals_start_key(days):
+    """
+    First push id key of the last days (None = all). Push ids start with
+    their creation time, so a date range is a key range query instead of a
+    download of the whole tree.
+    """
+    if days is None:
+        return None
+    return push_id(int((time.time() - float(days) * 86400) * 1000))[:8]
+
+def fetch_firebase_signals(ref, days=None):
+    """{id: signal} under /signals, newest days only"""
+    query = ref.child('signals').order_by_key()
+    start = signals_start_key(days)
+    if start is not None:
+        query = query.start_at(start)
+    return query.get() or {}
+
+
+class FirebaseClient:
+    """
+    Lazily initialized Firebase access for the analyzers. firebase_admin
+    (and the google-auth stack behind it) is imported and the app created
+    on first use of ref, so constructing an analyzer stays cheap.
+    
+    Without the Admin SDK (not installed, or no service account) reads and
+    writes go to the database's public REST endpoint, which is where the
+    terminal has always saved signals from the browser.
+    """
+    
+    firebase_url = 'https://mzanzifx-default-rtdb.firebaseio.com'
+    
+    def __init__(self, use_firebase=True):
+        self.use_firebase = use_firebase
+        self.firebase_init_ms = None
+        self._firebase_admin_failed = False
+        self._ref = None
+        self._firebase_token = None
+        self._firebase_lock = threading.Lock()
+    
+    @property
+    def ref(self):
+        """Firebase root ref, created on first use; None when disabled or unavailable"""
+        if self._ref is None and self.use_firebase and not self._firebase_admin_failed:
+            with self._firebase_lock:
+                if self._ref is None and self.use_firebase and not self._firebase_admin_failed:
+                    started = time.perf_counter()
+                    try:
+                        self._ref = self.init_firebase()
+                    except Exception as e:
+                        logger.warning(f"⚠️ Firebase Admin SDK unavailable, using the REST endpoint: {e}")
+                        self._firebase_admin_failed = True
+                    self.firebase_init_ms = round((time.perf_counter() - started) * 1000, 1)
+        return self._ref
+    
+    def init_firebase(self):
+        """Initialize the Firebase app (once per process) and return the root ref"""
+        import firebase_admin
+        from firebase_admin import credentials, db
+        
         try:
             firebase_admin.get_app()
         except ValueError:
@@ -36,7 +156,76 @@ class MultiCurrencyAnalyzer:
                 'databaseURL': self.firebase_url
             })
         
-        self.ref = db.reference('/')
+        return db.reference('/')
+    
+    def firebase_auth_params(self):
+        """OAuth access_token query param for Realtime Database REST calls (none without the Admin SDK)"""
+        if self._ref is None:
+            return {}
+        
+        import firebase_admin
+        
+        token = self._firebase_token
+        if token is None or token.expiry <= datetime.utcnow() + timedelta(minutes=1):
+            token = self._firebase_token = firebase_admin.get_app().credential.get_access_token()
+        return {'access_token': token.access_token}
+    
+    def firebase_rest(self, method, path, value=None, params=None):
+        """Realtime Database REST call on path; returns the decoded response"""
+        response = self.http.request(
+            method, f'{self.firebase_url}/{path.strip("/")}.json',
+            params={**self.firebase_auth_params(), **(params or {})},
+            data=None if value is None else json.dumps(value, default=str)
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def firebase_reachable(self):
+        """Admin SDK connected, or a shallow REST read of /signals succeeds"""
+        if not self.use_firebase:
+            return False
+        if self.ref:
+            return True
+        try:
+            self.firebase_rest('GET', 'signals', params={'shallow': 'true'})
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Firebase unreachable: {e}")
+            return False
+    
+    def firebase_write(self, path, value):
+        """Set path (value None deletes it): write-behind queue, else Admin SDK, else REST"""
+        if not self.use_firebase:
+            return False
+        writer = getattr(self, 'writer', None)
+        if writer:
+            return writer.put(path, value)
+        
+        try:
+            if self.ref:
+                ref = self.ref.child(path)
+                ref.delete() if value is None else ref.set(value)
+            else:
+                self.firebase_rest('DELETE' if value is None else 'PUT', path, value)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error writing {path} to Firebase: {e}")
+            return False
+    
+    def fetch_signals(self, days=None):
+        """{id: signal} from the last days (None = all), through the Admin SDK or REST"""
+        if self.ref:
+            return fetch_firebase_signals(self.ref, days)
+        
+        start = signals_start_key(days)
+        params = {'orderBy': '"$key"', 'startAt': json.dumps(start)} if start else None
+        return self.firebase_rest('GET', 'signals', params=params) or {}
+
+
+class MultiCurrencyAnalyzer(FirebaseClient):
+    def __init__(self, cache=None, http=None, use_firebase=True):
+        # Firebase is connected on first use of self.ref
+        super().__init__(use_firebase)
         
         # Symbol configurations
         self.symbols = {
@@ -54,14 +243,16 @@ class MultiCurrencyAnalyzer:
             'GBPJPY': {'name': 'GBP/JPY', 'url': 'https://www.investing.com/currencies/gbp-jpy'}
         }
         
-        # Currency factors (for major currencies)
+        # Currency factors (G8 currencies)
         self.currency_factors = {
-            'USD': {'weight': 0.35, 'value': 0, 'data': {}},
+            'USD': {'weight': 0.30, 'value': 0, 'data': {}},
             'EUR': {'weight': 0.20, 'value': 0, 'data': {}},
-            'GBP': {'weight': 0.15, 'value': 0, 'data': {}},
-            'JPY': {'weight': 0.15, 'value': 0, 'data': {}},
-            'AUD': {'weight': 0.08, 'value': 0, 'data': {}},
-            'CAD': {'weight': 0.07, 'value': 0, 'data': {}}
+            'GBP': {'weight': 0.13, 'value': 0, 'data': {}},
+            'JPY': {'weight': 0.13, 'value': 0, 'data': {}},
+            'AUD': {'weight': 0.07, 'value': 0, 'data': {}},
+            'CAD': {'weight': 0.07, 'value': 0, 'data': {}},
+            'CHF': {'weight': 0.05, 'value': 0, 'data': {}},
+            'NZD': {'weight': 0.05, 'value': 0, 'data': {}}
         }
         
         # Economic factors
@@ -76,202 +267,499 @@ class MultiCurrencyAnalyzer:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        
+        self.dxy_url = 'https://www.investing.com/currencies/us-dollar-index'
+        self.yields_url = 'https://www.cnbc.com/quotes/US10Y'
+        self.news_url = 'https://www.cnbc.com/quotes/GC.1'
+        
+        self.quote_cache = cache if cache is not None else quote_cache
+        self.http = http if http is not None else http_client
+        
+        # Quotes come from whichever configured source answers first;
+        # page_url is read per request so rewritten symbol URLs apply
+        self.aggregator = QuoteAggregator(
+            build_sources(QUOTE_SOURCES, self.page_url), self.http, headers=self.headers,
+            budget=float(os.getenv('QUOTE_BUDGET_MS', 2000)) / 1000,
+            hedge_delay=float(os.getenv('QUOTE_HEDGE_MS', 300)) / 1000,
+            consensus=os.getenv('QUOTE_CONSENSUS', '0') == '1'
+        )
+        
+        # Set by the background refresher: serve the latest snapshot even if
+        # past its TTL instead of blocking the request on the network
+        self.prefer_snapshot = False
+        
+        # Set by web.py: FirebaseWriter that batches signal writes off the caller's thread
+        self.writer = None
+        
+        # Bounded pool for fetching independent pages in parallel
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('ANALYZER_WORKERS', 8)),
+            thread_name_prefix='analyzer'
+        )
+    
+    def scrape_symbol_data(self, symbol, context=None):
+        """Get data for specific symbol, served from the quote cache when fresh"""
+        if symbol not in self.symbols:
+            logger.warning(f"⚠️ Symbol {symbol} not configured")
+            return None
+        
+        return self.load_page(symbol, context)
+    
+    def load_page(self, key, context=None):
+        """Get a page through the quote cache, memoized in the analysis context"""
+        if context is not None and key in context.pages:
+            return context.pages[key]
+        
+        data = self.quote_cache.get(key, self.node_fetcher(key), allow_stale=self.prefer_snapshot)
+        
+        # Upstream failing or its circuit open: the last good snapshot, marked stale
+        if data is None or (self.prefer_snapshot and self.circuit_open(key)):
+            data = self.stale_snapshot(key)
+        
+        # Failures are memoized too, so one analysis never retries a page
+        if context is not None:
+            context.pages[key] = data
+        return data
+    
+    def node_fetcher(self, key):
+        """Fetch function of a data node (cache key)"""
+        if key == 'DXY':
+            return self.fetch_dxy_data
+        if key == 'US10Y':
+            return self.fetch_yields_data
+        if key == 'NEWS':
+            return self.fetch_news_data
+        return lambda: self.fetch_symbol_data(key)
     
-    def scrape_symbol_data(self, symbol):
-        """Scrape data for specific symbol from Investing.com"""
+    def data_nodes(self):
+        """{key: fetch} for every data node, as kept warm by the refresher"""
+        return {key: self.node_fetcher(key) for key in [*self.symbols, 'DXY', 'US10Y', 'NEWS']}
+    
+    def circuit_open(self, key):
+        """True while no upstream of key can be asked (for quotes: every source's breaker is open)"""
+        if key == 'DXY' or key in self.symbols:
+            return self.aggregator.unavailable(key)
+        return self.http.circuit_open(self.page_url(key))
+    
+    def page_url(self, key):
+        """Upstream URL of a cache key"""
+        urls = {'DXY': self.dxy_url, 'US10Y': self.yields_url, 'NEWS': self.news_url}
+        return urls[key] if key in urls else self.symbols[key]['url']
+    
+    def stale_snapshot(self, key):
+        """Last cached value for key whatever its age, marked stale (None if never fetched)"""
+        data, age = self.quote_cache.peek(key)
+        if data is None:
+            return None
+        return {**data, 'stale': True, 'stale_age': round(age, 1)}
+    
+    def fetch_symbol_data(self, symbol):
+        """Get a quote for specific symbol from the fastest healthy source"""
         try:
-            if symbol not in self.symbols:
-                print(f"⚠️ Symbol {symbol} not configured")
+            quote = self.aggregator.quote(symbol)
+            if quote is None:
+                logger.warning(f"⚠️ No source answered for {symbol}")
+            return self.symbol_quote(symbol, quote)
+        except Exception as e:
+            logger.error(f"❌ Error scraping {symbol}: {e}")
+            return None
+    
+    def symbol_quote(self, symbol, quote):
+        """Symbol data from a parsed quote (None passes through)"""
+        if not quote:
+            return None
+        return {
+            'symbol': symbol,
+            'name': self.symbols[symbol]['name'],
+            **quote_fields(quote),
+            'sentiment': sentiment_from_text(quote['sentiment_text']),
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def scrape_dxy_data(self, context=None):
+        """Get US Dollar Index data, served from the quote cache when fresh"""
+        return self.load_page('DXY', context)
+    
+    def fetch_dxy_data(self):
+        """Get US Dollar Index (DXY) from the fastest healthy source"""
+        try:
+            quote = self.aggregator.quote('DXY')
+            if quote is None:
+                logger.warning("⚠️ No source answered for DXY")
+            return self.dxy_quote(quote)
+        except Exception as e:
+            logger.error(f"❌ Error scraping DXY: {e}")
+            return None
+    
+    def dxy_quote(self, quote):
+        """DXY data from a parsed quote (None passes through)"""
+        if not quote:
+            return None
+        return {
+            'symbol': 'DXY',
+            'name': 'US Dollar Index',
+            **quote_fields(quote),
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def scrape_yields_data(self, context=None):
+        """Get 10-Year Treasury yield, served from the quote cache when fresh"""
+        return self.load_page('US10Y', context)
+    
+    def fetch_yields_data(self):
+        """Scrape the 10-Year Treasury yield from CNBC"""
+        try:
+            with timed('fetch', 'US10Y'):
+                response = self.http.get(self.yields_url, headers=self.headers)
+            with timed('parse', 'US10Y') as stage:
+                quote = parse_cnbc(response.content)
+                if not quote:
+                    stage.fail()
+            if not quote:
                 return None
             
-            url = self.symbols[symbol]['url']
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract price
-            price_elem = soup.find('span', {'data-test': 'instrument-price-last'})
-            if price_elem:
-                price = float(price_elem.text.replace(',', ''))
-                
-                # Extract change
-                change_elem = soup.find('span', {'data-test': 'instrument-price-change'})
-                change = float(change_elem.text.replace(',', '')) if change_elem else 0
-                
-                # Extract sentiment
-                sentiment_elem = soup.find('div', class_='sentiment')
-                sentiment = self.parse_sentiment(sentiment_elem) if sentiment_elem else 'neutral'
-                
-                return {
-                    'symbol': symbol,
-                    'name': self.symbols[symbol]['name'],
-                    'price': price,
-                    'change': change,
-                    'change_percent': (change / price) * 100,
-                    'sentiment': sentiment,
-                    'source': 'investing.com',
-                    'timestamp': datetime.now().isoformat()
-                }
+            return {
+                'symbol': 'US10Y',
+                'name': 'US 10Y Treasury Yield',
+                'price': quote['price'],
+                'source': 'cnbc.com',
+                'timestamp': datetime.now().isoformat()
+            }
         except Exception as e:
-            print(f"❌ Error scraping {symbol}: {e}")
+            logger.error(f"❌ Error getting Treasury yields: {e}")
             return None
     
-    def get_currency_strength(self, currency):
-        """Get strength of individual currency"""
+    def scrape_news_data(self, context=None):
+        """Get Gold news headlines and their sentiment, served from the quote cache when fresh"""
+        return self.load_page('NEWS', context)
+    
+    def fetch_news_data(self):
+        """Scrape Gold headlines from CNBC"""
         try:
-            # DXY for USD
-            if currency == 'USD':
-                url = 'https://www.investing.com/currencies/us-dollar-index'
-                response = requests.get(url, headers=self.headers, timeout=10)
+            with timed('fetch', 'NEWS'):
+                response = self.http.get(self.news_url, headers=self.headers)
+            with timed('parse', 'NEWS') as stage:
                 soup = BeautifulSoup(response.content, 'html.parser')
-                
-                price_elem = soup.find('span', {'data-test': 'instrument-price-last'})
-                if price_elem:
-                    dxy = float(price_elem.text.replace(',', ''))
-                    
-                    if dxy > 105:
-                        self.currency_factors['USD']['value'] = 1  # Strong
-                    elif dxy < 95:
-                        self.currency_factors['USD']['value'] = -1  # Weak
-                    else:
-                        self.currency_factors['USD']['value'] = 0  # Neutral
-                    
-                    self.currency_factors['USD']['data']['dxy'] = dxy
-                    return dxy
-            
-            # For other currencies, use EUR/USD, GBP/USD etc as proxy
-            if currency == 'EUR':
-                symbol_data = self.scrape_symbol_data('EURUSD')
-                if symbol_data:
-                    change_pct = symbol_data['change_percent']
-                    if change_pct > 0.5:
-                        self.currency_factors['EUR']['value'] = 1
-                    elif change_pct < -0.5:
-                        self.currency_factors['EUR']['value'] = -1
-                    else:
-                        self.currency_factors['EUR']['value'] = 0
-                    
-                    self.currency_factors['EUR']['data'] = symbol_data
-                    return symbol_data['price']
+                price_elem = soup.find('span', class_='QuoteStrip-lastPrice')
+                if not price_elem:
+                    stage.fail()
+                    return None
+                headlines = [item.text.strip() for item in soup.find_all('div', class_='Card-title')]
             
+            return {
+                'symbol': 'NEWS',
+                'name': 'Gold News',
+                'price': float(price_elem.text.replace(',', '').replace('$', '')),
+                'headlines': headlines[:5],
+                'news_sentiment': news_sentiment(headlines),
+                'source': 'cnbc.com',
+                'timestamp': datetime.now().isoformat()
+            }
         except Exception as e:
-            print(f"❌ Error getting {currency} strength: {e}")
+            logger.error(f"❌ Error scraping CNBC news: {e}")
             return None
     
-    def analyze_pair(self, pair):
+    def factor_snapshot(self, context=None):
+        """
+        Every data node loaded once, currency strengths solved and Gold
+        factors derived from the same pages; memoized in the context
+        """
+        if context is None:
+            context = AnalysisContext()
+        if context.snapshot is None:
+            pages = self.prefetch(self.snapshot_pages(), context)
+            self.get_currency_strength('USD', context)
+            context.snapshot = self.build_snapshot(pages, context)
+        return context.snapshot
+    
+    def build_snapshot(self, pages, context):
+        """FactorSnapshot of loaded pages and the strengths solved from them"""
+        strengths = {code: context.strengths.get(code) for code in self.currency_factors}
+        return FactorSnapshot(pages, strengths, self.currency_values(strengths))
+    
+    def snapshot_pages(self):
+        """Cache keys a factor snapshot is built from"""
+        return self.strength_pages() | GOLD_NODES
+    
+    def get_currency_strength(self, currency, context=None):
+        """Get strength (in %) of individual currency"""
+        if currency not in self.currency_factors:
+            return None
+        
+        if context is not None and currency in context.strengths:
+            return context.strengths[currency]
+        
+        try:
+            # Every currency is solved together from all pairs plus DXY
+            pages = self.prefetch(self.strength_pages(), context)
+            strengths = self.update_currency_strengths(pages)
+        except Exception as e:
+            logger.error(f"❌ Error getting {currency} strength: {e}")
+            strengths = {}
+        
+        if context is not None:
+            for code in self.currency_factors:
+                context.strengths[code] = strengths.get(code)
+        return strengths.get(currency)
+    
+    def currency_values(self, strengths):
+        """{code: value in [-1, 1]} for the solved strengths (unsolved currencies left out)"""
+        return {
+            code: round(strength_to_value(strength), 3)
+            for code, strength in strengths.items() if strength is not None
+        }
+    
+    def strength_pages(self):
+        """Cache keys the strength matrix is solved from"""
+        pages = {'DXY'}
+        for symbol in self.symbols:
+            if symbol[:3] in self.currency_factors and symbol[3:6] in self.currency_factors:
+                pages.add(symbol)
+        return pages
+    
+    def update_currency_strengths(self, pages):
+        """Update currency_factors for every currency from one set of pages"""
+        changes = {
+            key: data['change_percent']
+            for key, data in pages.items()
+            if data and key in self.symbols and data['change_percent'] is not None
+        }
+        dxy_data = pages.get('DXY')
+        
+        # Solved for every currency at once, so not per symbol
+        with timed('strength', 'all'):
+            strengths = solve_currency_strength(
+                changes,
+                list(self.currency_factors),
+                dxy_change=dxy_data['change_percent'] if dxy_data else None
+            )
+        
+        for currency, strength in strengths.items():
+            factor = self.currency_factors[currency]
+            factor['value'] = round(strength_to_value(strength), 3)
+            factor['data'] = {
+                'strength': round(strength, 4),
+                'pairs': sorted(key for key in changes if currency in (key[:3], key[3:6])),
+                'timestamp': datetime.now().isoformat()
+            }
+        
+        if dxy_data:
+            self.currency_factors['USD']['data']['dxy'] = dxy_data['price']
+        
+        return strengths
+    
+    def analyze_pair(self, pair, context=None):
         """Analyze specific currency pair or commodity"""
-        print(f"🔍 Analyzing {pair}...")
+        logger.debug(f"🔍 Analyzing {pair}...", extra=sampled(symbol=pair))
+        
+        if context is None:
+            context = AnalysisContext()
         
         # Get symbol data
-        symbol_data = self.scrape_symbol_data(pair)
+        symbol_data = self.scrape_symbol_data(pair, context)
         
         if not symbol_data:
             return None
         
+        # Strengths and Gold factors from the data pass shared by every symbol
+        snapshot = self.factor_snapshot(context)
+        
+        with timed('bias', pair):
+            return self.build_prediction(pair, symbol_data, snapshot)
+    
+    def build_prediction(self, pair, symbol_data, snapshot):
+        """
+        Derive bias and confidence from symbol data and the analysis's
+        FactorSnapshot (unsolved currencies count as neutral)
+        """
         # Determine base and quote currencies
         base_curr = pair[:3]
         quote_curr = pair[3:6]
+        values = snapshot.currency_values
+        factors = None
         
-        # Get currency strengths
         if pair in ['XAUUSD', 'XAGUSD']:
-            # For commodities, focus on USD strength
-            usd_strength = self.get_currency_strength('USD')
+            # Weighted Gold factors (USD, yields, news); Silver follows the same drivers
+            gold = gold_prediction(snapshot.gold)
+            fundamental_bias = gold['bias']
+            confidence = gold['confidence']
+            factors = gold
+        
+        elif base_curr in self.currency_factors and quote_curr in self.currency_factors:
+            base_val = values.get(base_curr, 0)
+            quote_val = values.get(quote_curr, 0)
             
-            # Strong USD = bearish for Gold/Silver
-            # Weak USD = bullish for Gold/Silver
-            fundamental_bias = 'bearish' if self.currency_factors['USD']['value'] > 0 else 'bullish'
-            confidence = abs(self.currency_factors['USD']['value']) * 40 + 50
-        
-        else:
-            # For forex pairs, compare base vs quote
-            base_strength = self.get_currency_strength(base_curr)
-            quote_strength = self.get_currency_strength(quote_curr)
+            diff = base_val - quote_val
             
-            if base_curr in self.currency_factors and quote_curr in self.currency_factors:
-                base_val = self.currency_factors[base_curr]['value']
-                quote_val = self.currency_factors[quote_curr]['value']
-                
-                diff = base_val - quote_val
-                
-                if diff > 0.5:
-                    fundamental_bias = 'bullish'
-                    confidence = min(70 + abs(diff) * 15, 95)
-                elif diff < -0.5:
-                    fundamental_bias = 'bearish'
-                    confidence = min(70 + abs(diff) * 15, 95)
-                else:
-                    fundamental_bias = 'neutral'
-                    confidence = 50
+            if diff > 0.5:
+                fundamental_bias = 'bullish'
+                confidence = min(70 + abs(diff) * 15, 95)
+            elif diff < -0.5:
+                fundamental_bias = 'bearish'
+                confidence = min(70 + abs(diff) * 15, 95)
             else:
                 fundamental_bias = 'neutral'
                 confidence = 50
+        else:
+            fundamental_bias = 'neutral'
+            confidence = 50
         
         # Add sentiment from price action
         if symbol_data['sentiment'] == fundamental_bias:
             confidence = min(confidence + 10, 98)
         
+        change_percent = symbol_data['change_percent']
         prediction = {
             'symbol': pair,
             'name': symbol_data['name'],
             'fundamental_bias': fundamental_bias,
             'confidence': round(confidence, 2),
             'current_price': symbol_data['price'],
-            'change_percent': round(symbol_data['change_percent'], 2),
+            'change_percent': round(change_percent, 2) if change_percent is not None else None,
             'sentiment': symbol_data['sentiment'],
             'timestamp': datetime.now().isoformat()
         }
         
-        print(f"✅ {pair} Analysis:")
-        print(f"   Bias: {fundamental_bias}")
-        print(f"   Confidence: {confidence}%")
-        print(f"   Price: {symbol_data['price']}")
+        if factors:
+            prediction['fundamental_score'] = factors['score']
+            prediction['factors'] = factors['factors']
+        
+        if symbol_data.get('stale'):
+            prediction['stale'] = True
+            prediction['stale_age'] = symbol_data['stale_age']
+        
+        logger.info(f"✅ {pair} analysis: {fundamental_bias} ({round(confidence, 2)}%) @ {symbol_data['price']}",
+                    extra=sampled(symbol=pair, bias=fundamental_bias, confidence=round(confidence, 2),
+                                  price=symbol_data['price']))
         
         return prediction
     
-    def calculate_volatility_prediction(self, symbol, current_price):
-        """Predict volatility for any symbol"""
-        # Base volatility varies by asset class
-        if symbol in ['XAUUSD', 'XAGUSD']:
-            base_vol = 60  # Commodities more volatile
-        elif 'JPY' in symbol:
-            base_vol = 55  # JPY pairs volatile
-        elif symbol in ['EURUSD', 'GBPUSD', 'USDCHF']:
-            base_vol = 45  # Major pairs moderate
-        else:
-            base_vol = 50  # Minor pairs
+    def required_pages(self, pair):
+        """Cache keys analyze_pair needs for a symbol"""
+        return {pair} | self.snapshot_pages()
+    
+    def prefetch(self, keys, context=None):
+        """Fetch distinct pages concurrently into the quote cache"""
+        keys = list(keys)
+        pages = self.executor.map(lambda key: self.load_page(key, context), keys)
+        return dict(zip(keys, pages))
+    
+    def analyze_pairs(self, pairs, context=None):
+        """Analyze several symbols, fetching every distinct page once in parallel"""
+        batch = self.analyze_batch(pairs, context)
+        return {pair: result['data'] for pair, result in batch['results'].items()}
+    
+    def analyze_batch(self, pairs, context=None):
+        """
+        Analyze many symbols in one pass. Shared pages (DXY, strength pairs)
+        are fetched once; each symbol reports its own timing and error.
+        """
+        if context is None:
+            context = AnalysisContext()
+        
+        started = time.perf_counter()
+        
+        pages = set()
+        for pair in pairs:
+            if pair in self.symbols:
+                pages |= self.required_pages(pair)
+        
+        self.prefetch(pages, context)
+        
+        # Build the factor snapshot once before fanning out
+        if pages:
+            self.factor_snapshot(context)
         
-        # Adjust based on market conditions
-        volatility_score = base_vol
+        fetched = time.perf_counter()
         
-        # Check USD strength volatility
-        if 'USD' in symbol:
-            usd_val = self.currency_factors.get('USD', {}).get('value', 0)
-            if abs(usd_val) > 0.7:
-                volatility_score += 15
+        # Every page is now in the context, so this does no network I/O
+        results = dict(zip(pairs, self.executor.map(
+            lambda pair: self.analyze_batch_item(pair, context), pairs
+        )))
         
-        # Calculate expected range
-        volatility_percentage = volatility_score / 10
-        expected_range = current_price * (volatility_percentage / 100)
+        return {
+            'results': results,
+            'fetch_ms': round((fetched - started) * 1000, 2),
+            'total_ms': round((time.perf_counter() - started) * 1000, 2),
+            'pages_fetched': len(context.pages)
+        }
+    
+    def analyze_batch_item(self, pair, context):
+        """Analyze one symbol of a batch, capturing timing and errors"""
+        started = time.perf_counter()
+        data = None
+        
+        if pair not in self.symbols:
+            error = f'Symbol {pair} not configured'
+        else:
+            try:
+                data = self.analyze_pair(pair, context)
+                error = None if data else f'Could not analyze {pair}'
+            except Exception as e:
+                logger.error(f"❌ Error analyzing {pair}: {e}")
+                error = str(e)
         
         return {
-            'volatility_score': volatility_score,
-            'volatility_percentage': round(volatility_percentage, 2),
-            'expected_range': round(expected_range, 5),
-            'expected_high': round(current_price + expected_range, 5),
-            'expected_low': round(current_price - expected_range, 5)
+            'success': error is None,
+            'data': data,
+            'error': error,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
         }
     
-    def enhance_signal_with_fundamentals(self, technical_signal):
+    def calculate_volatility_prediction(self, symbol, current_price):
+        """Predict volatility for any symbol"""
+        with timed('volatility', symbol if symbol in self.symbols else 'other'):
+            # Base volatility varies by asset class
+            if symbol in ['XAUUSD', 'XAGUSD']:
+                base_vol = 60  # Commodities more volatile
+            elif 'JPY' in symbol:
+                base_vol = 55  # JPY pairs volatile
+            elif symbol in ['EURUSD', 'GBPUSD', 'USDCHF']:
+                base_vol = 45  # Major pairs moderate
+            else:
+                base_vol = 50  # Minor pairs
+        
+            # Adjust based on market conditions
+            volatility_score = base_vol
+        
+            # Check USD strength volatility
+            if 'USD' in symbol:
+                usd_val = self.currency_factors.get('USD', {}).get('value', 0)
+                if abs(usd_val) > 0.7:
+                    volatility_score += 15
+        
+            # Calculate expected range
+            volatility_percentage = volatility_score / 10
+            expected_range = current_price * (volatility_percentage / 100)
+        
+            return {
+                'volatility_score': volatility_score,
+                'volatility_percentage': round(volatility_percentage, 2),
+                'expected_range': round(expected_range, 5),
+                'expected_high': round(current_price + expected_range, 5),
+                'expected_low': round(current_price - expected_range, 5)
+            }
+    
+    def enhance_signal_with_fundamentals(self, technical_signal, context=None):
         """Enhance technical signal with fundamental analysis"""
         if not technical_signal:
             return None
         
         symbol = technical_signal.get('symbol', 'XAUUSD')
         
-        # Get fundamental prediction
-        fundamental = self.analyze_pair(symbol)
-        
-        if not fundamental:
-            return technical_signal
+        # Covers the analysis it triggers; unknown symbols share one label
+        with timed('enhance', symbol if symbol in self.symbols else 'other'):
+            # Get fundamental prediction
+            fundamental = self.analyze_pair(symbol, context)
+            
+            if not fundamental:
+                return technical_signal
+            
+            return self.combine_signal(technical_signal, fundamental)
+    
+    def combine_signal(self, technical_signal, fundamental):
+        """Blend a technical signal with a fundamental prediction"""
+        symbol = technical_signal.get('symbol', 'XAUUSD')
         
         # Calculate volatility
         current_price = float(technical_signal.get('entry', 0))
@@ -345,43 +833,42 @@ class MultiCurrencyAnalyzer:
         if not element:
             return 'neutral'
         
-        text = element.text.lower()
+        return sentiment_from_text(element.text)
+    
+    def save_signal_to_firebase(self, signal, signal_id=None):
+        """Save signal to Firebase (under signal_id when the local store assigned one)"""
+        # Push ids are made locally, so queued and REST writes agree on keys
+        signal_id = signal_id or push_id()
+        if not self.firebase_write(f'signals/{signal_id}', signal):
+            return None
         
-        if 'bullish' in text or 'buy' in text or 'strong buy' in text:
-            return 'bullish'
-        elif 'bearish' in text or 'sell' in text or 'strong sell' in text:
-            return 'bearish'
-        else:
-            return 'neutral'
+        logger.info(f"✅ Signal saved: {signal.get('symbol')} - {signal['bias']} @ {signal.get('entry')}",
+                    extra=sampled(signal_id=signal_id, symbol=signal.get('symbol')))
+        return signal_id
     
-    def save_signal_to_firebase(self, signal):
-        """Save signal to Firebase"""
+    def get_signals_from_firebase(self, days=7):
+        """Retrieve {id: signal} from the last days (None = all) from Firebase"""
         try:
-            signals_ref = self.ref.child('signals')
-            new_signal_ref = signals_ref.push()
-            new_signal_ref.set(signal)
-            
-            print(f"✅ Signal saved: {signal['symbol']} - {signal['bias']} @ {signal['entry']}")
-            return new_signal_ref.key
+            return self.fetch_signals(days)
         except Exception as e:
-            print(f"❌ Error saving to Firebase: {e}")
-            return None
+            logger.error(f"❌ Error retrieving signals: {e}")
+            return {}
     
     def run_full_analysis(self, symbol='XAUUSD'):
         """Run complete fundamental analysis for a symbol"""
-        print(f"🔍 Running fundamental analysis for {symbol}...")
+        logger.info(f"🔍 Running fundamental analysis for {symbol}...")
         
         # Analyze the symbol
         result = self.analyze_pair(symbol)
         
         if result:
-            print(f"\n✅ Analysis Complete for {symbol}:")
-            print(json.dumps(result, indent=2))
+            logger.info(f"✅ Analysis complete for {symbol}", extra={'symbol': symbol, 'result': result})
         
         return result
 
 # Main execution
 if __name__ == '__main__':
+    setup_logging()
     analyzer = MultiCurrencyAnalyzer()
     
     # Test with different symbols
@@ -391,401 +878,9 @@ if __name__ == '__main__':
         result = analyzer.run_full_analysis(symbol)
         print("\n" + "="*60 + "\n")
         time.sleep(2)  # Rate limiting
-
-    def __init__(self):
-        # Initialize Firebase
-        self.firebase_url = 'https://mzanzifx-default-rtdb.firebaseio.com'
-        try:
-            firebase_admin.get_app()
-        except ValueError:
-            cred = credentials.Certificate({
-                "type": "service_account",
-                "project_id": "mzanzifx",
-                "private_key_id": "your_private_key_id",
-                "private_key": "your_private_key",
-                "client_email": "your_client_email",
-                "client_id": "your_client_id",
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs"
-            })
-            firebase_admin.initialize_app(cred, {
-                'databaseURL': self.firebase_url
-            })
-        
-        self.ref = db.reference('/')
-        
-        # Data sources
-        self.sources = {
-            'investing': 'https://www.investing.com/commodities/gold',
-            'cnbc': 'https://www.cnbc.com/quotes/GC.1',
-            'marketwatch': 'https://www.marketwatch.com/investing/future/gc00',
-            'tradingeconomics': 'https://tradingeconomics.com/commodity/gold'
-        }
-        
-        # Major factors affecting Gold
-        self.factors = {
-            'USD': {'weight': 0.30, 'value': 0},  # US Dollar Index
-            'DXY': {'weight': 0.25, 'value': 0},  # Dollar Index
-            'YIELDS': {'weight': 0.20, 'value': 0},  # 10Y Treasury Yields
-            'INFLATION': {'weight': 0.15, 'value': 0},  # Inflation data
-            'GEOPOLITICAL': {'weight': 0.10, 'value': 0}  # Risk events
-        }
-        
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-    
-    def scrape_investing_com(self):
-        """Scrape Gold data from Investing.com"""
-        try:
-            url = self.sources['investing']
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract price
-            price_elem = soup.find('span', {'data-test': 'instrument-price-last'})
-            if price_elem:
-                price = float(price_elem.text.replace(',', ''))
-                
-                # Extract change
-                change_elem = soup.find('span', {'data-test': 'instrument-price-change'})
-                change = float(change_elem.text.replace(',', '')) if change_elem else 0
-                
-                # Extract sentiment indicators
-                sentiment_elem = soup.find('div', class_='sentiment')
-                sentiment = self.parse_sentiment(sentiment_elem) if sentiment_elem else 'neutral'
-                
-                return {
-                    'price': price,
-                    'change': change,
-                    'change_percent': (change / price) * 100,
-                    'sentiment': sentiment,
-                    'source': 'investing.com',
-                    'timestamp': datetime.now().isoformat()
-                }
-        except Exception as e:
-            print(f"❌ Error scraping Investing.com: {e}")
-            return None
-    
-    def scrape_cnbc(self):
-        """Scrape Gold data from CNBC"""
-        try:
-            url = self.sources['cnbc']
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract key data points
-            price_elem = soup.find('span', class_='QuoteStrip-lastPrice')
-            if price_elem:
-                price = float(price_elem.text.replace(',', '').replace('$', ''))
-                
-                # News sentiment
-                news_items = soup.find_all('div', class_='Card-title')
-                news_sentiment = self.analyze_news_sentiment(news_items)
-                
-                return {
-                    'price': price,
-                    'news_sentiment': news_sentiment,
-                    'source': 'cnbc.com',
-                    'timestamp': datetime.now().isoformat()
-                }
-        except Exception as e:
-            print(f"❌ Error scraping CNBC: {e}")
-            return None
-    
-    def get_usd_strength(self):
-        """Get US Dollar Index (DXY) strength"""
-        try:
-            url = 'https://www.investing.com/currencies/us-dollar-index'
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            price_elem = soup.find('span', {'data-test': 'instrument-price-last'})
-            if price_elem:
-                dxy = float(price_elem.text.replace(',', ''))
-                
-                # Strong USD = bearish for Gold
-                # Weak USD = bullish for Gold
-                if dxy > 105:
-                    self.factors['USD']['value'] = -1  # Bearish
-                elif dxy < 95:
-                    self.factors['USD']['value'] = 1   # Bullish
-                else:
-                    self.factors['USD']['value'] = 0   # Neutral
-                
-                return dxy
-        except Exception as e:
-            print(f"❌ Error getting USD strength: {e}")
-            return None
-    
-    def get_treasury_yields(self):
-        """Get 10-Year Treasury Yields"""
-        try:
-            url = 'https://www.cnbc.com/quotes/US10Y'
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Higher yields = bearish for Gold
-            # Lower yields = bullish for Gold
-            price_elem = soup.find('span', class_='QuoteStrip-lastPrice')
-            if price_elem:
-                yields = float(price_elem.text.replace('%', ''))
-                
-                if yields > 4.5:
-                    self.factors['YIELDS']['value'] = -1
-                elif yields < 3.5:
-                    self.factors['YIELDS']['value'] = 1
-                else:
-                    self.factors['YIELDS']['value'] = 0
-                
-                return yields
-        except Exception as e:
-            print(f"❌ Error getting Treasury yields: {e}")
-            return None
-    
-    def parse_sentiment(self, element):
-        """Parse sentiment from HTML element"""
-        if not element:
-            return 'neutral'
-        
-        text = element.text.lower()
-        
-        if 'bullish' in text or 'buy' in text or 'strong buy' in text:
-            return 'bullish'
-        elif 'bearish' in text or 'sell' in text or 'strong sell' in text:
-            return 'bearish'
-        else:
-            return 'neutral'
-    
-    def analyze_news_sentiment(self, news_items):
-        """Analyze sentiment from news headlines"""
-        if not news_items:
-            return 'neutral'
-        
-        bullish_keywords = ['rise', 'up', 'gain', 'higher', 'rally', 'surge', 'climb', 'jump', 'boost']
-        bearish_keywords = ['fall', 'down', 'drop', 'lower', 'decline', 'plunge', 'slide', 'sink', 'tumble']
-        
-        bullish_count = 0
-        bearish_count = 0
-        
-        for item in news_items[:5]:  # Check top 5 headlines
-            text = item.text.lower()
-            
-            for keyword in bullish_keywords:
-                if keyword in text:
-                    bullish_count += 1
-            
-            for keyword in bearish_keywords:
-                if keyword in text:
-                    bearish_count += 1
-        
-        if bullish_count > bearish_count:
-            return 'bullish'
-        elif bearish_count > bullish_count:
-            return 'bearish'
-        else:
-            return 'neutral'
-    
-    def calculate_fundamental_score(self):
-        """Calculate overall fundamental score for Gold"""
-        score = 0
-        
-        for factor, data in self.factors.items():
-            score += data['value'] * data['weight']
-        
-        # Convert to 0-100 scale
-        normalized_score = ((score + 1) / 2) * 100
-        
-        return round(normalized_score, 2)
-    
-    def predict_movement(self):
-        """Predict Gold movement based on fundamental data"""
-        score = self.calculate_fundamental_score()
-        
-        if score > 65:
-            bias = 'bullish'
-            confidence = min(score, 95)
-        elif score < 35:
-            bias = 'bearish'
-            confidence = min(100 - score, 95)
-        else:
-            bias = 'neutral'
-            confidence = 50
-        
-        return {
-            'bias': bias,
-            'confidence': round(confidence, 2),
-            'score': score,
-            'factors': self.factors
-        }
-    
-    def calculate_volatility_prediction(self, current_price):
-        """Predict volatility based on market conditions"""
-        # Get recent volatility indicators
-        volatility_score = 50  # Base volatility
-        
-        # High USD strength increases volatility
-        if abs(self.factors['USD']['value']) > 0.5:
-            volatility_score += 15
-        
-        # High yields increase volatility
-        if abs(self.factors['YIELDS']['value']) > 0.5:
-            volatility_score += 10
-        
-        # Calculate expected price range
-        volatility_percentage = volatility_score / 10  # Convert to percentage
-        expected_range = current_price * (volatility_percentage / 100)
-        
-        return {
-            'volatility_score': volatility_score,
-            'volatility_percentage': round(volatility_percentage, 2),
-            'expected_range': round(expected_range, 2),
-            'expected_high': round(current_price + expected_range, 2),
-            'expected_low': round(current_price - expected_range, 2)
-        }
-    
-    def enhance_signal_with_fundamentals(self, technical_signal):
-        """Enhance technical signal with fundamental analysis"""
-        if not technical_signal:
-            return None
-        
-        # Get fundamental prediction
-        fundamental = self.predict_movement()
-        
-        # Calculate volatility
-        current_price = float(technical_signal.get('entry', 2650))
-        volatility = self.calculate_volatility_prediction(current_price)
-        
-        # Combine technical + fundamental confidence
-        technical_confidence = technical_signal.get('confidence', 50)
-        fundamental_confidence = fundamental['confidence']
-        
-        # If both agree, boost confidence
-        if technical_signal['bias'] == fundamental['bias']:
-            combined_confidence = min(
-                (technical_confidence * 0.6) + (fundamental_confidence * 0.4),
-                98
-            )
-            confluence = 'strong'
-        elif fundamental['bias'] == 'neutral':
-            combined_confidence = technical_confidence * 0.9
-            confluence = 'moderate'
-        else:
-            # Conflicting signals - reduce confidence
-            combined_confidence = technical_confidence * 0.7
-            confluence = 'weak'
-        
-        # Adjust TP/SL based on volatility
-        entry = float(technical_signal['entry'])
-        tp1 = float(technical_signal['tp1'])
-        tp2 = float(technical_signal['tp2'])
-        tp3 = float(technical_signal['tp3'])
-        sl = float(technical_signal['sl'])
-        
-        # Expand TP in high volatility
-        if volatility['volatility_score'] > 60:
-            tp1 = entry + (tp1 - entry) * 1.2
-            tp2 = entry + (tp2 - entry) * 1.3
-            tp3 = entry + (tp3 - entry) * 1.4
-        
-        enhanced_signal = {
-            **technical_signal,
-            'confidence': round(combined_confidence, 2),
-            'tp1': round(tp1, 2),
-            'tp2': round(tp2, 2),
-            'tp3': round(tp3, 2),
-            'fundamental_bias': fundamental['bias'],
-            'fundamental_score': fundamental['score'],
-            'confluence': confluence,
-            'volatility': volatility,
-            'factors': fundamental['factors'],
-            'enhanced': True,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        return enhanced_signal
-    
-    def save_signal_to_firebase(self, signal):
-        """Save signal to Firebase"""
-        try:
-            signals_ref = self.ref.child('signals')
-            
-            # Add signal
-            new_signal_ref = signals_ref.push()
-            new_signal_ref.set(signal)
-            
-            print(f"✅ Signal saved to Firebase: {signal['bias']} @ {signal['entry']}")
-            return new_signal_ref.key
-        except Exception as e:
-            print(f"❌ Error saving to Firebase: {e}")
-            return None
-    
-    def get_signals_from_firebase(self, days=7):
-        """Retrieve signals from Firebase"""
-        try:
-            signals_ref = self.ref.child('signals')
-            signals = signals_ref.get()
-            
-            if not signals:
-                return []
-            
-            # Convert to list and sort by timestamp
-            signal_list = []
-            for key, signal in signals.items():
-                signal['id'] = key
-                signal_list.append(signal)
-            
-            signal_list.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            
-            return signal_list
-        except Exception as e:
-            print(f"❌ Error retrieving signals: {e}")
-            return []
-    
-    def delete_signal_from_firebase(self, signal_id):
-        """Delete signal from Firebase"""
-        try:
-            signal_ref = self.ref.child(f'signals/{signal_id}')
-            signal_ref.delete()
-            print(f"✅ Signal {signal_id} deleted")
-            return True
-        except Exception as e:
-            print(f"❌ Error deleting signal: {e}")
-            return False
-    
-    def run_full_analysis(self):
-        """Run complete fundamental analysis"""
-        print("🔍 Running fundamental analysis...")
-        
-        # Scrape data from sources
-        investing_data = self.scrape_investing_com()
-        cnbc_data = self.scrape_cnbc()
-        
-        # Get USD and yields data
-        usd_strength = self.get_usd_strength()
-        treasury_yields = self.get_treasury_yields()
-        
-        # Get prediction
-        prediction = self.predict_movement()
-        
-        print(f"📊 Fundamental Analysis Complete:")
-        print(f"   Bias: {prediction['bias']}")
-        print(f"   Confidence: {prediction['confidence']}%")
-        print(f"   Score: {prediction['score']}/100")
-        
-        if investing_data:
-            print(f"   Current Price: ${investing_data['price']}")
-            print(f"   Change: {investing_data['change_percent']:.2f}%")
-        
-        return prediction
-
-# Main execution
-if __name__ == '__main__':
-    analyzer = GoldFundamentalAnalyzer()
     
-    # Run analysis
-    result = analyzer.run_full_analysis()
+    # Gold factors from the same data pass
+    result = analyzer.factor_snapshot().to_dict()
     
     print("\n✅ Analysis complete!")
     print(json.dumps(result, indent=2))
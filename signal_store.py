@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Signal Store
+Local SQLite copy of the signal history behind /api/signals. Filters and
+date ranges are pushed into indexed queries and results are paged with a
+(timestamp, id) cursor, so loading a page costs the same however many
+signals have been stored. It is an index, not the record: every signal is
+also saved to Firebase under the same push id, and an empty store (a new
+deploy's disk) is refilled from Firebase on startup.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Outside the app root, which the web server serves files from
+SIGNAL_DB = os.getenv('SIGNAL_DB', os.path.join(tempfile.gettempdir(), 'mzanzifx-signals.db'))
+
+PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+
+# Columns that can be filtered on; the full signal is kept as JSON
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    timeframe TEXT,
+    bias TEXT,
+    status TEXT NOT NULL DEFAULT 'active',
+    confidence REAL,
+    timestamp INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals (timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_signals_symbol ON signals (symbol, timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_signals_status ON signals (status, timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_signals_bias ON signals (bias, timestamp, id);
+"""
+
+
+def push_id(timestamp_ms=None):
+    """Firebase-style push id: 8 time characters + 12 random, sorts by creation time"""
+    now = int(time.time() * 1000) if timestamp_ms is None else int(timestamp_ms)
+    time_chars = ''
+    for _ in range(8):
+        time_chars = PUSH_CHARS[now % 64] + time_chars
+        now //= 64
+    return time_chars + ''.join(random.choice(PUSH_CHARS) for _ in range(12))
+
+
+def to_millis(value):
+    """Signal timestamp (ms number or ISO string) -> epoch milliseconds; ValueError if malformed"""
+    if value is None or value == '':
+        return int(time.time() * 1000)
+    if isinstance(value, str):
+        try:
+            return int(float(value))
+        except ValueError:
+            return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() * 1000)
+    value = float(value)
+    # Seconds rather than milliseconds
+    return int(value * 1000 if value < 10 ** 11 else value)
+
+
+class SignalStore:
+    def __init__(self, path=SIGNAL_DB):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        """One connection per thread; WAL lets readers run alongside the writer"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    # ========================================================================
+    # WRITES
+    # ========================================================================
+
+    def add(self, signal, signal_id=None):
+        """Store a signal; returns its id"""
+        return self.add_many({signal_id or push_id(to_millis(signal.get('timestamp'))): signal})[0]
+
+    def add_many(self, signals):
+        """Store {id: signal} in one transaction (replacing existing ids)"""
+        rows = []
+        for signal_id, signal in signals.items():
+            if not isinstance(signal, dict):
+                continue
+            signal = {**signal, 'status': signal.get('status') or 'active'}
+            try:
+                timestamp = to_millis(signal.get('timestamp'))
+            except (TypeError, ValueError):
+                # Unparseable timestamps (e.g. hand-edited Firebase data) are skipped
+                continue
+            try:
+                confidence = float(signal.get('confidence'))
+            except (TypeError, ValueError):
+                confidence = None
+            rows.append((
+                signal_id,
+                signal.get('symbol') or 'XAUUSD',
+                signal.get('timeframe'),
+                signal.get('bias'),
+                signal['status'],
+                confidence,
+                timestamp,
+                json.dumps(signal, default=str)
+            ))
+
+        connection = self._connection()
+        with self._write_lock, connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO signals (id, symbol, timeframe, bias, status, confidence, timestamp, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+        return [row[0] for row in rows]
+
+    def set_status(self, signal_id, status):
+        connection = self._connection()
+        with self._write_lock, connection:
+            row = connection.execute('SELECT data FROM signals WHERE id = ?', (signal_id,)).fetchone()
+            if not row:
+                return False
+            data = {**json.loads(row['data']), 'status': status}
+            connection.execute('UPDATE signals SET status = ?, data = ? WHERE id = ?',
+                               (status, json.dumps(data), signal_id))
+        return True
+
+    def delete(self, signal_id):
+        connection = self._connection()
+        with self._write_lock, connection:
+            return connection.execute('DELETE FROM signals WHERE id = ?', (signal_id,)).rowcount > 0
+
+    def clear(self):
+        connection = self._connection()
+        with self._write_lock, connection:
+            return connection.execute('DELETE FROM signals').rowcount
+
+    # ========================================================================
+    # QUERIES
+    # ========================================================================
+
+    @staticmethod
+    def _where(symbol=None, bias=None, status=None, timeframe=None, min_confidence=None, start=None, end=None):
+        clauses, params = [], []
+        for column, value in (('symbol', symbol), ('bias', bias), ('status', status), ('timeframe', timeframe)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if min_confidence is not None:
+            clauses.append('confidence >= ?')
+            params.append(float(min_confidence))
+        if start is not None:
+            clauses.append('timestamp >= ?')
+            params.append(int(start))
+        if end is not None:
+            clauses.append('timestamp < ?')
+            params.append(int(end))
+        return clauses, params
+
+    def query(self, limit=50, cursor=None, **filters):
+        """
+        Newest-first page of signals matching filters.
+
+        filters: symbol, bias, status, timeframe, min_confidence, start/end
+        (epoch ms). cursor is the next_cursor of the previous page.
+        Returns {'signals': [...], 'next_cursor': str or None}.
+        """
+        clauses, params = self._where(**filters)
+        if cursor:
+            timestamp, signal_id = cursor.split(':', 1)
+            clauses.append('(timestamp < ? OR (timestamp = ? AND id < ?))')
+            params += [int(timestamp), int(timestamp), signal_id]
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._connection().execute(
+            f'SELECT id, timestamp, data FROM signals {where} ORDER BY timestamp DESC, id DESC LIMIT ?',
+            params + [limit + 1]
+        ).fetchall()
+
+        signals = [{**json.loads(row['data']), 'id': row['id']} for row in rows[:limit]]
+        next_cursor = f"{rows[limit - 1]['timestamp']}:{rows[limit - 1]['id']}" if len(rows) > limit else None
+        return {'signals': signals, 'next_cursor': next_cursor}
+
+    def counts(self, **filters):
+        """Totals for the stats bar: total, active, closed, bullish, bearish"""
+        clauses, params = self._where(**filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        row = self._connection().execute(
+            f"SELECT COUNT(*) AS total, "
+            f"COALESCE(SUM(status = 'active'), 0) AS active, COALESCE(SUM(status = 'closed'), 0) AS closed, "
+            f"COALESCE(SUM(bias = 'bullish'), 0) AS bullish, COALESCE(SUM(bias = 'bearish'), 0) AS bearish "
+            f"FROM signals {where}", params
+        ).fetchone()
+        return dict(row)
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM signals').fetchone()[0]
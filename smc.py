@@ -0,0 +1,935 @@
+#!/usr/bin/env python3
+"""
+SMC Analysis Engine
+Server-side port of SMCAnalyzer from smc.js. The scans that grow with
+history length (swing points, order blocks, fair value gaps, ATR and
+average range) run as NumPy array operations over the whole OHLC history;
+the rules that only look at the last few dozen swings or candles are
+ported as-is.
+
+Results keep the smc.js object and signal field names so they can be
+drawn by the chart and stored next to browser-generated signals.
+"""
+
+import math
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+TIMEFRAME_LABELS = {
+    60: '1M',
+    300: '5M',
+    900: '15M',
+    1800: '30M',
+    3600: '1H',
+    14400: '4H',
+    86400: '1D'
+}
+
+
+def js_round(value):
+    """Math.round: halves round up, unlike Python's round()"""
+    return math.floor(value + 0.5)
+
+
+def candles_to_arrays(chart_data):
+    """[{x, o, h, l, c}, ...] -> (times in ms, (n, 4) OHLC array)"""
+    times = np.fromiter((candle['x'] for candle in chart_data), dtype=np.int64, count=len(chart_data))
+    ohlc = np.array([(candle['o'], candle['h'], candle['l'], candle['c']) for candle in chart_data],
+                    dtype=np.float64).reshape(-1, 4)
+    return times, ohlc
+
+
+# ============================================================================
+# VECTORIZED INDICATORS
+# ============================================================================
+
+def trailing_mean(values, period, first):
+    """
+    out[e] = mean(values[e - period:e]) for every e >= first.
+
+    Summed left to right one offset at a time, like the smc.js loops, so
+    results are bit-identical to the browser instead of pairwise-summed.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n <= first:
+        return out
+
+    total = np.zeros(n - first)
+    for k in range(period):
+        total += values[first - period + k:n - period + k]
+    out[first:] = total / period
+    return out
+
+
+def true_range(high, low, close):
+    tr = np.full(len(high), np.nan)
+    prev_close = close[:-1]
+    tr[1:] = np.maximum(np.maximum(high[1:] - low[1:], np.abs(high[1:] - prev_close)),
+                        np.abs(low[1:] - prev_close))
+    return tr
+
+
+def average_true_range(high, low, close, period=14):
+    """calculateATR for every end index (0.01 where history is too short)"""
+    atr = trailing_mean(true_range(high, low, close), period, period + 1)
+    atr[:period + 1] = 0.01
+    return atr
+
+
+def average_range(high, low, period=20):
+    """calculateAverageRange for every end index (0 where history is too short)"""
+    avg = trailing_mean(high - low, period, period)
+    avg[:period] = 0
+    return avg
+
+
+def swing_mask(values, lookback, highs=True):
+    """Candles strictly above (or below) the lookback candles on each side"""
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+    if n < 2 * lookback + 1:
+        return mask
+
+    windows = sliding_window_view(values, lookback)
+    if highs:
+        extreme = windows.max(axis=1)
+        centre = values[lookback:n - lookback]
+        mask[lookback:n - lookback] = (centre > extreme[:n - 2 * lookback]) & (centre > extreme[lookback + 1:])
+    else:
+        extreme = windows.min(axis=1)
+        centre = values[lookback:n - lookback]
+        mask[lookback:n - lookback] = (centre < extreme[:n - 2 * lookback]) & (centre < extreme[lookback + 1:])
+    return mask
+
+
+def dedupe_indices(candidates, existing, distance=3):
+    """Keep candidates (ascending) that aren't within distance of an accepted index"""
+    accepted = set(existing)
+    kept = []
+    for index in candidates.tolist():
+        if any(index + offset in accepted for offset in range(-distance + 1, distance)):
+            continue
+        accepted.add(index)
+        kept.append(index)
+    return kept
+
+
+class SMCAnalyzer:
+    def __init__(self):
+        self.smc_data = {
+            # Market Structure
+            'swing_points': [],
+            'bos': [],
+            'choch': [],
+            'market_structure': 'ranging',
+            'trend': 'neutral',
+
+            # Core Concepts
+            'order_blocks': [],
+            'breakers': [],
+            'fvgs': [],
+            'liquidity_zones': [],
+
+            # ICT Concepts
+            'optimal_trade_entry': [],
+            'premium_discount': None,
+            'kill_zones': [],
+
+            # Advanced Patterns
+            'liquidity_sweeps': [],
+            'smart_money_reversal': [],
+            'inducement_zones': [],
+
+            # Signals
+            'current_signal': None
+        }
+
+        self.settings = {
+            'swing_lookback': 7,
+            'ob_min_strength': 60,
+            'fvg_min_size': 0.4
+        }
+
+    # ========================================================================
+    # MAIN ANALYSIS FUNCTION
+    # ========================================================================
+
+    def analyze(self, chart_data, timeframe, symbol='XAUUSD'):
+        """Analyze candles in the chart format ([{x, o, h, l, c}, ...])"""
+        if not chart_data or len(chart_data) < 100:
+            return None
+        times, ohlc = candles_to_arrays(chart_data)
+        return self.analyze_arrays(times, ohlc, timeframe, symbol)
+
+    def analyze_arrays(self, times, ohlc, timeframe, symbol='XAUUSD'):
+        """
+        Analyze OHLC arrays and return a signal dict, or None.
+
+        times: candle open times in ms, ohlc: (n, 4) array of open/high/low/close
+        """
+        if len(times) < 100:
+            return None
+
+        self.times = np.asarray(times, dtype=np.int64)
+        self.count = len(self.times)
+        ohlc = np.asarray(ohlc, dtype=np.float64)
+        self.open, self.high, self.low, self.close = (np.ascontiguousarray(ohlc[:, k]) for k in range(4))
+        self.atr = average_true_range(self.high, self.low, self.close)
+
+        keep_duration = timeframe * 150 * 1000
+        self.clean_old_data(int(self.times[-1]), keep_duration)
+
+        self.identify_swing_points()
+        self.detect_market_structure()
+        self.calculate_premium_discount()
+        self.detect_order_blocks()
+        self.detect_breakers()
+        self.detect_fair_value_gaps()
+        self.detect_optimal_trade_entry()
+        self.detect_liquidity_zones()
+        self.detect_liquidity_sweeps()
+        self.detect_break_of_structure()
+        self.detect_change_of_character()
+        self.detect_smart_money_reversal()
+        self.detect_inducement_zones()
+        self.identify_kill_zones()
+        self.check_fvg_fills()
+
+        return self.generate_signal(timeframe, symbol)
+
+    # ========================================================================
+    # SWING POINTS
+    # ========================================================================
+
+    def identify_swing_points(self):
+        lookback = self.settings['swing_lookback']
+        high_index = np.flatnonzero(swing_mask(self.high, lookback, highs=True))
+        low_index = np.flatnonzero(swing_mask(self.low, lookback, highs=False))
+
+        # Every neighbour is strictly beaten, so strength is always the lookback
+        swings = [
+            {'index': i, 'type': 'high', 'price': self.high[i], 'time': int(self.times[i]), 'strength': lookback}
+            for i in high_index.tolist()
+        ] + [
+            {'index': i, 'type': 'low', 'price': self.low[i], 'time': int(self.times[i]), 'strength': lookback}
+            for i in low_index.tolist()
+        ]
+        swings.sort(key=lambda s: (s['index'], s['type'] == 'low'))
+        for swing in swings:
+            swing['price'] = float(swing['price'])
+
+        self.smc_data['swing_points'] = swings[-50:]
+
+    def swings_of(self, swing_type, count):
+        return [s for s in self.smc_data['swing_points'] if s['type'] == swing_type][-count:]
+
+    # ========================================================================
+    # MARKET STRUCTURE
+    # ========================================================================
+
+    def detect_market_structure(self):
+        swing_highs = self.swings_of('high', 8)
+        swing_lows = self.swings_of('low', 8)
+
+        if len(swing_highs) < 3 or len(swing_lows) < 3:
+            self.smc_data['market_structure'] = 'ranging'
+            self.smc_data['trend'] = 'neutral'
+            return
+
+        hh = sum(1 for a, b in zip(swing_highs, swing_highs[1:]) if b['price'] > a['price'])
+        hl = sum(1 for a, b in zip(swing_lows, swing_lows[1:]) if b['price'] > a['price'])
+        lh = len(swing_highs) - 1 - hh
+        ll = len(swing_lows) - 1 - hl
+
+        bullish_score = hh + hl
+        bearish_score = lh + ll
+
+        if bullish_score > bearish_score + 2:
+            self.smc_data['market_structure'] = 'uptrend'
+            self.smc_data['trend'] = 'strong_bull' if bullish_score > bearish_score + 4 else 'bull'
+        elif bearish_score > bullish_score + 2:
+            self.smc_data['market_structure'] = 'downtrend'
+            self.smc_data['trend'] = 'strong_bear' if bearish_score > bullish_score + 4 else 'bear'
+        else:
+            self.smc_data['market_structure'] = 'ranging'
+            self.smc_data['trend'] = 'neutral'
+
+    # ========================================================================
+    # PREMIUM/DISCOUNT ZONES
+    # ========================================================================
+
+    def calculate_premium_discount(self):
+        if len(self.smc_data['swing_points']) < 2:
+            return
+
+        prices = [s['price'] for s in self.smc_data['swing_points'][-10:]]
+        high = max(prices)
+        low = min(prices)
+        price_range = high - low
+        if price_range == 0:
+            return
+
+        current_price = float(self.close[-1])
+        premium_start = low + price_range * 0.618
+        discount_end = low + price_range * 0.382
+
+        self.smc_data['premium_discount'] = {
+            'high': high,
+            'low': low,
+            'equilibrium': low + price_range * 0.5,
+            'premium': premium_start,
+            'discount': discount_end,
+            'currentZone': 'premium' if current_price > premium_start else
+                           'discount' if current_price < discount_end else 'equilibrium'
+        }
+
+    # ========================================================================
+    # ORDER BLOCKS
+    # ========================================================================
+
+    def detect_order_blocks(self):
+        o, h, l, c = self.open, self.high, self.low, self.close
+        n = len(c)
+
+        # Candle i is the displacement move, i - 1 the order block candle
+        cur = slice(5, n - 1)
+        prev = slice(4, n - 2)
+        body = np.abs(o[prev] - c[prev])
+        meaningful = body > self.atr[cur] * 0.3
+
+        bullish = ((c[prev] < o[prev]) & (c[cur] > o[cur]) & ((c[cur] - o[cur]) > body * 2)
+                   & (c[cur] > h[prev]) & meaningful)
+        bearish = ((c[prev] > o[prev]) & (c[cur] < o[cur]) & ((o[cur] - c[cur]) > body * 2)
+                   & (c[cur] < l[prev]) & meaningful)
+
+        order_blocks = self.smc_data['order_blocks']
+        added = []
+        for ob_type, mask in (('bullish', bullish), ('bearish', bearish)):
+            existing = [ob['index'] for ob in order_blocks if ob['type'] == ob_type]
+            added.extend(self.make_order_block(ob_type, index, index)
+                         for index in dedupe_indices(np.flatnonzero(mask) + 4, existing))
+        added.sort(key=lambda ob: ob['index'])
+        order_blocks.extend(added)
+
+        self.check_order_block_mitigation(float(c[-1]))
+
+    def make_order_block(self, ob_type, pos, index):
+        """Order block for the candle at array position pos (history index index)"""
+        o, c = self.open[pos], self.close[pos]
+        top, bottom = (o, c) if ob_type == 'bullish' else (c, o)
+        return {
+            'type': ob_type,
+            'index': index,
+            'top': float(top),
+            'bottom': float(bottom),
+            'time': int(self.times[pos]),
+            'strength': self.calculate_order_block_strength(pos),
+            'mitigated': False,
+            'touches': 0
+        }
+
+    def check_order_block_mitigation(self, price):
+        order_blocks = self.smc_data['order_blocks']
+        for ob in order_blocks:
+            if not ob['mitigated'] and self.is_touching_zone(price, ob['bottom'], ob['top']):
+                ob['touches'] += 1
+                if ob['touches'] >= 3:
+                    ob['mitigated'] = True
+
+        self.smc_data['order_blocks'] = order_blocks[-20:]
+
+    def calculate_order_block_strength(self, pos):
+        candle_range = self.high[pos] - self.low[pos]
+        body = abs(self.close[pos] - self.open[pos])
+        if candle_range == 0:
+            return 0
+
+        volatility_ratio = candle_range / self.atr[pos]
+        strength = (body / candle_range) * 50 + min(volatility_ratio, 2) * 25
+        return min(100, js_round(strength))
+
+    # ========================================================================
+    # BREAKER BLOCKS
+    # ========================================================================
+
+    def detect_breakers(self):
+        breakers = self.smc_data['breakers']
+        for ob in self.smc_data['order_blocks']:
+            if ob['mitigated'] and ob['touches'] >= 2:
+                if not any(br['index'] == ob['index'] for br in breakers):
+                    breakers.append({
+                        'type': 'bearish' if ob['type'] == 'bullish' else 'bullish',
+                        'index': ob['index'],
+                        'top': ob['top'],
+                        'bottom': ob['bottom'],
+                        'time': ob['time'],
+                        'mitigated': False
+                    })
+
+        self.smc_data['breakers'] = breakers[-15:]
+
+    # ========================================================================
+    # FAIR VALUE GAPS
+    # ========================================================================
+
+    def detect_fair_value_gaps(self):
+        h, l = self.high, self.low
+        n = len(h)
+        avg_range = average_range(h, l, 20)[2:]
+        min_size = self.settings['fvg_min_size']
+
+        # Candle i against candle i - 2; the gap belongs to the middle candle
+        bullish_gap = l[2:] - h[:n - 2]
+        bearish_gap = l[:n - 2] - h[2:]
+        bullish = (bullish_gap > 0) & (bullish_gap > avg_range * min_size)
+        bearish = (bearish_gap > 0) & (bearish_gap > avg_range * min_size)
+
+        fvgs = self.smc_data['fvgs']
+        added = []
+        for fvg_type, mask, gap in (('bullish', bullish, bullish_gap), ('bearish', bearish, bearish_gap)):
+            existing = [fvg['index'] for fvg in fvgs if fvg['type'] == fvg_type]
+            added.extend(self.make_fvg(fvg_type, index, index, gap[index - 1] > avg_range[index - 1])
+                         for index in dedupe_indices(np.flatnonzero(mask) + 1, existing))
+        added.sort(key=lambda fvg: fvg['index'])
+        fvgs.extend(added)
+
+    def make_fvg(self, fvg_type, pos, index, high_quality):
+        """FVG around the middle candle at array position pos (history index index)"""
+        if fvg_type == 'bullish':
+            top, bottom = self.low[pos + 1], self.high[pos - 1]
+        else:
+            top, bottom = self.low[pos - 1], self.high[pos + 1]
+        return {
+            'type': fvg_type,
+            'index': index,
+            'top': float(top),
+            'bottom': float(bottom),
+            'time': int(self.times[pos]),
+            'filled': False,
+            'fillPercentage': 0,
+            'quality': 'high' if high_quality else 'medium'
+        }
+
+    # ========================================================================
+    # OPTIMAL TRADE ENTRY
+    # ========================================================================
+
+    def detect_optimal_trade_entry(self):
+        self.smc_data['optimal_trade_entry'] = [
+            {
+                'type': fvg['type'],
+                'price': fvg['bottom'] + (fvg['top'] - fvg['bottom']) * 0.5,
+                'low': fvg['bottom'] + (fvg['top'] - fvg['bottom']) * 0.382,
+                'high': fvg['bottom'] + (fvg['top'] - fvg['bottom']) * 0.618,
+                'index': fvg['index'],
+                'time': fvg['time']
+            }
+            for fvg in self.smc_data['fvgs']
+            if not fvg['filled'] and fvg['quality'] == 'high'
+        ]
+
+    # ========================================================================
+    # LIQUIDITY ZONES
+    # ========================================================================
+
+    def detect_liquidity_zones(self):
+        zones = []
+        for zone_type, swing_type, bias in (('equal_highs', 'high', 'bearish'), ('equal_lows', 'low', 'bullish')):
+            swings = self.swings_of(swing_type, 15)
+            if len(swings) < 2:
+                continue
+
+            # Every pair at once; nonzero walks the upper triangle in loop order
+            prices = np.array([s['price'] for s in swings])
+            diff = np.abs(prices[:, None] - prices[None, :])
+            avg = (prices[:, None] + prices[None, :]) / 2
+            equal = np.triu(diff / avg < 0.005, k=1)
+
+            for i, j in zip(*np.nonzero(equal)):
+                zones.append({
+                    'type': zone_type,
+                    'price': float(avg[i, j]),
+                    'indices': [swings[i]['index'], swings[j]['index']],
+                    'bias': bias,
+                    'swept': False,
+                    'strength': min(swings[i]['strength'], swings[j]['strength'])
+                })
+
+        self.smc_data['liquidity_zones'] = zones[-12:]
+
+    def detect_liquidity_sweeps(self, zones=None, window=50):
+        """Mark zones (default: all) swept by any of the last window candles"""
+        high, low, close = self.high[-window:], self.low[-window:], self.close[-window:]
+        sweeps = self.smc_data['liquidity_sweeps']
+
+        for zone in self.smc_data['liquidity_zones'] if zones is None else zones:
+            if zone['swept']:
+                continue
+
+            price = zone['price']
+            if zone['type'] == 'equal_highs':
+                swept = np.any((high > price * 1.001) & (close < price))
+            else:
+                swept = np.any((low < price * 0.999) & (close > price))
+
+            if swept:
+                zone['swept'] = True
+                sweeps.append({
+                    'type': zone['type'],
+                    'price': price,
+                    'time': int(time.time() * 1000),
+                    'bias': 'bullish' if zone['type'] == 'equal_highs' else 'bearish'
+                })
+
+        self.smc_data['liquidity_sweeps'] = sweeps[-10:]
+
+    # ========================================================================
+    # BREAK OF STRUCTURE / CHANGE OF CHARACTER
+    # ========================================================================
+
+    def detect_break_of_structure(self):
+        bos = []
+        for a, b in zip(self.swings_of('high', 12), self.swings_of('high', 12)[1:]):
+            if b['price'] > a['price'] * 1.002:
+                bos.append({'type': 'bullish', 'index': b['index'], 'breakPrice': a['price'],
+                            'newPrice': b['price'], 'time': b['time']})
+
+        for a, b in zip(self.swings_of('low', 12), self.swings_of('low', 12)[1:]):
+            if b['price'] < a['price'] * 0.998:
+                bos.append({'type': 'bearish', 'index': b['index'], 'breakPrice': a['price'],
+                            'newPrice': b['price'], 'time': b['time']})
+
+        self.smc_data['bos'] = bos[-12:]
+
+    def detect_change_of_character(self):
+        swings = sorted(self.smc_data['swing_points'], key=lambda s: s['index'])[-25:]
+        choch = []
+
+        for prev3, prev2, prev, current in zip(swings, swings[1:], swings[2:], swings[3:]):
+            types = (prev3['type'], prev2['type'], prev['type'], current['type'])
+
+            if types == ('high', 'low', 'high', 'low'):
+                if prev['price'] < prev3['price'] and current['price'] > prev2['price']:
+                    choch.append({'type': 'bullish', 'index': current['index'],
+                                  'reversal': prev['price'], 'time': current['time']})
+
+            if types == ('low', 'high', 'low', 'high'):
+                if prev['price'] > prev3['price'] and current['price'] < prev2['price']:
+                    choch.append({'type': 'bearish', 'index': current['index'],
+                                  'reversal': prev['price'], 'time': current['time']})
+
+        self.smc_data['choch'] = choch[-10:]
+
+    # ========================================================================
+    # SMART MONEY REVERSAL / INDUCEMENT
+    # ========================================================================
+
+    def detect_smart_money_reversal(self):
+        o, h, l, c, t = (series[-30:] for series in (self.open, self.high, self.low, self.close, self.times))
+        offset = self.count - len(c)
+        reversals = []
+
+        for i in range(10, len(c) - 5):
+            candle_range = h[i] - l[i]
+
+            if (o[i] - l[i]) > candle_range * 0.6 and c[i] > o[i] and (c[i] - l[i]) > candle_range * 0.7:
+                if np.any(c[i + 1:i + 4] > h[i]):
+                    reversals.append({'type': 'bullish', 'index': offset + i,
+                                      'price': float(l[i]), 'time': int(t[i])})
+
+            if (h[i] - c[i]) > candle_range * 0.6 and c[i] < o[i] and (h[i] - c[i]) > candle_range * 0.7:
+                if np.any(c[i + 1:i + 4] < l[i]):
+                    reversals.append({'type': 'bearish', 'index': offset + i,
+                                      'price': float(h[i]), 'time': int(t[i])})
+
+        self.smc_data['smart_money_reversal'] = reversals[-8:]
+
+    def detect_inducement_zones(self):
+        swings = self.smc_data['swing_points'][-20:]
+        avg_move = self.calculate_average_swing_range(10)
+        zones = []
+
+        for current, following in zip(swings[1:-1], swings[2:]):
+            if current['type'] == 'low' and following['type'] == 'high':
+                if following['price'] - current['price'] > avg_move * 1.5:
+                    zones.append({'type': 'bullish', 'price': current['price'],
+                                  'index': current['index'], 'time': current['time']})
+
+            if current['type'] == 'high' and following['type'] == 'low':
+                if current['price'] - following['price'] > avg_move * 1.5:
+                    zones.append({'type': 'bearish', 'price': current['price'],
+                                  'index': current['index'], 'time': current['time']})
+
+        self.smc_data['inducement_zones'] = zones[-10:]
+
+    # ========================================================================
+    # KILL ZONES
+    # ========================================================================
+
+    def identify_kill_zones(self):
+        hour = datetime.fromtimestamp(int(self.times[-1]) / 1000, tz=timezone.utc).hour
+        trend = self.smc_data['trend']
+        zones = []
+
+        if 2 <= hour < 5:
+            zones.append({'name': 'London Kill Zone', 'active': True, 'bias': trend})
+        if 12 <= hour < 15:
+            zones.append({'name': 'New York Kill Zone', 'active': True, 'bias': trend})
+        if 0 <= hour < 3:
+            zones.append({'name': 'Asian Kill Zone', 'active': True, 'bias': trend})
+
+        self.smc_data['kill_zones'] = zones
+
+    # ========================================================================
+    # FVG FILL TRACKING
+    # ========================================================================
+
+    def check_fvg_fills(self):
+        current_high = float(self.high[-1])
+        current_low = float(self.low[-1])
+
+        for fvg in self.smc_data['fvgs']:
+            if fvg['filled']:
+                continue
+            self.update_fvg_fill(fvg, current_high, current_low)
+
+    @staticmethod
+    def update_fvg_fill(fvg, high, low):
+        """Apply one candle's range to an open FVG (checkFVGFills)"""
+        if fvg['type'] == 'bullish':
+            if low > fvg['top']:
+                return
+            fvg['fillPercentage'] = (min(fvg['top'], high) - max(fvg['bottom'], low)) / (fvg['top'] - fvg['bottom']) * 100
+            if fvg['fillPercentage'] >= 100 or low <= fvg['bottom']:
+                fvg['filled'] = True
+        else:
+            if high < fvg['bottom']:
+                return
+            fvg['fillPercentage'] = (min(fvg['top'], high) - max(fvg['bottom'], low)) / (fvg['top'] - fvg['bottom']) * 100
+            if fvg['fillPercentage'] >= 100 or high >= fvg['top']:
+                fvg['filled'] = True
+
+    # ========================================================================
+    # SIGNAL GENERATION
+    # ========================================================================
+
+    def generate_signal(self, timeframe, symbol='XAUUSD'):
+        data = self.smc_data
+        current_price = float(self.close[-1])
+        bias = 'neutral'
+        confidence = 50
+        reasons = []
+
+        # Analyze trend alignment
+        if 'bull' in data['trend']:
+            bias = 'bullish'
+            confidence += 15
+            reasons.append('Bullish market structure')
+            if data['trend'] == 'strong_bull':
+                confidence += 5
+                reasons.append('Strong bullish trend')
+        elif 'bear' in data['trend']:
+            bias = 'bearish'
+            confidence += 15
+            reasons.append('Bearish market structure')
+            if data['trend'] == 'strong_bear':
+                confidence += 5
+                reasons.append('Strong bearish trend')
+
+        # Check premium/discount zones
+        zone = data['premium_discount']['currentZone'] if data['premium_discount'] else None
+        if bias == 'bullish' and zone == 'discount':
+            confidence += 10
+            reasons.append('Price in discount zone')
+        elif bias == 'bearish' and zone == 'premium':
+            confidence += 10
+            reasons.append('Price in premium zone')
+
+        # Check for order blocks
+        recent_obs = [ob for ob in data['order_blocks']
+                      if not ob['mitigated'] and abs(self.count - ob['index']) < 20]
+        if recent_obs and recent_obs[0]['type'] == bias:
+            confidence += 8
+            reasons.append(f"{bias} order block present")
+
+        # Check for FVGs
+        if any(not fvg['filled'] for fvg in data['fvgs']):
+            confidence += 5
+            reasons.append('Active FVG detected')
+
+        # Check for liquidity sweeps
+        if data['liquidity_sweeps'] and data['liquidity_sweeps'][-1]['bias'] == bias:
+            confidence += 8
+            reasons.append('Recent liquidity sweep')
+
+        # Check BOS/CHoCH
+        if data['bos'] or data['choch']:
+            confidence += 5
+            reasons.append('Break of structure detected')
+
+        # Check kill zones
+        if data['kill_zones']:
+            confidence += 3
+            reasons.append(f"Active: {data['kill_zones'][0]['name']}")
+
+        # Calculate levels
+        atr = float(self.atr[-1])
+        entry = current_price
+        if bias == 'bullish':
+            tp1, tp2, tp3, sl = entry + atr * 1.5, entry + atr * 2.5, entry + atr * 4.0, entry - atr * 1.2
+        elif bias == 'bearish':
+            tp1, tp2, tp3, sl = entry - atr * 1.5, entry - atr * 2.5, entry - atr * 4.0, entry + atr * 1.2
+        else:
+            # Neutral - no signal
+            return None
+
+        # Only generate signal if confidence >= 70%
+        if confidence < 70:
+            return None
+
+        precision = self.get_precision(current_price)
+        signal = {
+            'id': time.time() * 1000 + random.random(),
+            'symbol': symbol,
+            'bias': bias,
+            'timeframe': self.get_timeframe_label(timeframe),
+            'entry': f'{entry:.{precision}f}',
+            'tp1': f'{tp1:.{precision}f}',
+            'tp2': f'{tp2:.{precision}f}',
+            'tp3': f'{tp3:.{precision}f}',
+            'sl': f'{sl:.{precision}f}',
+            'rr': f'{abs((tp1 - entry) / (entry - sl)):.2f}',
+            'confidence': min(98, confidence),
+            'marketStructure': data['market_structure'],
+            'trend': data['trend'],
+            'zone': zone or 'unknown',
+            'reasons': reasons,
+            'timestamp': int(time.time() * 1000),
+            'volatility': self.calculate_volatility()
+        }
+
+        data['current_signal'] = signal
+        return signal
+
+    # ========================================================================
+    # HELPER FUNCTIONS
+    # ========================================================================
+
+    def get_precision(self, price):
+        if price < 1:
+            return 5
+        if price < 10:
+            return 4
+        if price < 100:
+            return 3
+        return 2
+
+    def calculate_average_swing_range(self, count):
+        swings = self.smc_data['swing_points'][-count * 2:]
+        if len(swings) < 4:
+            return 0
+
+        moves = [abs(a['price'] - b['price']) for a, b in zip(swings, swings[1:]) if a['type'] != b['type']]
+        return sum(moves) / len(moves) if moves else 0
+
+    def calculate_volatility(self):
+        ranges = self.high[-20:] - self.low[-20:]
+        avg_range = np.cumsum(ranges)[-1] / len(ranges)
+        avg_price = np.cumsum(self.close[-20:])[-1] / len(ranges)
+        return f'{avg_range / avg_price * 100:.2f}'
+
+    def is_touching_zone(self, price, bottom, top):
+        margin = (top - bottom) * 0.1
+        return bottom - margin <= price <= top + margin
+
+    def get_timeframe_label(self, seconds):
+        return TIMEFRAME_LABELS.get(seconds, '5M')
+
+    def clean_old_data(self, current_time, keep_duration):
+        data = self.smc_data
+        data['order_blocks'] = [ob for ob in data['order_blocks']
+                                if current_time - ob['time'] < keep_duration and not ob['mitigated']]
+        data['breakers'] = [br for br in data['breakers']
+                            if current_time - br['time'] < keep_duration and not br['mitigated']]
+        data['fvgs'] = [fvg for fvg in data['fvgs']
+                        if current_time - fvg['time'] < keep_duration and not fvg['filled']]
+
+
+class IncrementalSMC(SMCAnalyzer):
+    """
+    SMC state for one symbol/timeframe, updated one closed candle at a time.
+
+    Each update looks only at a fixed tail of recent candles and the live
+    structures (capped swing, order block and liquidity lists; FVGs and
+    order blocks expire after 150 candles), so its cost doesn't grow with
+    history length. Detection rules match SMCAnalyzer; order block touches
+    and FVG fills are counted per closed candle rather than per analysis.
+    """
+
+    # Longest look-back of any rule (sweeps scan the last 50 candles)
+    TAIL = 64
+
+    def __init__(self, timeframe, symbol='XAUUSD'):
+        super().__init__()
+        self.timeframe = timeframe
+        self.symbol = symbol
+        self.keep_duration = timeframe * 150 * 1000
+
+        self.count = 0
+        self._tail = {name: deque(maxlen=self.TAIL) for name in ('times', 'open', 'high', 'low', 'close', 'atr')}
+        self._true_ranges = deque(maxlen=14)
+        self._ranges = deque(maxlen=20)
+        self._last_ob = {'bullish': -3, 'bearish': -3}
+        self._last_fvg = {'bullish': -3, 'bearish': -3}
+
+    def load(self, times, ohlc, warmup=1000):
+        """Replay the last warmup candles of a history to build the state"""
+        for t, (o, h, l, c) in zip(times[-warmup:].tolist(), np.asarray(ohlc)[-warmup:].tolist()):
+            self.update(t, o, h, l, c, emit=False)
+
+    def update(self, time_ms, open_, high, low, close, emit=True):
+        """Append one closed candle; returns a signal (or None) when emit is set"""
+        index = self.count
+        previous_close = self._tail['close'][-1] if index else None
+
+        # Same sums as calculateATR / calculateAverageRange, over the prior candles
+        atr = self._trailing_mean(self._true_ranges, 14) if index >= 15 else 0.01
+        avg_range = self._trailing_mean(self._ranges, 20) if index >= 20 else 0
+
+        if previous_close is not None:
+            self._true_ranges.append(max(high - low, abs(high - previous_close), abs(low - previous_close)))
+        self._ranges.append(high - low)
+
+        for name, value in (('times', time_ms), ('open', open_), ('high', high), ('low', low),
+                            ('close', close), ('atr', atr)):
+            self._tail[name].append(value)
+        self.count = index + 1
+
+        self.times = np.fromiter(self._tail['times'], dtype=np.int64)
+        self.open, self.high, self.low, self.close, self.atr = (
+            np.fromiter(self._tail[name], dtype=np.float64) for name in ('open', 'high', 'low', 'close', 'atr'))
+
+        self.clean_old_data(int(time_ms), self.keep_duration)
+
+        swings_changed = self.confirm_swing_points()
+        if swings_changed:
+            self.detect_market_structure()
+        self.calculate_premium_discount()
+        self.detect_new_order_block()
+        self.check_order_block_mitigation(close)
+        self.detect_breakers()
+        self.detect_new_fair_value_gap(avg_range)
+        self.detect_optimal_trade_entry()
+        self.update_liquidity(swings_changed)
+        if swings_changed:
+            self.detect_break_of_structure()
+            self.detect_change_of_character()
+            self.detect_inducement_zones()
+        self.detect_smart_money_reversal()
+        self.identify_kill_zones()
+        self.check_fvg_fills()
+
+        if not emit or self.count < 100:
+            return None
+        return self.generate_signal(self.timeframe, self.symbol)
+
+    @staticmethod
+    def _trailing_mean(values, period):
+        total = 0
+        for value in list(values)[-period:]:
+            total += value
+        return total / period
+
+    def confirm_swing_points(self):
+        """The candle lookback bars back now has both sides; is it a swing?"""
+        lookback = self.settings['swing_lookback']
+        if len(self.high) < 2 * lookback + 1:
+            return False
+
+        pos = -lookback - 1
+        index = self.count - lookback - 1
+        swings = self.smc_data['swing_points']
+        added = False
+
+        for swing_type, series, beats in (('high', self.high, np.greater), ('low', self.low, np.less)):
+            value = series[pos]
+            if beats(value, series[pos - lookback:pos]).all() and beats(value, series[pos + 1:]).all():
+                swings.append({'index': index, 'type': swing_type, 'price': float(value),
+                               'time': int(self.times[pos]), 'strength': lookback})
+                added = True
+
+        if added:
+            self.smc_data['swing_points'] = swings[-50:]
+        return added
+
+    def detect_new_order_block(self):
+        """detect_order_blocks for the newest pair it covers (the last candle is the move's successor)"""
+        if self.count < 7:
+            return
+
+        o, h, l, c = self.open, self.high, self.low, self.close
+        cur, prev = -2, -3
+        body = abs(o[prev] - c[prev])
+        if not body > self.atr[cur] * 0.3:
+            return
+
+        if c[prev] < o[prev] and c[cur] > o[cur] and (c[cur] - o[cur]) > body * 2 and c[cur] > h[prev]:
+            ob_type = 'bullish'
+        elif c[prev] > o[prev] and c[cur] < o[cur] and (o[cur] - c[cur]) > body * 2 and c[cur] < l[prev]:
+            ob_type = 'bearish'
+        else:
+            return
+
+        index = self.count - 3
+        if index - self._last_ob[ob_type] < 3:
+            return
+        self._last_ob[ob_type] = index
+        self.smc_data['order_blocks'].append(self.make_order_block(ob_type, prev, index))
+
+    def detect_new_fair_value_gap(self, avg_range):
+        """detect_fair_value_gaps for the gap closed by the newest candle"""
+        if self.count < 3:
+            return
+
+        h, l = self.high, self.low
+        min_size = self.settings['fvg_min_size']
+        bullish_gap = l[-1] - h[-3]
+        bearish_gap = l[-3] - h[-1]
+
+        if bullish_gap > 0 and bullish_gap > avg_range * min_size:
+            fvg_type, gap = 'bullish', bullish_gap
+        elif bearish_gap > 0 and bearish_gap > avg_range * min_size:
+            fvg_type, gap = 'bearish', bearish_gap
+        else:
+            return
+
+        index = self.count - 2
+        if index - self._last_fvg[fvg_type] < 3:
+            return
+        self._last_fvg[fvg_type] = index
+        self.smc_data['fvgs'].append(self.make_fvg(fvg_type, -2, index, gap > avg_range))
+
+    def update_liquidity(self, swings_changed):
+        """Rebuild equal highs/lows on new swings; sweep checks for the new candle only"""
+        if swings_changed:
+            swept = {(zone['type'], tuple(zone['indices'])) for zone in self.smc_data['liquidity_zones']
+                     if zone['swept']}
+            self.detect_liquidity_zones()
+
+            fresh = []
+            for zone in self.smc_data['liquidity_zones']:
+                if (zone['type'], tuple(zone['indices'])) in swept:
+                    zone['swept'] = True
+                else:
+                    fresh.append(zone)
+
+            # New zones get the same 50-candle look-back as the batch scan
+            self.detect_liquidity_sweeps(fresh, window=50)
+
+        self.detect_liquidity_sweeps(window=1)
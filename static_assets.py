@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Static Assets
+Loads the terminal's HTML/JS/CSS into memory once at startup with gzip
+and brotli variants and content-hash ETags, so serving a page is a dict
+lookup instead of a disk read per request.
+
+Pages reference scripts by hashed URL (smc.js -> smc.<hash>.js). Those
+URLs never change content and are cached as immutable for a year. Pages
+and plain URLs revalidate with If-None-Match and get 304 when unchanged.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_EXTENSIONS = ('.html', '.js', '.css')
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+class Asset:
+    def __init__(self, name, body):
+        self.name = name
+        self.content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or name.endswith('.js'):
+            self.content_type += '; charset=utf-8'
+        self.set_body(body)
+
+    def set_body(self, body):
+        self.hash = hashlib.sha256(body).hexdigest()[:12]
+        base, ext = os.path.splitext(self.name)
+        self.hashed_name = f'{base}.{self.hash}{ext}'
+
+        # encoding -> body; identity always present
+        self.variants = {'identity': body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.variants['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli:
+                self.variants['br'] = brotli.compress(body, quality=11)
+
+    def etag(self, encoding):
+        return f'"{self.hash}"' if encoding == 'identity' else f'"{self.hash}-{encoding}"'
+
+
+class StaticAssets:
+    def __init__(self, root='.', extensions=STATIC_EXTENSIONS):
+        self.root = root
+        self.extensions = extensions
+        self.assets = {}
+        self._hashed = {}
+        self.load()
+
+    def load(self):
+        """(Re)read every asset in root and rewrite pages to use hashed URLs"""
+        assets = {}
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            if name.endswith(self.extensions) and os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    assets[name] = Asset(name, f.read())
+
+        # Hash scripts/styles first, then point the pages at those hashes
+        for asset in assets.values():
+            if asset.name.endswith('.html'):
+                asset.set_body(self._rewrite(asset.variants['identity'], assets))
+
+        self.assets = assets
+        self._hashed = {asset.hashed_name: asset for asset in assets.values()}
+
+    @staticmethod
+    def _rewrite(body, assets):
+        def replace(match):
+            asset = assets.get(match.group(3))
+            if not asset or asset.name.endswith('.html'):
+                return match.group(0)
+            return f'{match.group(1)}={match.group(2)}{asset.hashed_name}{match.group(2)}'
+        return re.sub(r'\b(src|href)=(["\'])([\w.-]+)\2', replace, body.decode('utf-8')).encode('utf-8')
+
+    def url(self, name):
+        asset = self.assets.get(name)
+        return f'/{asset.hashed_name}' if asset else f'/{name}'
+
+    def lookup(self, name):
+        """name -> (asset, immutable) or (None, False)"""
+        if name in self._hashed:
+            return self._hashed[name], True
+        return self.assets.get(name), False
+
+    @staticmethod
+    def negotiate(asset, accept_encoding):
+        """Best encoding the client accepts: br, then gzip, then identity"""
+        accepted = {}
+        for part in (accept_encoding or '').split(','):
+            coding, _, params = part.strip().partition(';')
+            quality = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    pass
+            accepted[coding.strip().lower()] = quality
+
+        for encoding in ('br', 'gzip'):
+            if encoding in asset.variants and accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return 'identity'
+
+    def respond(self, name, headers):
+        """
+        Build (status, body, response headers) for a request, or None if
+        name isn't a known asset. headers are the request headers.
+        """
+        asset, immutable = self.lookup(name)
+        if not asset:
+            return None
+
+        encoding = self.negotiate(asset, headers.get('Accept-Encoding'))
+        etag = asset.etag(encoding)
+        response_headers = {
+            'ETag': etag,
+            'Vary': 'Accept-Encoding',
+            'Cache-Control': f'public, max-age={IMMUTABLE_MAX_AGE}, immutable' if immutable else 'no-cache'
+        }
+
+        # Any encoding of the same content matches, so switching encodings doesn't refetch
+        if_none_match = headers.get('If-None-Match')
+        if if_none_match:
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            if '*' in tags or any(tag.strip('"').split('-')[0] == asset.hash for tag in tags):
+                return 304, b'', response_headers
+
+        body = asset.variants[encoding]
+        response_headers['Content-Type'] = asset.content_type
+        if encoding != 'identity':
+            response_headers['Content-Encoding'] = encoding
+        return 200, body, response_headers
+
+    def stats(self):
+        return {
+            'brotli': brotli is not None,
+            'assets': {
+                asset.name: {
+                    'url': f'/{asset.hashed_name}',
+                    **{encoding: len(body) for encoding, body in asset.variants.items()}
+                }
+                for asset in self.assets.values()
+            }
+        }
+
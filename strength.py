@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Currency Strength Engine
+Solves per-currency strength from the latest % change of every configured
+pair in one least-squares pass. Each pair BASE/QUOTE contributes one
+equation: strength[BASE] - strength[QUOTE] = change_percent.
+"""
+
+import numpy as np
+
+# ICE US Dollar Index basket (SEK has no configured pair and is left out)
+DXY_WEIGHTS = {
+    'EUR': 0.576,
+    'JPY': 0.136,
+    'GBP': 0.119,
+    'CAD': 0.091,
+    'CHF': 0.036
+}
+
+# A pair moving this much (in %) maps to a full +/-1 factor value
+STRENGTH_SCALE = 0.5
+
+
+def solve_currency_strength(changes, currencies, dxy_change=None):
+    """
+    Solve strength (in %) for every currency observed in changes.
+
+    changes: {'EURUSD': 0.42, ...} pair -> change percent
+    currencies: currencies to solve for; pairs outside this set are ignored
+    dxy_change: optional DXY change percent, used as an extra USD observation
+    """
+    index = {currency: i for i, currency in enumerate(currencies)}
+
+    pairs = [pair for pair in changes
+             if pair[:3] in index and pair[3:6] in index and changes[pair] is not None]
+    if not pairs:
+        return {}
+
+    rows = np.arange(len(pairs))
+    base = np.array([index[pair[:3]] for pair in pairs])
+    quote = np.array([index[pair[3:6]] for pair in pairs])
+
+    A = np.zeros((len(pairs), len(currencies)))
+    A[rows, base] = 1.0
+    A[rows, quote] = -1.0
+    b = np.array([changes[pair] for pair in pairs], dtype=float)
+
+    # DXY is USD against a weighted basket
+    if dxy_change is not None and 'USD' in index:
+        basket = {c: w for c, w in DXY_WEIGHTS.items() if c in index}
+        total = sum(basket.values())
+        if total:
+            row = np.zeros(len(currencies))
+            row[index['USD']] = 1.0
+            for currency, weight in basket.items():
+                row[index[currency]] -= weight / total
+            A = np.vstack([A, row])
+            b = np.append(b, dxy_change)
+
+    # Only solve for currencies that appear in at least one equation
+    observed = np.flatnonzero(np.any(A != 0, axis=0))
+    A = A[:, observed]
+
+    # Strengths are relative, so pin them to sum to zero
+    A = np.vstack([A, np.ones(len(observed))])
+    b = np.append(b, 0.0)
+
+    solution, _, _, _ = np.linalg.lstsq(A, b, rcond=None)
+
+    return {currencies[i]: float(value) for i, value in zip(observed, solution)}
+
+
+def strength_to_value(strength):
+    """Map a strength in % to the -1..1 scale used by currency_factors"""
+    return float(np.clip(strength / STRENGTH_SCALE, -1.0, 1.0))
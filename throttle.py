@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Upstream Throttle
+Per-host token bucket and circuit breaker, shared by every fetch to that
+host. The bucket spaces requests out instead of bursting into a host's
+rate limit; the breaker stops sending requests to a host after repeated
+failures, lets one probe through after reset_timeout, and closes again
+when the probe succeeds. Rejected requests fail fast with no I/O.
+"""
+
+import threading
+import time
+
+import requests
+
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitOpenError(requests.RequestException):
+    """The host's breaker is open; the request was not sent"""
+
+
+class RateLimitedError(requests.RequestException):
+    """No token for the host within max_wait; the request was not sent"""
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(rate, 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait):
+        """
+        Take a token; returns how long the caller must wait before using it.
+        Raises RateLimitedError (taking nothing) if that is over max_wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if wait > max_wait:
+                raise RateLimitedError(f'Rate limited: next slot in {wait:.1f}s')
+            # Going negative queues later callers behind this one
+            self.tokens -= 1
+            return wait
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.failures = 0  # consecutive
+        self.opened_at = None
+        self.rejected = 0
+        self.transitions = {self.OPEN: 0, self.HALF_OPEN: 0, self.CLOSED: 0}
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _set(self, state):
+        # Caller must hold the lock
+        self.state = state
+        self.transitions[state] += 1
+        if state == self.OPEN:
+            logger.warning(f"🔌 Circuit open for {self.name} after {self.failures} failures, "
+                           f"retrying in {self.reset_timeout}s", extra={'host': self.name, 'circuit': state})
+        else:
+            logger.info(f"🔌 Circuit {state.replace('_', '-')} for {self.name}",
+                        extra={'host': self.name, 'circuit': state})
+
+    def retry_in(self):
+        if self.state != self.OPEN:
+            return 0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self):
+        """Admit a request or raise CircuitOpenError; half-open admits one probe at a time"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(f'Circuit open for {self.name}, retry in {self.retry_in():.0f}s')
+                self._set(self.HALF_OPEN)
+
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    raise CircuitOpenError(f'Circuit half-open for {self.name}, probe in flight')
+                self._probing = True
+
+    def cancel(self):
+        """An admitted request was never sent"""
+        with self._lock:
+            self._probing = False
+
+    def record(self, success):
+        with self._lock:
+            self._probing = False
+            if success:
+                self.failures = 0
+                if self.state != self.CLOSED:
+                    self._set(self.CLOSED)
+                return
+
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._set(self.OPEN)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'retry_in': round(self.retry_in(), 1),
+                'rejected': self.rejected,
+                'transitions': dict(self.transitions)
+            }
+
+
+class HostGuard:
+    """Token bucket and breaker for one host (either may be None)"""
+
+    def __init__(self, host, bucket=None, breaker=None, max_wait=2.0):
+        self.host = host
+        self.bucket = bucket
+        self.breaker = breaker
+        self.max_wait = max_wait
+        self.rate_limited = 0
+
+    def admit(self):
+        """Raise if the request must not be sent; otherwise the seconds to wait before sending it"""
+        if self.breaker:
+            self.breaker.allow()
+        if not self.bucket:
+            return 0.0
+        try:
+            return self.bucket.reserve(self.max_wait)
+        except RateLimitedError:
+            self.rate_limited += 1
+            if self.breaker:
+                self.breaker.cancel()
+            raise
+
+    def record(self, success):
+        if self.breaker:
+            self.breaker.record(success)
+
+    @property
+    def is_open(self):
+        return bool(self.breaker) and self.breaker.state == CircuitBreaker.OPEN
+
+    def stats(self):
+        stats = {'rate_limited': self.rate_limited}
+        if self.bucket:
+            stats['rate'] = self.bucket.rate
+        if self.breaker:
+            stats['circuit'] = self.breaker.stats()
+        return stats
+
+
+def failed_status(status_code):
+    """
+    Responses that count against the breaker: server errors, throttling and
+    403, which is what Cloudflare answers when it blocks us
+    """
+    return status_code >= 500 or status_code in (403, 429)
@@ -4,32 +4,231 @@ Multi-Currency Trading Terminal - Flask Web Server
 Serves the trading terminal and provides API endpoints for analysis
 """
 
-from flask import Flask, render_template, jsonify, request, send_from_directory
+import time
+IMPORT_STARTED = time.perf_counter()
+
+from flask import Flask, Response, abort, g, render_template, jsonify, request, send_from_directory, stream_with_context
 from flask_cors import CORS
+import atexit
 import os
 import json
-import time
-from datetime import datetime
+import math
+from datetime import datetime, timezone
 import threading
+from broadcast import SnapshotBroadcaster
+from logs import get_logger, logging_stats, setup_logging, start_logging
+from metrics import registry
+from signal_store import SignalStore, to_millis
+from static_assets import StaticAssets
 
-# Import our modules
+# Log records are queued from here on; the writer thread starts once the
+# scanner workers have been forked below
+setup_logging(start=False)
+logger = get_logger(__name__)
+
+# The scraper stack (bs4, requests, firebase_admin) and the Firebase
+# writer are imported by init_services() and connect_firebase(), off the
+# import path. The candle feed (numpy, websocket) stays on it: the scanner
+# workers are forked below, before any request is served.
 try:
-    from scraper import MultiCurrencyAnalyzer
-    SCRAPER_AVAILABLE = True
+    from candles import CandleStore, GRANULARITIES
+    from smc import SMCAnalyzer
+    from scanner import SignalScanner
+    CANDLES_AVAILABLE = True
 except ImportError:
-    print("⚠️ Scraper module not available")
-    SCRAPER_AVAILABLE = False
+    logger.warning("⚠️ Candle feed not available")
+    CANDLES_AVAILABLE = False
 
 app = Flask(__name__, 
             static_folder='.',
             template_folder='.')
 CORS(app)
 
-# Initialize scraper
-if SCRAPER_AVAILABLE:
-    analyzer = MultiCurrencyAnalyzer()
-else:
-    analyzer = None
+# ANALYZER_BACKEND=async runs all scraping on one asyncio event loop
+ANALYZER_BACKEND = os.getenv('ANALYZER_BACKEND', 'sync')
+
+# ANALYZER_INIT: background (build services right after startup), lazy
+# (on the first request that needs them) or eager (before serving)
+ANALYZER_INIT = os.getenv('ANALYZER_INIT', 'background')
+ANALYZER_INIT_TIMEOUT = float(os.getenv('ANALYZER_INIT_TIMEOUT', 30))
+
+# Built by init_services()
+SCRAPER_AVAILABLE = None
+analyzer = None
+refresher = None
+publisher = None
+firebase_writer = None
+
+startup_timings = {}
+_services_started = False
+_services_ready = threading.Event()
+_services_lock = threading.Lock()
+
+# Each open /api/stream holds one gunicorn thread (WEB_THREADS, as passed to
+# --threads) for its whole life, so streams are capped to leave
+# STREAM_RESERVED_THREADS free for /health and the API; extra ones get 503
+WEB_THREADS = int(os.getenv('WEB_THREADS', 8))
+STREAM_RESERVED_THREADS = int(os.getenv('STREAM_RESERVED_THREADS', 4))
+STREAM_MAX_SUBSCRIBERS = max(0, min(
+    int(os.getenv('STREAM_MAX_SUBSCRIBERS', WEB_THREADS)),
+    WEB_THREADS - STREAM_RESERVED_THREADS
+))
+
+# Shared by the refresher publisher, candle feed and scanner
+broadcaster = None
+if CANDLES_AVAILABLE or os.getenv('BACKGROUND_REFRESH', '1') != '0':
+    broadcaster = SnapshotBroadcaster(max_subscribers=STREAM_MAX_SUBSCRIBERS)
+
+# One upstream Deriv subscription per symbol/timeframe, opened on first
+# request and shared by every chart through /api/candles and /api/stream
+candle_store = None
+if CANDLES_AVAILABLE and os.getenv('CANDLE_FEED', '1') != '0':
+    candle_store = CandleStore(capacity=int(os.getenv('CANDLE_BUFFER_SIZE', 5000)))
+    candle_store.add_listener(
+        lambda symbol, granularity, candle: broadcaster.publish('candle', f'{symbol}:{granularity}', candle)
+    )
+
+# Indexed local copy of the signal history behind /api/signals. Firebase
+# holds the durable copy; an empty store is refilled from it on startup.
+signal_store = SignalStore()
+
+# Pages and scripts are read, hashed and compressed once, here
+static_assets = StaticAssets(app.root_path)
+
+# Scan every symbol x timeframe on worker processes as candles close and
+# push new signals to the 'signal' stream topic. Workers are forked here,
+# before any other thread exists; scanning starts once the analyzer is up.
+scanner = None
+if candle_store and os.getenv('SIGNAL_SCANNER', '0') != '0':
+    scanner = SignalScanner(
+        candle_store=candle_store,
+        timeframes=[int(tf) for tf in os.getenv('SCANNER_TIMEFRAMES', '300,900,3600').split(',')],
+        workers=int(os.getenv('SCANNER_WORKERS', 0)) or None
+    )
+    scanner.add_listener(
+        lambda signal: broadcaster.publish('signal', f"{signal['symbol']}:{signal['timeframe']}", signal)
+    )
+    scanner.start_workers()
+
+start_logging()
+
+
+def init_services():
+    """Import the scraper stack and build the analyzer and its background services (once)"""
+    global SCRAPER_AVAILABLE, analyzer, refresher, publisher
+    started = time.perf_counter()
+    
+    try:
+        from scraper import MultiCurrencyAnalyzer
+        from refresher import BackgroundRefresher
+        from broadcast import SnapshotPublisher
+        SCRAPER_AVAILABLE = True
+    except ImportError:
+        logger.warning("⚠️ Scraper module not available")
+        SCRAPER_AVAILABLE = False
+    startup_timings['scraper_import_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    try:
+        if SCRAPER_AVAILABLE and ANALYZER_BACKEND == 'async':
+            from async_scraper import AsyncMultiCurrencyAnalyzer
+            built = AsyncMultiCurrencyAnalyzer()
+        elif SCRAPER_AVAILABLE:
+            built = MultiCurrencyAnalyzer()
+        else:
+            built = None
+        
+        if built:
+            # Keep every configured symbol (plus DXY) warm in the background so
+            # request handlers read snapshots instead of scraping
+            if os.getenv('BACKGROUND_REFRESH', '1') != '0':
+                refresher = BackgroundRefresher(
+                    built,
+                    interval=float(os.getenv('REFRESH_INTERVAL', 20))
+                )
+                
+                # Push fresh snapshots to /api/stream subscribers whenever the refresher
+                # updates the cache; one computation is shared by every client
+                publisher = SnapshotPublisher(built, broadcaster)
+                refresher.add_listener(publisher.notify)
+            
+            analyzer = built
+            
+            if scanner:
+                scanner.analyzer = analyzer
+                scanner.symbols = list(analyzer.symbols)
+                scanner.start()
+            if refresher:
+                refresher.start()
+            if publisher:
+                publisher.start()
+        elif scanner:
+            scanner.stop()
+    except Exception as e:
+        logger.error(f"❌ Error initializing analyzer: {e}")
+    finally:
+        startup_timings['services_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        _services_ready.set()
+    
+    logger.info(f"✅ Services ready in {startup_timings['services_ms']}ms", extra={'timings': startup_timings})
+    if analyzer:
+        threading.Thread(target=connect_firebase, name='firebase-init', daemon=True).start()
+
+
+def connect_firebase():
+    """
+    Connect Firebase (Admin SDK or REST); once it answers, start the
+    write-behind queue and copy its signals into an empty store
+    """
+    global firebase_writer
+    started = time.perf_counter()
+    if not analyzer.firebase_reachable():
+        logger.warning("⚠️ Firebase unreachable; new signals are only kept in the local store")
+        return
+    startup_timings['firebase_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    # Batch Firebase signal writes into multi-path REST updates off the
+    # request threads. Until this point writes go out directly.
+    if os.getenv('FIREBASE_WRITE_BEHIND', '1') != '0':
+        from firebase_writer import FirebaseWriter
+        firebase_writer = FirebaseWriter(
+            os.getenv('FIREBASE_DATABASE_URL', analyzer.firebase_url),
+            auth=analyzer.firebase_auth_params,
+            flush_interval=float(os.getenv('FIREBASE_FLUSH_INTERVAL', 1.0)),
+            batch_size=int(os.getenv('FIREBASE_BATCH_SIZE', 100)),
+            max_queue=int(os.getenv('FIREBASE_QUEUE_SIZE', 1000))
+        )
+        analyzer.writer = firebase_writer
+        atexit.register(firebase_writer.stop)
+    
+    if not len(signal_store):
+        signal_store.add_many(analyzer.get_signals_from_firebase(days=None))
+
+
+def start_services():
+    """Start init_services() on a background thread unless already started"""
+    global _services_started
+    with _services_lock:
+        if _services_started:
+            return
+        _services_started = True
+    threading.Thread(target=init_services, name='services-init', daemon=True).start()
+
+
+def ensure_analyzer(timeout=ANALYZER_INIT_TIMEOUT):
+    """The analyzer, waiting for initialization if it's still running (None if unavailable)"""
+    if not _services_ready.is_set():
+        start_services()
+        _services_ready.wait(timeout)
+    return analyzer
+
+
+if ANALYZER_INIT == 'eager':
+    _services_started = True
+    init_services()
+elif ANALYZER_INIT != 'lazy':
+    start_services()
+
+startup_timings['import_ms'] = round((time.perf_counter() - IMPORT_STARTED) * 1000, 1)
 
 # Store active analysis sessions
 active_analysis = {}
@@ -41,21 +240,40 @@ active_analysis = {}
 @app.route('/')
 def index():
     """Serve the main trading terminal"""
-    return send_from_directory('.', 'index.html')
+    return serve_asset('index.html')
 
 @app.route('/signals')
 def signals():
     """Serve the signals history page"""
-    return send_from_directory('.', 'signals.html')
+    return serve_asset('signals.html')
 
 # ============================================================================
 # STATIC FILES
 # ============================================================================
 
+# Files the disk fallback may serve; sources, databases and config are not assets
+PUBLIC_EXTENSIONS = ('.html', '.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp',
+                     '.woff', '.woff2')
+
+def serve_asset(filename):
+    """Serve a preloaded asset (compressed, ETag/304), falling back to disk for other public files"""
+    result = static_assets.respond(filename, request.headers)
+    if result is None:
+        if not filename.lower().endswith(PUBLIC_EXTENSIONS):
+            abort(404)
+        return send_from_directory('.', filename)
+    status, body, headers = result
+    return Response(body, status=status, headers=headers)
+
 @app.route('/<path:filename>')
 def serve_static(filename):
     """Serve static files (JS, CSS, etc.)"""
-    return send_from_directory('.', filename)
+    return serve_asset(filename)
+
+@app.route('/api/static-stats')
+def static_stats():
+    """Preloaded asset URLs and sizes per encoding"""
+    return jsonify({'success': True, **static_assets.stats()})
 
 # ============================================================================
 # API ENDPOINTS
@@ -69,7 +287,12 @@ def health():
         'timestamp': datetime.now().isoformat(),
         'uptime': time.time() - start_time,
         'environment': os.getenv('FLASK_ENV', 'production'),
-        'scraper_available': SCRAPER_AVAILABLE
+        'scraper_available': SCRAPER_AVAILABLE,
+        'analyzer_backend': ANALYZER_BACKEND,
+        'candle_feed': candle_store is not None,
+        'signal_scanner': scanner is not None,
+        'services_ready': _services_ready.is_set(),
+        'startup': startup_timings
     })
 
 @app.route('/api/analyze', methods=['POST'])
@@ -87,7 +310,7 @@ def analyze_symbol():
         data = request.get_json()
         symbol = data.get('symbol', 'XAUUSD')
         
-        if not analyzer:
+        if not ensure_analyzer():
             return jsonify({
                 'error': 'Scraper not available',
                 'message': 'Fundamental analysis module not loaded'
@@ -114,6 +337,56 @@ def analyze_symbol():
             'error': str(e)
         }), 500
 
+@app.route('/api/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze several symbols in one request
+    
+    POST body:
+    {
+        "symbols": ["XAUUSD", "EURUSD"]   (or "all")
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        symbols = data.get('symbols', 'all')
+        
+        if not ensure_analyzer():
+            return jsonify({
+                'error': 'Scraper not available',
+                'message': 'Fundamental analysis module not loaded'
+            }), 503
+        
+        if symbols == 'all':
+            symbols = list(analyzer.symbols)
+        
+        if not isinstance(symbols, list) or not symbols:
+            return jsonify({
+                'success': False,
+                'error': 'symbols must be a non-empty list or "all"'
+            }), 400
+        
+        # One failing symbol doesn't fail the batch
+        batch = analyzer.analyze_batch(symbols)
+        failed = [symbol for symbol, result in batch['results'].items() if not result['success']]
+        
+        return jsonify({
+            'success': True,
+            'results': batch['results'],
+            'count': len(symbols),
+            'failed': failed,
+            'fetch_ms': batch['fetch_ms'],
+            'total_ms': batch['total_ms'],
+            'pages_fetched': batch['pages_fetched'],
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/enhance-signal', methods=['POST'])
 def enhance_signal():
     """
@@ -140,7 +413,7 @@ def enhance_signal():
                 'error': 'No signal provided'
             }), 400
         
-        if not analyzer:
+        if not ensure_analyzer():
             # Return technical signal without enhancement
             return jsonify({
                 'success': True,
@@ -183,7 +456,7 @@ def get_currency_strength():
     try:
         currency = request.args.get('currency', 'USD')
         
-        if not analyzer:
+        if not ensure_analyzer():
             return jsonify({
                 'success': False,
                 'error': 'Scraper not available'
@@ -205,6 +478,31 @@ def get_currency_strength():
             'error': str(e)
         }), 500
 
+@app.route('/api/factors', methods=['GET'])
+def get_factors():
+    """
+    Get the fundamental factor snapshot: every data node (pair quotes, DXY,
+    US10Y, news) from one data pass, the solved currency strengths and the
+    Gold factors and prediction derived from them
+    """
+    try:
+        if not ensure_analyzer():
+            return jsonify({
+                'success': False,
+                'error': 'Scraper not available'
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'snapshot': analyzer.factor_snapshot().to_dict()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/volatility', methods=['POST'])
 def calculate_volatility():
     """
@@ -221,7 +519,7 @@ def calculate_volatility():
         symbol = data.get('symbol', 'XAUUSD')
         current_price = float(data.get('current_price', 0))
         
-        if not analyzer:
+        if not ensure_analyzer():
             return jsonify({
                 'success': False,
                 'error': 'Scraper not available'
@@ -241,11 +539,344 @@ def calculate_volatility():
             'error': str(e)
         }), 500
 
+@app.route('/api/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Get quote cache hit/miss counters"""
+    try:
+        if not ensure_analyzer():
+            return jsonify({
+                'success': False,
+                'error': 'Scraper not available'
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'cache': analyzer.quote_cache.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/http-stats', methods=['GET'])
+def get_http_stats():
+    """Get upstream connection pool and reuse metrics"""
+    try:
+        if not ensure_analyzer():
+            return jsonify({
+                'success': False,
+                'error': 'Scraper not available'
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'http': analyzer.http.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/source-stats', methods=['GET'])
+def get_source_stats():
+    """Get per-source quote latency, reliability and hedging counters"""
+    try:
+        if not ensure_analyzer():
+            return jsonify({
+                'success': False,
+                'error': 'Scraper not available'
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'quotes': analyzer.aggregator.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/refresh-status', methods=['GET'])
+def get_refresh_status():
+    """Get background refresh state for every page"""
+    try:
+        if not ensure_analyzer() or not refresher:
+            return jsonify({
+                'success': False,
+                'error': 'Background refresh not running'
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'pages': refresher.status()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def parse_candle_key(key):
+    """'XAUUSD:300' -> ('XAUUSD', 300), or (None, None) if invalid"""
+    try:
+        symbol, granularity = key.split(':')
+        granularity = int(granularity)
+    except ValueError:
+        return None, None
+    symbol = symbol.upper()
+    if not (symbol.isalpha() and len(symbol) == 6) or granularity not in GRANULARITIES:
+        return None, None
+    return symbol, granularity
+
+@app.route('/api/candles', methods=['GET'])
+def get_candles():
+    """
+    Get candle history from the shared in-memory store
+    
+    Query params:
+        symbol: e.g. XAUUSD
+        timeframe: candle size in seconds (default 300)
+        count: number of candles, newest last (default 1000)
+    """
+    try:
+        if not candle_store:
+            return jsonify({
+                'success': False,
+                'error': 'Candle feed not available'
+            }), 503
+        
+        symbol, granularity = parse_candle_key(
+            f"{request.args.get('symbol', '')}:{request.args.get('timeframe', 300)}"
+        )
+        if not symbol:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid symbol or timeframe'
+            }), 400
+        
+        count = max(1, min(int(request.args.get('count', 1000)), candle_store.capacity))
+        candles = candle_store.history(symbol, granularity, count)
+        if not candles:
+            return jsonify({
+                'success': False,
+                'error': candle_store.last_error or 'No candles received from Deriv yet'
+            }), 504
+        
+        return jsonify({
+            'success': True,
+            'symbol': symbol,
+            'timeframe': granularity,
+            'candles': candles
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/candle-stats', methods=['GET'])
+def get_candle_stats():
+    """Get upstream Deriv subscription and buffer status"""
+    if not candle_store:
+        return jsonify({
+            'success': False,
+            'error': 'Candle feed not available'
+        }), 503
+    
+    return jsonify({
+        'success': True,
+        'feed': candle_store.stats()
+    })
+
+@app.route('/api/smc-analysis', methods=['GET'])
+def get_smc_analysis():
+    """
+    Run the SMC engine on the shared candle history
+    
+    Query params:
+        symbol: e.g. XAUUSD
+        timeframe: candle size in seconds (default 300)
+    """
+    try:
+        if not candle_store:
+            return jsonify({
+                'success': False,
+                'error': 'Candle feed not available'
+            }), 503
+        
+        symbol, granularity = parse_candle_key(
+            f"{request.args.get('symbol', '')}:{request.args.get('timeframe', 300)}"
+        )
+        if not symbol:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid symbol or timeframe'
+            }), 400
+        
+        epochs, ohlc = candle_store.arrays(symbol, granularity)
+        if len(epochs) < 100:
+            return jsonify({
+                'success': False,
+                'error': 'Insufficient data for analysis'
+            }), 504
+        
+        smc = SMCAnalyzer()
+        signal = smc.analyze_arrays(epochs * 1000, ohlc, granularity, symbol)
+        
+        return jsonify({
+            'success': True,
+            'symbol': symbol,
+            'timeframe': granularity,
+            'signal': signal,
+            'structure': {k: v for k, v in smc.smc_data.items() if k != 'current_signal'}
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/stream')
+def stream():
+    """
+    Server-Sent Events stream of analysis, currency strength and candle changes
+    
+    Query params:
+        topics: comma separated, e.g. "analysis,strength" (default),
+                "candle:XAUUSD:300" for live candles of one symbol/timeframe
+                or "signal" for signals fired by the scanner
+    
+    Events:
+        event: analysis   data: {"key": "EURUSD", "changes": {...}, "full": false}
+        event: strength   data: {"key": "USD", "changes": {...}, "full": false}
+        event: candle     data: {"key": "XAUUSD:300", "changes": {"c": 2651.2}, "full": false}
+        event: signal     data: {"key": "XAUUSD:900", "changes": {"bias": "bearish", ...}, "full": false}
+    """
+    topics = [t.strip() for t in request.args.get('topics', 'analysis,strength').split(',') if t.strip()]
+    candle_topics = [t for t in topics if t.startswith('candle:')]
+    signal_topics = [t for t in topics if t == 'signal' or t.startswith('signal:')]
+    
+    needs_publisher = len(candle_topics) + len(signal_topics) < len(topics)
+    if needs_publisher:
+        ensure_analyzer()
+    
+    if not broadcaster or (needs_publisher and not publisher):
+        return jsonify({
+            'success': False,
+            'error': 'Streaming requires background refresh'
+        }), 503
+    
+    if signal_topics and not scanner:
+        return jsonify({
+            'success': False,
+            'error': 'Signal scanner not enabled'
+        }), 503
+    
+    if candle_topics and not candle_store:
+        return jsonify({
+            'success': False,
+            'error': 'Candle feed not available'
+        }), 503
+    
+    for index, topic in enumerate(candle_topics):
+        symbol, granularity = parse_candle_key(topic[len('candle:'):])
+        if not symbol:
+            return jsonify({
+                'success': False,
+                'error': f'Invalid topic: {topic}'
+            }), 400
+        candle_store.ensure(symbol, granularity)
+        candle_topics[index] = f'candle:{symbol}:{granularity}'
+    
+    topics = [t for t in topics if not t.startswith('candle:')] + candle_topics
+    subscriber = broadcaster.subscribe(topics)
+    if subscriber is None:
+        return jsonify({
+            'success': False,
+            'error': 'Too many stream subscribers'
+        }), 503
+    
+    if publisher:
+        publisher.notify()
+    
+    def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                pending = subscriber.next(timeout=15)
+                if not pending:
+                    yield ': keepalive\n\n'
+                    continue
+                for event in pending:
+                    data = json.dumps({
+                        'key': event['key'],
+                        'changes': event['changes'],
+                        'full': event['full']
+                    })
+                    yield f"event: {event['type']}\ndata: {data}\n\n"
+        finally:
+            broadcaster.unsubscribe(subscriber)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@app.route('/api/stream-stats', methods=['GET'])
+def get_stream_stats():
+    """Get stream subscriber and backpressure counters"""
+    if not broadcaster:
+        return jsonify({
+            'success': False,
+            'error': 'Streaming requires background refresh'
+        }), 503
+    
+    return jsonify({
+        'success': True,
+        'stream': broadcaster.stats()
+    })
+
+@app.route('/api/scanner-stats', methods=['GET'])
+def get_scanner_stats():
+    """Get scanner throughput (symbol-timeframes/sec), lag and recent signals"""
+    if not scanner:
+        return jsonify({
+            'success': False,
+            'error': 'Signal scanner not enabled'
+        }), 503
+    
+    try:
+        limit = max(0, int(request.args.get('limit', 20)))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'limit must be an integer'
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'scanner': scanner.stats(),
+        'signals': list(scanner.recent)[:limit]
+    })
+
 @app.route('/api/symbols', methods=['GET'])
 def get_supported_symbols():
     """Get list of supported symbols"""
     try:
-        if not analyzer:
+        if not ensure_analyzer():
             # Return default list
             symbols = {
                 'XAUUSD': 'Gold',
@@ -282,14 +913,32 @@ def start_auto_analysis():
     try:
         data = request.get_json()
         symbol = data.get('symbol', 'XAUUSD')
-        interval = data.get('interval', 30)  # seconds
         
-        if not analyzer:
+        try:
+            interval = float(data.get('interval', 30))  # seconds
+            if not math.isfinite(interval) or interval <= 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'Interval must be a positive number of seconds'
+            }), 400
+        
+        if not ensure_analyzer():
             return jsonify({
                 'success': False,
                 'error': 'Scraper not available'
             }), 503
         
+        # Refresh this symbol at the requested interval (clamped to the refresher's minimum)
+        if refresher:
+            interval = refresher.clamp_interval(interval)
+            if not refresher.set_interval(symbol, interval):
+                return jsonify({
+                    'success': False,
+                    'error': f'Symbol {symbol} not configured'
+                }), 400
+        
         # Store active analysis
         active_analysis[symbol] = {
             'active': True,
@@ -320,6 +969,9 @@ def stop_auto_analysis():
         if symbol in active_analysis:
             active_analysis[symbol]['active'] = False
             del active_analysis[symbol]
+            
+            if refresher:
+                refresher.set_interval(symbol, None)
         
         return jsonify({
             'success': True,
@@ -337,27 +989,25 @@ def stop_auto_analysis():
 def get_market_sentiment():
     """Get overall market sentiment across all symbols"""
     try:
-        if not analyzer:
+        if not ensure_analyzer():
             return jsonify({
                 'success': False,
                 'error': 'Scraper not available'
             }), 503
         
-        # Analyze multiple symbols
+        # Analyze multiple symbols (pages are fetched once, in parallel)
         symbols = ['XAUUSD', 'EURUSD', 'GBPUSD', 'USDJPY']
         sentiments = {}
         
-        for symbol in symbols:
-            try:
-                result = analyzer.analyze_pair(symbol)
-                if result:
-                    sentiments[symbol] = {
-                        'bias': result.get('fundamental_bias', 'neutral'),
-                        'confidence': result.get('confidence', 50),
-                        'sentiment': result.get('sentiment', 'neutral')
-                    }
-            except:
-                continue
+        results = analyzer.analyze_pairs(symbols)
+        
+        for symbol, result in results.items():
+            if result:
+                sentiments[symbol] = {
+                    'bias': result.get('fundamental_bias', 'neutral'),
+                    'confidence': result.get('confidence', 50),
+                    'sentiment': result.get('sentiment', 'neutral')
+                }
         
         return jsonify({
             'success': True,
@@ -371,6 +1021,270 @@ def get_market_sentiment():
             'error': str(e)
         }), 500
 
+# ============================================================================
+# SIGNAL HISTORY
+# ============================================================================
+
+def save_signal(signal):
+    """Store a signal locally and save it to Firebase, the durable copy, under the same id"""
+    signal_id = signal_store.add(signal)
+    if ensure_analyzer():
+        analyzer.save_signal_to_firebase(signal, signal_id)
+    return signal_id
+
+def mirror_to_firebase(path, value):
+    """Apply a signal status change or delete (value None) to Firebase"""
+    if ensure_analyzer():
+        analyzer.firebase_write(path, value)
+
+def parse_time_arg(value, end=False):
+    """YYYY-MM-DD (UTC, whole day) or epoch ms -> epoch ms"""
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    day = datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    return int(day.timestamp() * 1000) + (86400000 if end else 0)
+
+@app.route('/api/firebase-writer-stats', methods=['GET'])
+def get_firebase_writer_stats():
+    """Get write-behind queue depth, batch sizes, retries and drops"""
+    if not firebase_writer:
+        return jsonify({
+            'success': False,
+            'error': 'Firebase write-behind not enabled'
+        }), 503
+    
+    return jsonify({
+        'success': True,
+        'writer': firebase_writer.stats()
+    })
+
+@app.route('/api/signals', methods=['GET'])
+def get_signals():
+    """
+    Page through stored signals, newest first
+    
+    Query params:
+        symbol, bias, status, timeframe, min_confidence: filters
+        from, to: YYYY-MM-DD (inclusive) or epoch ms
+        days: only the last N days (default 7, 0 = all)
+        limit: page size (default 50, max 200)
+        cursor: next_cursor from the previous page
+        counts: 1 to include totals for the filters
+    """
+    try:
+        args = request.args
+        start = parse_time_arg(args.get('from'))
+        days = float(args.get('days', 7))
+        if start is None and days > 0:
+            start = int((time.time() - days * 86400) * 1000)
+        
+        filters = {
+            'symbol': args.get('symbol', '').upper() or None,
+            'bias': args.get('bias') or None,
+            'status': args.get('status') or None,
+            'timeframe': args.get('timeframe') or None,
+            'min_confidence': args.get('min_confidence'),
+            'start': start,
+            'end': parse_time_arg(args.get('to'), end=True)
+        }
+        limit = max(1, min(int(args.get('limit', 50)), 200))
+        page = signal_store.query(limit=limit, cursor=args.get('cursor'), **filters)
+        
+        response = {
+            'success': True,
+            'signals': page['signals'],
+            'next_cursor': page['next_cursor']
+        }
+        if args.get('counts') == '1':
+            response['counts'] = signal_store.counts(**filters)
+        return jsonify(response)
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid parameter: {e}'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/signals', methods=['POST'])
+def create_signal():
+    """Store a signal from the browser (body: the signal object)"""
+    try:
+        signal = request.get_json(silent=True)
+        if not isinstance(signal, dict) or not signal.get('bias'):
+            return jsonify({
+                'success': False,
+                'error': 'Body must be a signal object with a bias'
+            }), 400
+        
+        try:
+            to_millis(signal.get('timestamp'))
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'timestamp must be epoch milliseconds or an ISO 8601 string'
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'id': save_signal(signal)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/signals/<signal_id>/status', methods=['PUT'])
+def update_signal_status(signal_id):
+    """Set a signal's status (body: {"status": "closed"})"""
+    try:
+        status = (request.get_json() or {}).get('status')
+        if status not in ('active', 'closed'):
+            return jsonify({
+                'success': False,
+                'error': 'Status must be active or closed'
+            }), 400
+        
+        if not signal_store.set_status(signal_id, status):
+            return jsonify({
+                'success': False,
+                'error': 'Signal not found'
+            }), 404
+        
+        mirror_to_firebase(f'signals/{signal_id}/status', status)
+        return jsonify({'success': True})
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/signals/<signal_id>', methods=['DELETE'])
+def delete_signal(signal_id):
+    """Delete one signal"""
+    try:
+        if not signal_store.delete(signal_id):
+            return jsonify({
+                'success': False,
+                'error': 'Signal not found'
+            }), 404
+        
+        mirror_to_firebase(f'signals/{signal_id}', None)
+        return jsonify({'success': True})
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/signals', methods=['DELETE'])
+def clear_signals():
+    """Delete every stored signal"""
+    try:
+        deleted = signal_store.clear()
+        mirror_to_firebase('signals', None)
+        return jsonify({
+            'success': True,
+            'deleted': deleted
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+request_seconds = registry.histogram(
+    'http_request_seconds', 'Flask handler time (streams: until the response starts)', ('endpoint', 'method')
+)
+request_count = registry.counter('http_requests_total', 'Requests served', ('endpoint', 'method', 'status'))
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # The route pattern, not the path, so label values stay bounded
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        request_seconds.observe(time.perf_counter() - started, endpoint, request.method)
+        request_count.inc(endpoint, request.method, str(response.status_code))
+    return response
+
+def collect_service_metrics():
+    """Quote cache and upstream counters, once the analyzer exists (never starts it)"""
+    if not analyzer:
+        return
+    cache = analyzer.quote_cache.stats()
+    for name in ('hits', 'stale_hits', 'misses', 'coalesced', 'loads', 'load_failures', 'evictions'):
+        yield f'quote_cache_{name}_total', 'counter', f'Quote cache {name.replace("_", " ")}', [({}, cache[name])]
+    yield 'quote_cache_entries', 'gauge', 'Quotes currently cached', [({}, cache['entries'])]
+
+    hosts = analyzer.http.stats().get('hosts', {})
+    yield 'upstream_requests_total', 'counter', 'Upstream HTTP requests per host', \
+        [({'host': host}, stats['requests']) for host, stats in hosts.items()]
+    yield 'upstream_errors_total', 'counter', 'Failed upstream HTTP requests per host', \
+        [({'host': host}, stats['errors']) for host, stats in hosts.items()]
+    yield 'upstream_rate_limited_total', 'counter', 'Requests refused by the per-host rate limit', \
+        [({'host': host}, stats['rate_limited']) for host, stats in hosts.items() if 'rate_limited' in stats]
+
+    circuits = {host: stats['circuit'] for host, stats in hosts.items() if 'circuit' in stats}
+    yield 'upstream_circuit_open', 'gauge', 'Circuit breaker state per host (0 closed, 0.5 half-open, 1 open)', \
+        [({'host': host}, {'closed': 0, 'half_open': 0.5, 'open': 1}[circuit['state']])
+         for host, circuit in circuits.items()]
+    yield 'upstream_circuit_transitions_total', 'counter', 'Circuit breaker transitions per host and new state', \
+        [({'host': host, 'to': state}, count)
+         for host, circuit in circuits.items() for state, count in circuit['transitions'].items()]
+    yield 'upstream_circuit_rejected_total', 'counter', 'Requests refused while a circuit was open', \
+        [({'host': host}, circuit['rejected']) for host, circuit in circuits.items()]
+
+    quotes = analyzer.aggregator.stats()
+    sources = quotes['sources']
+    yield 'quote_source_requests_total', 'counter', 'Quote requests per source', \
+        [({'source': name}, stats['requests']) for name, stats in sources.items()]
+    yield 'quote_source_failures_total', 'counter', 'Quote requests per source that returned no price', \
+        [({'source': name}, stats['failures']) for name, stats in sources.items()]
+    yield 'quote_source_latency_ms', 'gauge', 'Moving average quote latency per source', \
+        [({'source': name}, stats['latency_ms']) for name, stats in sources.items() if stats['latency_ms'] is not None]
+    yield 'quote_source_reliability', 'gauge', 'Moving average quote success rate per source', \
+        [({'source': name}, stats['reliability']) for name, stats in sources.items()]
+    yield 'quote_hedged_total', 'counter', 'Quote requests sent to a further source while the first was slow', \
+        [({}, quotes['hedged'])]
+    yield 'quote_failovers_total', 'counter', 'Quote requests sent to a further source after one failed', \
+        [({}, quotes['failovers'])]
+    yield 'quote_exhausted_total', 'counter', 'Quotes no source answered within the budget', [({}, quotes['exhausted'])]
+
+def collect_logging_metrics():
+    stats = logging_stats()
+    yield 'log_records_total', 'counter', 'Log records queued for output', [({}, stats['queued'])]
+    yield 'log_records_dropped_total', 'counter', 'Log records dropped on a full queue', [({}, stats['dropped'])]
+    yield 'log_records_sampled_out_total', 'counter', 'Per-request log lines skipped by sampling', \
+        [({}, stats['sampled_out'])]
+
+registry.add_collector(collect_service_metrics)
+registry.add_collector(collect_logging_metrics)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus text format: analyzer stage timings and errors, requests, cache and upstream counters"""
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
 # ============================================================================
 # ERROR HANDLERS
 # ============================================================================
@@ -408,7 +1322,8 @@ if __name__ == '__main__':
     ╠═══════════════════════════════════════════════════════════╣
     ║  Port: {port}                                              ║
     ║  Debug: {debug}                                            ║
-    ║  Scraper: {'✅ Available' if SCRAPER_AVAILABLE else '❌ Unavailable'}                                   ║
+    ║  Scraper: {'⏳ Loading' if SCRAPER_AVAILABLE is None else '✅ Available' if SCRAPER_AVAILABLE else '❌ Unavailable'}                                   ║
+    ║  Startup: {startup_timings['import_ms']}ms ({ANALYZER_INIT} analyzer init)                     ║
     ╚═══════════════════════════════════════════════════════════╝
     """)
     